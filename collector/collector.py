@@ -9,6 +9,7 @@
 
 
 import multiprocessing as mp
+import time
 
 import numpy as np
 import pandas as pd
@@ -32,12 +33,33 @@ class Collector:
     PERIODS = {'1m': 120, '2m': 120, '5m': 120, '15m': 120, '30m': 120,
                '60m': 120, '1h': 120, '1d': 60}
 
-    def __init__(self, source=SOURCES[0]):
+    def __init__(self, source=SOURCES[0], pool=None, calendar=None):
         """
         Parameters:
             source (str): Source from `SOURCES` to collect data from.
+            pool (any): Long-lived pool with a `starmap` method, e.g.
+            `mp.Pool` or `daemon.Workers`, to fetch with. A new `mp.Pool`
+            is created per call if None.
+            calendar (sessions.Calendar): Market sessions. Prices fetched
+            while the market is closed are reused until it opens.
         """
         self._source = source
+        self.pool = pool
+        self.calendar = calendar
+        self.timings = {}  # Seconds of the last fetch per symbol.
+        self._closed = {}  # args -> (next open, prices) fetched closed
+
+    def __getstate__(self):
+        # Pools do not pickle, neither are they nor cached prices needed
+        # by pool workers.
+        state = self.__dict__.copy()
+        state['pool'] = None
+        state['_closed'] = {}
+        return state
+
+    def __setstate__(self, state):
+        # Collectors pickled before calendars were supported lack these.
+        self.__dict__.update({'calendar': None, '_closed': {}, **state})
 
     """source (str): Source from which to collect data."""
     @property
@@ -83,21 +105,47 @@ class Collector:
         if not isinstance(symbols, list):
             symbols = symbols.split()
 
+        # Bars cannot change while the market is closed, so those fetched
+        # a minute or more after the close are reused until the open.
+        now = time.time()
+        closed = (self.calendar is not None
+                  and not self.calendar.is_open(now)
+                  and not self.calendar.is_open(now - 60))
+
         # Sets up `args` for parallel processing of `get_prices` via `mp.Pool`.
         args = []
+        prices = {}
         for symbol in symbols:
-            args.append((symbol, period, interval, start, end, rounding))
+            key = (symbol, period, interval, start, end, rounding)
+            cached = self._closed.get(key) if closed else None
+            if cached is not None and now < cached[0]:
+                prices[symbol] = cached[1].copy()
+            else:
+                args.append(key)
 
         # Runs parallel processes.
-        with mp.Pool() as pool:
-            results = pool.starmap(get_prices, args)
+        results = []
+        if args:
+            results = self._starmap(_timed, [(get_prices, *a) for a in args])
 
         # Parses `results` into `prices` dictionary.
-        prices = {}
-        for i in range(len(symbols)):
-            prices[symbols[i]] = results[i]
+        for key, (seconds, df) in zip(args, results):
+            self.timings[key[0]], prices[key[0]] = seconds, df
+            if closed:
+                self._closed[key] = (self.calendar.get_next_open(now), df)
+        if not closed:
+            self._closed = {}
 
-        return prices
+        return {symbol: prices[symbol] for symbol in symbols}
+
+    # @Helper
+    def _starmap(self, func, args):
+        """Runs `func` over `args` on `pool`, or on a temporary `mp.Pool`."""
+        if self.pool is not None:
+            return self.pool.starmap(func, args)
+
+        with mp.Pool() as pool:
+            return pool.starmap(func, args)
 
     def _get_prices_yf(
             self, symbol: str, period='60d', interval=INTERVALS['60d'],
@@ -158,8 +206,7 @@ class Collector:
             args.append((symbol, period, interval, start, end, absolute))
 
         # Runs parallel processes.
-        with mp.Pool() as pool:
-            results = pool.starmap(get_volumes, args)
+        results = self._starmap(get_volumes, args)
 
         # Parses `results` into `volumes` dictionary.
         volumes = {}
@@ -198,7 +245,7 @@ class Collector:
     def get_rsi(
             self, symbols: list, period='60d', interval=INTERVALS['60d'],
             start: str = None, end: str = None, rounding=2,
-            periods=PERIODS[INTERVALS['60d']]):
+            periods=PERIODS[INTERVALS['60d']], prices=None):
         """Gets RSI history for `symbols`.
 
         Parameters:
@@ -209,14 +256,18 @@ class Collector:
             end (str): Date indicating period end.
             rounding (int): Number of significant digits in decimal.
             periods (int): Periods for RSI calculation.
+            prices (dict): Unrounded price history, as returned by
+            `get_prices(..., rounding=None)`, to calculate RSI from
+            instead of fetching it.
 
         Returns:
             dict: Keys are `symbols` (str) and values are RSI
             (pd.DataFrame).
         """
-        prices = self.get_prices(
-            symbols, period, interval, start, end, rounding=None
-        )
+        if prices is None:
+            prices = self.get_prices(
+                symbols, period, interval, start, end, rounding=None
+            )
 
         rsi = {}
         for symbol, data in prices.items():
@@ -229,5 +280,13 @@ class Collector:
         return rsi
 
 
+# @Worker
+def _timed(func, *args):
+    """Returns the seconds `func(*args)` took and its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
 if __name__ == '__main__':
     pass
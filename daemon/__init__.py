@@ -1 +1,9 @@
 from .daemon import *
+from .aiodaemon import AsyncDaemon, CollectorSource, FakeSource
+from .dispatcher import Dispatcher, FileDestination, MemoryDestination
+from .poller import Poller
+from .renderer import Renderer
+from .rules import Rule, RuleEngine
+from .scheduler import Scheduler
+from .telemetry import Telemetry
+from .workers import Workers
\ No newline at end of file
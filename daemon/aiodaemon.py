@@ -0,0 +1,259 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Observes stocks as bar events arrive, with asyncio.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import asyncio
+import bisect
+import itertools
+import math
+import time
+
+from collector import Collector
+from indicators.rsi import RollingRSI
+from sketches import Sketch
+from .daemon import Daemon
+from .rules import RuleEngine
+from .scheduler import Scheduler
+
+
+class AsyncDaemon(Daemon):
+    """An application class that reacts to bars as they arrive.
+
+    Each symbol is watched by its own task, so a slow symbol never holds
+    the others back. New bars update per-symbol RSI and its running
+    minimum in O(1), `rules` run right away on a `RuleEngine` of their
+    symbol, with its own hysteresis and cooldowns, alerts are queued on
+    `dispatcher` and the status tables on `renderer`. Densities are not
+    plotted in this mode.
+    """
+
+    def __init__(self, symbols, watchlist=None, bars=None, **kwargs):
+        """
+        Parameters:
+            symbols (any): See `Daemon`.
+            watchlist (str): See `Daemon`.
+            bars (any): Bar source with an async `stream(symbol)`, e.g.
+            `FakeSource`. Defaults to a `CollectorSource` over the
+            forecaster period and interval.
+            kwargs: See `Daemon`.
+        """
+        super().__init__(symbols, watchlist, **kwargs)
+        self.bars = bars
+        self.events = 0
+        self.alerts = 0
+        self.latency = Sketch()
+        self._loop = None
+        self._stopped = None
+        self._rsi = {}
+        self._rsi_min = {}
+        self._keys = {}
+        self._engines = {}
+        self._status = {}
+        self._watchlists_by_symbol = {}
+        for watchlist, symbols_ in self.watchlists.items():
+            for s in symbols_:
+                self._watchlists_by_symbol.setdefault(s, []).append(watchlist)
+
+    """metrics (dict): Event counts and bar-to-alert latency (seconds)."""
+    @property
+    def metrics(self):
+        return {
+            'events': self.events,
+            'alerts': self.alerts,
+            'latency_p50': self.latency.percentile(50),
+            'latency_p95': self.latency.percentile(95),
+            'latency_max': self.latency.max,
+        }
+
+    def start(self):
+        """Starts observing until `stop` or the end of the bar streams."""
+        asyncio.run(self.run())
+
+    def stop(self):
+        """Stops observing. May be called from any thread."""
+        self._is_running = False
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def run(self):
+        """Watches every symbol until `stop` or the end of the streams."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        if not self._is_running:
+            return
+
+        self.renderer.start()
+        self.dispatcher.start()
+        try:
+            self._prepare()
+            self._init_states()
+            bars = self.bars or CollectorSource(
+                self.forecaster.collector.source, self.forecaster.period,
+                self.forecaster.interval, calendar=self.calendar)
+            watches = asyncio.gather(
+                *(self._watch(bars, s) for s in self.forecaster.symbols))
+            stopped = asyncio.ensure_future(self._stopped.wait())
+            await asyncio.wait(
+                [watches, stopped], return_when=asyncio.FIRST_COMPLETED)
+            for task in (watches, stopped):
+                task.cancel()
+            await asyncio.gather(watches, stopped, return_exceptions=True)
+        finally:
+            self.dispatcher.stop()
+            self.renderer.stop()
+            self.workers.stop()
+
+    # @Helper
+    def _init_states(self):
+        for s in self.forecaster.symbols:
+            self._rsi[s] = RollingRSI(self.forecaster.periods)
+            try:
+                self._rsi_min[s] = min(
+                    df['RSI'].min() for df in self.forecaster.basis[s])
+            except (KeyError, ValueError):
+                self._rsi_min[s] = math.nan
+            self._engines[s] = RuleEngine([s], self.rules, self.FIELDS)
+
+    # @Worker
+    async def _watch(self, bars, symbol):
+        async for df in bars.stream(symbol):
+            self._on_bars(symbol, df, time.monotonic())
+
+    # @Callback
+    def _on_bars(self, symbol, df, received):
+        """Updates the state of `symbol` with `df` and evaluates `rules`.
+
+        Parameters:
+            df (pd.DataFrame): New bars with Date, Time and Price. A first
+            bar equal to the last one seen revises it.
+            received (float): Monotonic time `df` arrived at.
+        """
+        if df.empty or df['Price'].isnull().values.any():
+            return
+        self.events += 1
+
+        rsi = self._rsi[symbol]
+        for date, time_, price in zip(df['Date'], df['Time'], df['Price']):
+            bar = (date, time_)
+            rsi_now = rsi.update(price, revise=bar == self._keys.get(symbol))
+            self._keys[symbol] = bar
+            if not math.isnan(rsi_now):
+                self._rsi_min[symbol] = min(self._rsi_min[symbol], rsi_now)
+        if math.isnan(rsi_now):
+            return
+
+        try:
+            rsi_low = self.forecaster.summ[symbol]['RSI'].loc['Flag']
+        except (KeyError, TypeError):
+            return
+        self._status[symbol] = (self._rsi_min[symbol], rsi_low, rsi_now)
+
+        engine = self._engines[symbol]
+        values = {'Price': [price], 'RSI': [rsi_now], 'Flag': [rsi_low],
+                  'MinRSI': [self._rsi_min[symbol]]}
+        events = engine.get_events(engine.evaluate(values, time.time()))
+        for rule, _ in events:
+            self._on_rule(rule, symbol, df)
+            self.telemetry.inc('alerts', symbol=symbol, rule=rule.name)
+        if events:
+            self.alerts += len(events)
+            self.dispatcher.flush()
+            self.latency.update([time.monotonic() - received])
+
+        for watchlist in self._watchlists_by_symbol.get(symbol, []):
+            self._export_status(
+                self._status, watchlist, self.watchlists[watchlist])
+
+
+class CollectorSource:
+    """A library class that streams bars polled with a `Collector`.
+
+    Each symbol is fetched on its own, in a thread, right after each of
+    its bars closes, within market sessions if a calendar is given.
+    """
+
+    def __init__(self, source=Collector.SOURCES[0], period='60d',
+                 interval=Collector.INTERVALS['60d'], delay=5.0,
+                 calendar=None):
+        """
+        Parameters:
+            source (str): Data source. See `Collector.SOURCES`.
+            period (str): Look-back period of the first fetch.
+            interval (str): Bar interval.
+            delay (float): Seconds to wait after a bar closes.
+            calendar (sessions.Calendar): Market sessions.
+        """
+        self.collector = Collector(source, pool=_Inline(), calendar=calendar)
+        self.period = period
+        self.interval = interval
+        self.scheduler = Scheduler(interval, delay, calendar=calendar)
+
+    async def stream(self, symbol):
+        """Yields the bars of `symbol` not yielded yet, last one included.
+
+        The first batch covers `period`, later ones start at the last
+        bar yielded, which may have been in progress.
+        """
+        loop = asyncio.get_running_loop()
+        last = None
+        period = self.period
+        while True:
+            prices = await loop.run_in_executor(
+                None, self.collector.get_prices, [symbol], period,
+                self.interval, None, None, None)
+            df = prices.get(symbol)
+            if df is not None and not df.empty:
+                keys = list(zip(df['Date'], df['Time']))
+                i = 0 if last is None else bisect.bisect_left(keys, last)
+                if i < len(keys):
+                    last = keys[-1]
+                    yield df.iloc[i:]
+                period = '1d'
+
+            now = time.time()
+            await asyncio.sleep(self.scheduler.get_next(now) - now)
+
+
+class FakeSource:
+    """A library class that replays given bars as events, for tests."""
+
+    def __init__(self, prices, history=None, interval=0.0):
+        """
+        Parameters:
+            prices (dict): Keys are symbols (str) and values are bars
+            (pd.DataFrame) with Date, Time and Price.
+            history (int): Bars yielded at once first. Defaults to all
+            but the last 10.
+            interval (float): Seconds between the next bars.
+        """
+        self.prices = prices
+        self.history = history
+        self.interval = interval
+
+    async def stream(self, symbol):
+        """Yields the history of `symbol`, then one bar per `interval`."""
+        df = self.prices[symbol]
+        history = len(df) - 10 if self.history is None else self.history
+        history = max(history, 1)
+        yield df.iloc[:history]
+        for i in range(history, len(df)):
+            await asyncio.sleep(self.interval)
+            yield df.iloc[i:i + 1]
+
+
+class _Inline:
+    """Runs `starmap` in the calling thread, in place of a pool."""
+
+    @staticmethod
+    def starmap(func, iterable):
+        return list(itertools.starmap(func, iterable))
+
+
+if __name__ == '__main__':
+    pass
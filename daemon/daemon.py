@@ -9,149 +9,337 @@
 
 
 import datetime as dt
-import multiprocessing as mp
+import io
+import os
+import pickle
 import textwrap
 import time
 
+import numpy as np
 import plotly.graph_objects as go
+from PIL import Image
 
 from collector import Collector
 from forecaster import Forecaster
 from alerts import Sender
 import config, plotter
+from sessions import Calendar
+from .dispatcher import Dispatcher
+from .poller import Poller
+from .renderer import Renderer
+from .rules import Rule, RuleEngine
+from .scheduler import Scheduler
+from .telemetry import Telemetry
+from .workers import Workers
 
 
 class Daemon:
     """An application class that actively observes stocks."""
 
     OUTDIR = f'{config.DATA}/daemon'
+    METRICS_PORT = 9108
+
+    """Calendar: Default market sessions, NYSE hours in New York time."""
+    CALENDAR = Calendar(tz='America/New_York')
+
+    """list: Fields available to rules: 'Price', 'RSI' (latest bar),
+    'Flag' (forecast flag RSI) and 'MinRSI'. Ticks fetch prices only, so
+    rules over other fields, e.g. 'Volume', only work with a `RuleEngine`
+    fed on its own."""
+    FIELDS = ['Price', 'RSI', 'Flag', 'MinRSI']
+
+    """list: Default alert rules."""
+    RULES = [Rule('rsi_low', 'RSI', '<=', 'Flag')]
+
     sender = Sender()
 
     def __init__(self, symbols, watchlist=None, source=Collector.SOURCES[0],
                  strategy=Forecaster.STRATEGIES[0],
-                 destination=Sender.DESTINATIONS[0], **kwargs):
+                 destination=Sender.DESTINATIONS[0], snapshot='', rules=None,
+                 calendar=CALENDAR, image=None, **kwargs):
         """
         Parameters:
-            symbols (list): Stock symbols.
-            watchlist (str): Name of the group of stock symbols.
+            symbols (any): Stock symbols (list), or watchlists (dict) as
+            {name: symbols}, e.g. `config.WATCHLISTS`, to watch them all
+            with one fetch per tick.
+            watchlist (str): Name of the group of stock symbols. Defaults
+            to 'all' if `symbols` are watchlists.
             source (str): Data source from which to collect stock data.
             strategy (str): Forecasting strategy. See
             `Forecaster.STRATEGIES`.
             destination (str): Alert destination. See
             `Sender.DESTINATIONS`.
+            snapshot (str): Forecaster snapshot to restore from and save
+            to. Defaults to '`OUTDIR`/{watchlist}-snapshot.pkl'. None
+            disables snapshots.
+            rules (list): Alert rules over `FIELDS`. Defaults to `RULES`.
+            calendar (Calendar): Market sessions to observe during. None
+            observes around the clock.
+            image (dict): Settings of exported images, e.g.
+            {'format': 'webp', 'quality': 80}. See `plotter.save_density`.
+            Defaults to SVG.
+
+        Raises:
+            ValueError: A rule uses a field not in `FIELDS`.
         """
         self._is_running = True
+        self.rules = self.RULES if rules is None else rules
+        self.calendar = calendar
+        self.image = {} if image is None else dict(image)
+        self._engine = RuleEngine([], self.rules, self.FIELDS)
+        self._forecasts = None
+        if isinstance(symbols, dict):
+            self.watchlists = {k: list(v) for k, v in symbols.items()}
+            watchlist = 'all' if watchlist is None else watchlist
+        else:
+            self.watchlists = {watchlist: list(symbols)}
         self.watchlist = watchlist
-        self.forecaster = Forecaster(symbols, strategy, source)
-        self.forecaster.export_summ(dir=self.OUTDIR, ext='txt',
-            all_in_one=True, watchlist=watchlist, **kwargs)
+        symbols = list(dict.fromkeys(
+            s for ls in self.watchlists.values() for s in ls))
+        if snapshot == '':
+            snapshot = f'{self.OUTDIR}/{watchlist}-snapshot.pkl'
+        self.snapshot = snapshot
+        self.forecaster = self._get_forecaster(
+            symbols, strategy, source, **kwargs)
+        self.workers = Workers()
+        self.telemetry = Telemetry()
+        self.renderer = Renderer(telemetry=self.telemetry)
+        self.dispatcher = Dispatcher(
+            {destination: self.sender}, telemetry=self.telemetry)
+        self.scheduler = None
+        self.poller = None
+        self._dashboards = {}  # (watchlist, name) -> plotter.Dashboard
+        self._prices = {}
+        self._rsi = {}
+        self._dumped = 0.0
+        self.forecaster.collector.pool = self.workers
+        self.forecaster.collector.calendar = calendar
         self.sender.destination = destination
 
     # @Helper
-    def _observe(self, plot=False, save=True):
-        """Creates and runs the processes that get stock data.
+    def _get_forecaster(self, symbols, strategy, source, **kwargs):
+        """Restores the forecaster from `snapshot`, else creates it.
+
+        The snapshot is only used if it was made for the same symbols,
+        strategy and parameters.
+        """
+        if self.snapshot and os.path.exists(self.snapshot):
+            try:
+                forecaster = Forecaster.load(self.snapshot, catch_up=False)
+            except (ValueError, OSError, pickle.UnpicklingError) as e:
+                print(f'Snapshot not restored: {e}')
+            else:
+                if (set(forecaster.symbols) == set(symbols)
+                        and forecaster.strategy == strategy
+                        and forecaster._kwargs == kwargs):
+                    forecaster.update()
+                    return forecaster
+                print('Snapshot does not match! Rebuilding forecasts...')
+
+        return Forecaster(symbols, strategy, source, **kwargs)
+
+    # @Helper
+    def _observe(self, plot=False, save=True, symbols=None):
+        """Fetches one snapshot of bars and derives the whole tick from it.
+
+        Prices, RSI, status and alerts all come from the same fetch of
+        all symbols, then outputs are split per watchlist.
 
         Parameters:
             plot (bool): Flags generation of `plt` plots (blocking).
-            save (bool): Flags SVG export (non-blocking, preffered).
+            save (bool): Flags image export (non-blocking, preffered).
+            symbols (list): Symbols to fetch, merged with the last bars of
+            the others. Defaults to all.
         """
         date = dt.datetime.now().strftime('%I:%M:%S %p')
-        mp.log_to_stderr(30)
         print(f'Getting data at {date}...')
-        procs = []
-        funcs = [self._get_prices, self._get_rsi]
-        args = (plot, save)
-        for func in funcs:
-            proc = mp.Process(target=func, args=args)
-            proc.start()
-            procs.append(proc)
-        for proc in procs:
-            proc.join()
-
-    # @Worker
-    def _get_prices(self, plot=False, save=True):
-        prices = self.forecaster.collector.get_prices(
-            self.forecaster.symbols, period=self.forecaster.period,
-            interval=self.forecaster.interval)
+        timer = self.telemetry.timer
+        with timer('fetch'):
+            prices = self._get_prices(symbols)
+        with timer('indicators'):
+            rsi = self._get_rsi(prices)
+        if symbols is None:
+            self._prices, self._rsi = prices, rsi
+        else:
+            self._prices.update(prices)
+            self._rsi.update(rsi)
+            prices, rsi = dict(self._prices), dict(self._rsi)
+        with timer('alerts'):
+            status = self._on_get_rsi(rsi, prices)
+        if self.poller is not None:
+            self._prioritize(rsi, symbols or self.forecaster.symbols)
+
+        with timer('export'):
+            prices = {s: df.round(2) for s, df in prices.items()}
+            for watchlist, symbols in self.watchlists.items():
+                self._export_status(status, watchlist, symbols)
+                self._show(self._subset(prices, symbols), 'Price', watchlist,
+                           plot, save)
+                self._show(self._subset(rsi, symbols), 'RSI', watchlist,
+                           plot, save)
 
-        if plot:
-            plotter.plot_density(prices, 'Price', watchlist=self.watchlist)
+    # @Helper
+    def _get_prices(self, symbols=None):
+        """Returns unrounded bars over the forecaster period and interval."""
+        return self.forecaster.collector.get_prices(
+            symbols or self.forecaster.symbols, period=self.forecaster.period,
+            interval=self.forecaster.interval, rounding=None)
 
-        if save:
-            plotter.save_density(
-                prices, 'Price', watchlist=self.watchlist, dir=self.OUTDIR)
+    # @Helper
+    def _get_rsi(self, prices):
+        """Returns RSI calculated from `prices`, without fetching."""
+        return self.forecaster.collector.get_rsi(
+            list(prices), periods=self.forecaster.periods, prices=prices)
 
-    # @Worker
-    def _get_rsi(self, plot=False, save=True):
-        rsi = self.forecaster.collector.get_rsi(
-            self.forecaster.symbols, period=self.forecaster.period,
-            periods=self.forecaster.periods)
-        self._on_get_rsi(rsi)
+    # @Helper
+    def _prioritize(self, rsi, symbols, bars=12):
+        """Updates the polling urgency of `symbols` from their RSI.
 
+        Urgency grows as RSI nears its flag, relative to how much RSI
+        moved per bar over the last `bars` bars.
+        """
+        flags = self._get_forecasts()['Flag']
+        index = {s: i for i, s in enumerate(self.forecaster.symbols)}
+        for symbol in symbols:
+            df = rsi.get(symbol)
+            if df is None or len(df) < 2:
+                self.poller.update(symbol, np.nan, np.nan)
+                continue
+            values = df['RSI'].to_numpy()[-bars - 1:]
+            volatility = np.abs(np.diff(values)).mean()
+            self.poller.update(
+                symbol, values[-1] - flags[index[symbol]], volatility)
+
+    # @Helper
+    def _show(self, data, name, watchlist, plot=False, save=True):
+        """Plots and/or queues the export of the density of `data`."""
         if plot:
-            plotter.plot_density(rsi, 'RSI', watchlist=self.watchlist)
+            key = (watchlist, name)
+            if key not in self._dashboards:
+                self._dashboards[key] = plotter.Dashboard(
+                    name, watchlist=watchlist)
+            self._dashboards[key].update(data)
 
         if save:
-            plotter.save_density(
-                rsi, 'RSI', watchlist=self.watchlist, dir=self.OUTDIR)
+            self.renderer.submit(
+                f'{watchlist}-{name}', plotter.save_density, data, name,
+                watchlist=watchlist, dir=self.OUTDIR, **self.image)
 
     # @Helper
-    def _on_get_rsi(self, rsi: dict):
-        """Checks if `rsi` raises flag and sends alert accordingly."""
-        # stocks_ = StockFactory.create(self.forecaster.symbols)
-        # normvols = []
-        # for stock in stocks_:
-        #     if stock.history is None:
-        #         continue
-        #     df = stock.history['Volume']
-        #     maxvol = df['Volume'].max()
-        #     normvol = ((df['Volume'] / maxvol) * 100).astype(int)
-        #     normvols.append(normvol.iloc[-1]['Volume'].item())
-
-        symbols = []
-        rsi_min = []
-        rsi_low = []
-        rsi_now = []
-        for symbol in self.forecaster.symbols:
-            # Gets RSI status.
-            try:
-                rsi_min_ = self.forecaster.get_basis(True)[symbol]['RSI'].min()
-                rsi_low_ = self.forecaster.summ[symbol]['RSI'].loc['Flag']
-                rsi_now_ = rsi[symbol]['RSI'].iloc[-1]
-            except:
-                continue
+    @staticmethod
+    def _subset(data, symbols):
+        """Returns the items of `data` for `symbols`, in their order."""
+        return {s: data[s] for s in symbols if s in data}
+
+    # @Helper
+    def _on_get_rsi(self, rsi: dict, prices: dict):
+        """Evaluates `rules` for all symbols and sends alerts accordingly.
+
+        Parameters:
+            rsi (dict): RSI history per symbol.
+            prices (dict): Price history per symbol `rsi` came from.
+
+        Returns:
+            dict: Keys are symbols (str) and values are their minimum,
+            flag and current RSI (tuple).
+        """
+        symbols = self.forecaster.symbols
+        with self.telemetry.timer('forecast'):
+            values = dict(self._get_forecasts())
+        values['RSI'] = self._get_last(rsi, 'RSI')
+        values['Price'] = self._get_last(prices, 'Price')
+
+        if self._engine.symbols != symbols:
+            self._engine = RuleEngine(symbols, self.rules, self.FIELDS)
+        with self.telemetry.timer('rules'):
+            fired = self._engine.evaluate(values, time.time())
+
+        with self.telemetry.timer('dispatch'):
+            for rule, symbol in self._engine.get_events(fired):
+                self._on_rule(rule, symbol, prices[symbol])
+                self.telemetry.inc('alerts', symbol=symbol, rule=rule.name)
+            self.dispatcher.flush()
+
+        ok = ~np.isnan(values['RSI']) & ~np.isnan(values['Flag'])
+        return {s: (values['MinRSI'][i], values['Flag'][i], values['RSI'][i])
+                for i, s in enumerate(symbols) if ok[i]}
+
+    # @Helper
+    def _get_forecasts(self):
+        """Returns forecast fields aligned with the forecaster symbols.
+
+        Built once, then cached until forecasts are prepared again.
+
+        Returns:
+            dict: 'Flag' and 'MinRSI' arrays, NaN where not available.
+        """
+        if self._forecasts is None:
+            symbols = self.forecaster.symbols
+            flag = np.full(len(symbols), np.nan)
+            rsi_min = np.full(len(symbols), np.nan)
+            for i, symbol in enumerate(symbols):
+                try:
+                    flag[i] = self.forecaster.summ[symbol]['RSI'].loc['Flag']
+                    rsi_min[i] = min(df['RSI'].min()
+                                     for df in self.forecaster.basis[symbol])
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self._forecasts = {'Flag': flag, 'MinRSI': rsi_min}
+
+        return self._forecasts
+
+    # @Helper
+    def _get_last(self, data, column):
+        """Returns the last `column` value per forecaster symbol."""
+        last = np.full(len(self.forecaster.symbols), np.nan)
+        for i, symbol in enumerate(self.forecaster.symbols):
+            df = data.get(symbol)
+            if df is not None and len(df):
+                last[i] = df[column].to_numpy()[-1]
+        return last
+
+    # @Callback
+    def _on_rule(self, rule, symbol, prices):
+        """Compiles the alert of `rule` firing for `symbol` and queues it.
+
+        Parameters:
+            rule (Rule): Rule that fired.
+            prices (pd.DataFrame): Price history of `symbol`.
+        """
+        t_0 = prices['Time'].iloc[-1]
+        p_0 = prices['Price'].iloc[-1]
+        if rule.name == 'rsi_low':
+            summ = self.forecaster.summ[symbol]
+            self._on_rsi_low(
+                symbol, t_0, p_0, summ['Time'].loc['Entry'],
+                summ['PctChg'].loc['Entry'], summ['Time'].loc['Exit'],
+                summ['PctChg'].loc['Exit'])
+            return
+
+        message = textwrap.dedent(f"""\n
+            \tAlert: {symbol} at {t_0.strftime('%I:%M %p')}, $ {p_0:.2f}.
+                \tRule: {rule}.\n""")
+        self.dispatcher.put(symbol, rule.name, message)
 
-            symbols.append(symbol)
-            rsi_min.append(rsi_min_)
-            rsi_low.append(rsi_low_)
-            rsi_now.append(rsi_now_)
-
-            # Sends alert if `rsi_now` falls below `rsi_low` (flag).
-            time_now = rsi[symbol]['Time'].iloc[-1]
-            if rsi_now <= rsi_low:
-                t_0 = time_
-                t_1 = self.forecaster.summ[symbol]['Time'].loc['Entry']
-                p_1 = self.forecaster.summ[symbol]['PctChg'].loc['Entry']
-                t_2 = self.forecaster.summ[symbol]['Time'].loc['Exit']
-                p_2 = self.forecaster.summ[symbol]['PctChg'].loc['Exit']
-                self._on_rsi_low(symbol, t_0, t_1, p_1, t_2, p_2)
-
-            # Exports status.
-            pathout = f'{self.OUTDIR}/{self.watchlist}-Status.svg'
-            fig = go.Figure(
-                data=[go.Table(
-                    header={'values': ['Symbol', 'MinRSI', 'LoRSI', 'NowRSI']},
-                    cells={'values': [symbols, rsi_min, rsi_low, rsi_now]}
-                )])
-            fig.write_image(pathout)
+    # @Helper
+    def _export_status(self, status, watchlist, symbols):
+        """Queues the export of the RSI `status` table of `watchlist`."""
+        symbols = [s for s in symbols if s in status]
+        columns = [symbols] + [
+            [status[s][i] for s in symbols] for i in range(3)]
+        format = self.image.get('format', plotter.FORMATS[0])
+        pathout = f'{self.OUTDIR}/{watchlist}-Status.{format}'
+        self.renderer.submit(pathout, write_status, pathout, columns,
+                             **self.image)
 
     # @Helper
-    def _on_rsi_low(self, symbol: str, t_0: dt.time, t_1: float, p_1: float,
-                    t_2: float, p_2: float):
-        """Compiles alert and passes it on to `sender`.
+    def _on_rsi_low(self, symbol: str, t_0: dt.time, p_0: float, t_1: float,
+                    p_1: float, t_2: float, p_2: float):
+        """Compiles alert and passes it on to `dispatcher`.
 
         Parameters:
             t_0 (dt.time): Flag time.
+            p_0 (float): Price at flag time.
             t_1 (float): Forecasted minutes to Entry.
             p_1 (float): Forecasted %chg (drop) to Entry.
             t_2 (float): Forecasted minutes from Entry to Exit.
@@ -167,9 +355,7 @@ class Daemon:
         t_exit = t_exit.strftime(fmt)
 
         # Calculates entry and exit prices.
-        p_flag = self.forecaster.collector.get_prices(
-            symbol, '1d', '2m')[symbol]['Price'].iloc[-1]
-        p_entry = p_flag * (1 + (p_1 / 100))
+        p_entry = p_0 * (1 + (p_1 / 100))
         p_exit = p_entry * (1 + (p_2 / 100))
 
         message = textwrap.dedent(f"""\n
@@ -177,33 +363,234 @@ class Daemon:
                 \tForecasted entry: $ {p_entry:.2f} at {t_entry}.
                 \tForecasted exit: $ {p_exit:.2f} at {t_exit}.\n""")
 
-        self.sender.send(message)
+        self.dispatcher.put(symbol, 'rsi_low', message)
 
-    # @Worker
+    # @Helper
     def _get_volumes(self, plot=False, save=False):
         volumes = self.forecaster.collector.get_volumes(
             self.forecaster.symbols)
         if plot:
             plotter.plot_density(volumes, 'Volume', watchlist=self.watchlist)
         if save:
-            plotter.save_density(volumes, 'Volume', watchlist=self.watchlist)
+            plotter.save_density(volumes, 'Volume', watchlist=self.watchlist,
+                                 **self.image)
 
-    def start(self, interval=60.0, plot=False, save=True):
+    def start(self, interval=None, plot=False, save=True, delay=5.0,
+              policy=Scheduler.POLICIES[0], port=METRICS_PORT,
+              dump_interval=60.0, budget=None, min_interval=15.0,
+              warmup=600.0):
         """Starts observation process loop.
 
+        Ticks fire right after each bar closes, aligned to the clock, while
+        the market is open per `calendar`. In between, the loop sleeps and
+        wakes up `warmup` seconds before the next session to catch
+        forecasts up. With a `budget`, symbols are instead polled on their
+        own, more often the closer they are to a flag (see `Poller`).
+        Metrics are served as Prometheus text at
+        http://127.0.0.1:`port`/metrics and dumped as JSON to
+        '`OUTDIR`/{watchlist}-metrics.json'.
+
         Parameters:
-            interval (float): Loop time in seconds.
+            interval (any): Bar interval, e.g. '5m', or loop time in
+            seconds. Defaults to the forecaster interval.
             plot (bool): Flags generation of `plt` plots (blocking).
-            save (bool): Flags SVG export (non-blocking, preffered).
+            save (bool): Flags image export (non-blocking, preffered).
+            delay (float): Seconds to wait after a bar closes.
+            policy (str): Overrun policy. See `Scheduler.POLICIES`.
+            port (int): Metrics HTTP port. None disables serving.
+            dump_interval (float): Minimum seconds between JSON dumps.
+            budget (float): Symbol requests per minute for adaptive
+            polling. None polls all symbols every tick.
+            min_interval (float): Seconds between polls of the most urgent
+            symbols, with a `budget`.
+            warmup (float): Seconds before a session to pre-fetch bars and
+            update forecasts at.
         """
-        while self._is_running:
-            self._observe(plot, save)
-            time.sleep(interval)
+        self.scheduler = Scheduler(
+            interval or self.forecaster.interval, delay, policy,
+            calendar=self.calendar, warmup=warmup)
+        if port is not None:
+            try:
+                self.telemetry.serve(port)
+            except OSError as e:
+                print(f'Metrics not served on port {port}: {e}')
+        self.workers.start()
+        self.renderer.start()
+        self.dispatcher.start()
+        try:
+            self._prepare()
+            if budget is not None:
+                # After `_prepare`, which drops symbols without data.
+                self.poller = Poller(
+                    self.forecaster.symbols, min_interval,
+                    self.scheduler.period, budget, calendar=self.calendar,
+                    warmup=warmup)
+                self.poller.run(
+                    lambda symbols: self._on_tick(
+                        plot, save, dump_interval, symbols),
+                    lambda: self._is_running, self._warm_up)
+            else:
+                self.scheduler.run(
+                    lambda: self._on_tick(plot, save, dump_interval),
+                    lambda: self._is_running, self._warm_up)
+        finally:
+            self.dispatcher.stop()
+            self.renderer.stop()
+            self.workers.stop()
+            for dashboard in self._dashboards.values():
+                dashboard.close()
+            plotter.close_dashboards()
+            self._record()
+            self.telemetry.dump(self.metrics_path)
+            self.telemetry.shutdown()
+
+    # @Helper
+    def _prepare(self):
+        """Builds forecasts, saves the snapshot and exports summaries."""
+        self.forecaster.materialize()
+        self._forecasts = None
+        if self.snapshot:
+            self.forecaster.save(self.snapshot)
+        for watchlist, symbols in self.watchlists.items():
+            self.forecaster.export_summ(dir=self.OUTDIR, ext='txt',
+                all_in_one=True, watchlist=watchlist, symbols=symbols)
+
+    # @Callback
+    def _warm_up(self):
+        """Pre-fetches bars and catches forecasts up before a session."""
+        date = dt.datetime.now().strftime('%I:%M:%S %p')
+        print(f'Warming up at {date}...')
+        with self.telemetry.timer('warmup'):
+            prices = self._get_prices()
+            self.forecaster.update(prices)
+            self._prepare()
+            self._prices, self._rsi = prices, self._get_rsi(prices)
+
+    """metrics_path (str): JSON metrics dump."""
+    @property
+    def metrics_path(self):
+        return f'{self.OUTDIR}/{self.watchlist}-metrics.json'
+
+    # @Callback
+    def _on_tick(self, plot=False, save=True, dump_interval=60.0,
+                 symbols=None):
+        """Observes, records metrics and reports the tick lag."""
+        with self.telemetry.timer('tick'):
+            self._observe(plot, save, symbols)
+        self._record()
+        if time.monotonic() - self._dumped >= dump_interval:
+            self.telemetry.dump(self.metrics_path)
+            self._dumped = time.monotonic()
+
+        if symbols is not None:
+            metrics = self.poller.metrics
+            print(f'Polled {len(symbols)} symbol(s), '
+                  f'planned {metrics["rate"]:.1f} requests/min, '
+                  f'intervals {metrics["interval_min"]:.0f}-'
+                  f'{metrics["interval_max"]:.0f} s')
+            return
+
+        metrics = self.scheduler.metrics
+        print(f'Tick lag: {metrics["lag_last"]:.2f} s '
+              f'(mean {metrics["lag_mean"]:.2f} s, '
+              f'p95 {metrics["lag_p95"]:.2f} s), '
+              f'skipped {metrics["skipped"]}, '
+              f'coalesced {metrics["coalesced"]}, '
+              f'overruns {metrics["overruns"]}')
+
+    # @Helper
+    def _record(self):
+        """Copies fetch timings, cache and tick counts into `telemetry`."""
+        gauge = self.telemetry.set
+        for symbol, seconds in self.forecaster.collector.timings.items():
+            gauge('fetch_seconds', seconds, symbol=symbol)
+
+        hits, misses = self.forecaster.hits, self.forecaster.misses
+        gauge('cache_hits', hits, cache='forecaster')
+        gauge('cache_misses', misses, cache='forecaster')
+        if hits + misses:
+            gauge('cache_hit_ratio', hits / (hits + misses),
+                  cache='forecaster')
+
+        for name, value in self.renderer.metrics.items():
+            if not name.startswith('seconds'):
+                gauge(f'renderer_{name}', value)
+
+        for name, value in self.dispatcher.counts.items():
+            gauge(f'dispatcher_{name}', value)
+
+        if self.poller is not None:
+            for name, value in self.poller.metrics.items():
+                gauge(f'poller_{name}', value)
+
+        if self.scheduler is not None:
+            metrics = self.scheduler.metrics
+            for name in ('ticks', 'skipped', 'coalesced', 'overruns',
+                         'warmups'):
+                gauge(f'scheduler_{name}', metrics[name])
+            if metrics['ticks']:
+                gauge('tick_lag_seconds', metrics['lag_last'])
 
     def stop(self):
-        """Stops observation process loop."""
+        """Stops observation process loop.
+
+        The loop ends after the current tick, or within a second if it is
+        waiting for one, then pending alerts and renders are flushed and
+        `workers` shut down.
+        """
         self._is_running = False
 
 
+def write_status(pathout, columns, format=None, size=None, dpi=100,
+                 compression=6, quality=80):
+    """Writes the RSI status table to `pathout`, unless unchanged.
+
+    Takes the image settings of `plotter.save_density`. Raster formats
+    are rendered as PNG, then encoded with `compression` or `quality`.
+
+    Parameters:
+        pathout (str): Image path.
+        columns (list): Symbol, MinRSI, LoRSI and NowRSI columns.
+        format (str): Image format. See `plotter.FORMATS`. Defaults to
+        the extension of `pathout`.
+        size (tuple): Width and height in inches. Defaults to plotly's.
+        dpi (int): Resolution of raster formats.
+        compression (int): See `plotter.save_figure`.
+        quality (int): See `plotter.save_figure`.
+
+    Raises:
+        ValueError: Requested `format` is not available.
+    """
+    format = format or os.path.splitext(pathout)[1][1:]
+    if format not in plotter.FORMATS:
+        raise ValueError(f'format = {format} is not valid!\n'
+                         f'Valid values are: {plotter.FORMATS}')
+
+    fig = go.Figure(
+        data=[go.Table(
+            header={'values': ['Symbol', 'MinRSI', 'LoRSI', 'NowRSI']},
+            cells={'values': columns}
+        )])
+    # Plotly lays out in pixels at 100 dpi.
+    width, height = (None, None) if size is None else (
+        round(size[0] * 100), round(size[1] * 100))
+    if format == 'svg':
+        data = fig.to_image(format=format, width=width, height=height)
+    else:
+        image = Image.open(io.BytesIO(fig.to_image(
+            format='png', width=width, height=height, scale=dpi / 100)))
+        if format == 'png':
+            kwargs = {'compress_level': compression}
+        elif quality is None:
+            kwargs = {'lossless': True}
+        else:
+            kwargs = {'quality': quality}
+        buffer = io.BytesIO()
+        image.save(buffer, format=format, **kwargs)
+        data = buffer.getvalue()
+
+    plotter.write_file(pathout, data)
+
+
 if __name__ == '__main__':
     pass
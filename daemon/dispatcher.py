@@ -0,0 +1,208 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Non-blocking alert delivery.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import os
+import queue
+import threading
+import time
+
+from sketches import Sketch
+
+
+class Dispatcher:
+    """A library class that delivers alerts off the caller's thread.
+
+    Alerts `put` during a tick are collected into one batch, deduplicated
+    per (symbol, rule) and held back while that pair is cooling down.
+    `flush` hands the batch to a bounded queue per destination, each
+    drained by its own delivery thread, so a slow destination delays
+    neither the caller nor the other destinations. When a queue is full
+    its oldest batch is dropped.
+    """
+
+    def __init__(self, destinations, cooldown=300.0, maxsize=100,
+                 telemetry=None):
+        """
+        Parameters:
+            destinations (dict): Keys are names (str) and values have a
+            `send(message)` method, e.g. `alerts.Sender`,
+            `MemoryDestination` or `FileDestination`.
+            cooldown (float): Minimum seconds between two alerts of the
+            same (symbol, rule).
+            maxsize (int): Batches queued per destination.
+            telemetry (Telemetry): Records delivery latency, if given.
+        """
+        self.destinations = destinations
+        self.cooldown = cooldown
+        self.maxsize = maxsize
+        self.telemetry = telemetry
+        self.counts = dict.fromkeys(
+            ['queued', 'delivered', 'dropped', 'deduped', 'suppressed',
+             'errors'], 0)
+        self.latency = Sketch()
+        self._batch = {}  # (symbol, rule) -> (message, monotonic time)
+        self._sent = {}  # (symbol, rule) -> monotonic time
+        self._queues = {}
+        self._threads = []
+        self._lock = threading.Lock()
+
+    """is_alive (bool): Whether delivery threads are started."""
+    @property
+    def is_alive(self):
+        return bool(self._threads)
+
+    """metrics (dict): Alert counts, per destination once queued, and
+    delivery latency (seconds)."""
+    @property
+    def metrics(self):
+        with self._lock:
+            metrics = dict(self.counts)
+            metrics['latency_p50'] = self.latency.percentile(50)
+            metrics['latency_p95'] = self.latency.percentile(95)
+            metrics['latency_max'] = self.latency.max
+        return metrics
+
+    def start(self):
+        """Starts one delivery thread per destination."""
+        if self.is_alive:
+            return
+        for name, destination in self.destinations.items():
+            self._queues[name] = queue.Queue(self.maxsize)
+            thread = threading.Thread(
+                target=self._deliver, args=(name, destination), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=10.0):
+        """Flushes, then stops once queued batches are delivered.
+
+        Parameters:
+            timeout (float): Seconds to wait per destination.
+        """
+        if not self.is_alive:
+            return
+        self.flush()
+        for q in self._queues.values():
+            q.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._queues = {}
+
+    def put(self, symbol, rule, message):
+        """Adds an alert to the current batch. Never blocks on delivery.
+
+        Returns:
+            bool: Whether the alert was accepted, i.e. neither a duplicate
+            nor cooling down.
+        """
+        key = (symbol, rule)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._batch:
+                self.counts['deduped'] += 1
+                return False
+            if now - self._sent.get(key, -float('inf')) < self.cooldown:
+                self.counts['suppressed'] += 1
+                return False
+            self._batch[key] = (message, now)
+            self._sent[key] = now
+            return True
+
+    def flush(self):
+        """Queues the current batch for every destination.
+
+        Delivers it right away, in the caller's thread, if not started.
+        """
+        with self._lock:
+            batch = list(self._batch.values())
+            self._batch = {}
+        if not batch:
+            return
+        if not self._queues:
+            for name, destination in self.destinations.items():
+                self._send(name, destination, batch)
+            return
+
+        for q in self._queues.values():
+            while True:
+                try:
+                    q.put_nowait(batch)
+                    break
+                except queue.Full:
+                    try:
+                        dropped = q.get_nowait()
+                    except queue.Empty:
+                        continue
+                    with self._lock:
+                        self.counts['dropped'] += len(dropped or [])
+        with self._lock:
+            self.counts['queued'] += len(batch) * len(self._queues)
+
+    # @Worker
+    def _deliver(self, name, destination):
+        q = self._queues[name]
+        while True:
+            batch = q.get()
+            if batch is None:
+                break
+            self._send(name, destination, batch)
+
+    # @Helper
+    def _send(self, name, destination, batch):
+        """Sends `batch` as one message and records its latency."""
+        message = '\n'.join(message for message, _ in batch)
+        try:
+            destination.send(message)
+        except Exception as e:
+            with self._lock:
+                self.counts['errors'] += len(batch)
+            print(f"Delivery to '{name}' failed! {e}")
+            return
+
+        now = time.monotonic()
+        seconds = [now - queued for _, queued in batch]
+        with self._lock:
+            self.counts['delivered'] += len(batch)
+            self.latency.update(seconds)
+        if self.telemetry is not None:
+            for value in seconds:
+                self.telemetry.observe('alert_latency_seconds', value,
+                                       destination=name)
+
+
+class MemoryDestination:
+    """A library class that keeps delivered messages in `messages`."""
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(message)
+
+
+class FileDestination:
+    """A library class that appends delivered messages to a file."""
+
+    def __init__(self, path):
+        """
+        Parameters:
+            path (str): File to append to.
+        """
+        self.path = path
+
+    def send(self, message):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a') as fh:
+            fh.write(f'{message}\n')
+
+
+if __name__ == '__main__':
+    pass
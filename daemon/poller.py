@@ -0,0 +1,188 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Adaptive per-symbol polling within a request budget.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import heapq
+import math
+import time
+
+import numpy as np
+
+
+class Poller:
+    """A library class that polls each symbol as often as it deserves.
+
+    Symbols close to their alert trigger, relative to how fast they have
+    been moving, are polled more often than symbols far from it. Each
+    symbol gets a share of `budget` proportional to its urgency, between
+    one poll per `max_interval` and one per `min_interval`. Next-due polls
+    are kept in a heap, and symbols due at the same time are polled
+    together. With a `calendar`, polling pauses between sessions.
+    """
+
+    def __init__(self, symbols, min_interval=15.0, max_interval=300.0,
+                 budget=60.0, calendar=None, warmup=0.0, clock=time.time,
+                 sleep=time.sleep):
+        """
+        Parameters:
+            symbols (list): Stock symbols.
+            min_interval (float): Seconds between polls of the most urgent
+            symbols.
+            max_interval (float): Seconds between polls of the least urgent
+            symbols, e.g. the bar interval.
+            budget (float): Symbol requests per minute, shared by all
+            symbols. At least one request per `max_interval` is made for
+            every symbol, even if that exceeds it.
+            calendar (sessions.Calendar): Market sessions. None polls
+            around the clock.
+            warmup (float): Seconds before each session open to call
+            `on_warmup` at. See `run`.
+            clock (callable): Returns the time in seconds since the epoch.
+            sleep (callable): Sleeps for a number of seconds.
+
+        Raises:
+            ValueError: Invalid `min_interval`, `max_interval` or
+            `budget`.
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f'min_interval = {min_interval} is not valid!\n'
+                             f'Valid values are: 0 < min_interval <= '
+                             f'max_interval = {max_interval}')
+        if budget <= 0:
+            raise ValueError(f'budget = {budget} is not valid!\n'
+                             f'Valid values are: positive')
+        self.symbols = list(symbols)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget = budget
+        self.calendar = calendar
+        self.warmup = warmup
+        self.clock = clock
+        self.sleep = sleep
+        self.polls = 0
+        self.requests = 0
+        self.urgency = np.ones(len(self.symbols))
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._intervals = None
+        self._heap = []
+
+    """intervals (np.ndarray): Seconds between polls, per symbol."""
+    @property
+    def intervals(self):
+        if self._intervals is None:
+            self._intervals = 1 / self._get_rates()
+        return self._intervals
+
+    """metrics (dict): Poll counts and planned requests per minute."""
+    @property
+    def metrics(self):
+        intervals = self.intervals
+        return {
+            'polls': self.polls,
+            'requests': self.requests,
+            'rate': float(np.sum(60 / intervals)) if intervals.size else 0.0,
+            'interval_min': float(intervals.min(initial=math.inf)),
+            'interval_max': float(intervals.max(initial=0.0)),
+        }
+
+    def update(self, symbol, distance, volatility):
+        """Sets the urgency of `symbol` from its last poll.
+
+        Parameters:
+            distance (float): How far the symbol is from its trigger, e.g.
+            RSI minus flag RSI. Zero or less is most urgent.
+            volatility (float): Typical move per bar, in units of
+            `distance`. NaN inputs are least urgent.
+        """
+        if math.isnan(distance) or math.isnan(volatility):
+            urgency = 0.0
+        else:
+            # Bars to the trigger at the recent pace.
+            bars = max(distance, 0.0) / max(volatility, 1e-9)
+            urgency = 1 / (1 + bars)
+        self.urgency[self._index[symbol]] = urgency
+        self._intervals = None
+
+    def run(self, func, is_running=lambda: True, on_warmup=None):
+        """Calls `func(symbols)` with due symbols while `is_running()`.
+
+        All symbols are due at once first, and at each session open. Once
+        polled, each symbol is due again after its interval, as of after
+        `func` returns, so updates made by `func` apply right away.
+
+        Parameters:
+            func (callable): Polls the symbols (list) it is given.
+            is_running (callable): Returns False to stop, checked at least
+            once a second while waiting.
+            on_warmup (callable): Work done `warmup` seconds before each
+            session open, e.g. pre-fetching.
+        """
+        self._heap = []
+        warmed = None
+
+        while is_running() and self.symbols:
+            now = self.clock()
+            if self.calendar is not None and not self.calendar.is_open(now):
+                self._heap = []
+                open_ = self.calendar.get_next_open(now)
+                if (on_warmup is not None and warmed != open_
+                        and open_ - now <= self.warmup):
+                    warmed = open_
+                    on_warmup()
+                    continue
+                self.sleep(min(open_ - now, 1.0))
+                continue
+            if not self._heap:
+                self._heap = [(now, i) for i in range(len(self.symbols))]
+                heapq.heapify(self._heap)
+            if now < self._heap[0][0]:
+                self.sleep(min(self._heap[0][0] - now, 1.0))
+                continue
+
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[1])
+            self.polls += 1
+            self.requests += len(due)
+
+            func([self.symbols[i] for i in due])
+
+            now = self.clock()
+            intervals = self.intervals
+            for i in due:
+                heapq.heappush(self._heap, (now + intervals[i], i))
+
+    # @Helper
+    def _get_rates(self):
+        """Returns polls per second, per symbol, within `budget`.
+
+        Rates are proportional to urgency. Rates above one per
+        `min_interval` are capped and their excess is shared by the rest.
+        """
+        lo, hi = 1 / self.max_interval, 1 / self.min_interval
+        rates = np.full(len(self.symbols), lo)
+        free = np.ones(len(self.symbols), dtype=bool)
+        spare = self.budget / 60 - lo * len(self.symbols)
+        while spare > 0 and free.any():
+            weights = self.urgency * free
+            if not weights.any():
+                break
+            rates[free] += spare * weights[free] / weights.sum()
+            capped = rates > hi
+            if not (capped & free).any():
+                break
+            spare = float(np.sum(rates[capped] - hi))
+            rates[capped] = hi
+            free &= ~capped
+
+        return rates
+
+
+if __name__ == '__main__':
+    pass
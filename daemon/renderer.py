@@ -0,0 +1,190 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Background rendering of daemon outputs.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import multiprocessing as mp
+import threading
+import time
+
+from sketches import Moments
+
+
+class Renderer:
+    """A library class that renders artifacts off the caller's thread.
+
+    `submit` only records the latest job per artifact and returns. A
+    background thread hands due jobs, one at a time, to a dedicated
+    render process, so plotting neither blocks nor competes for the GIL
+    with the caller. A job submitted while an older one for the same
+    artifact is pending replaces it (coalescing) and each artifact is
+    rendered at most once per `min_interval` (rate-limiting).
+    """
+
+    def __init__(self, min_interval=60.0, telemetry=None):
+        """
+        Parameters:
+            min_interval (float): Minimum seconds between two renders of
+            the same artifact.
+            telemetry (Telemetry): Records render times as the 'render'
+            stage, if given.
+        """
+        self.min_interval = min_interval
+        self.telemetry = telemetry
+        self.rendered = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.seconds = Moments()
+        self._pending = {}  # key -> (func, args, kwargs)
+        self._last = {}  # key -> monotonic time of last render
+        self._cond = threading.Condition()
+        self._closing = False
+        self._flush = True
+        self._thread = None
+        self._pool = None
+
+    """is_alive (bool): Whether the renderer is started."""
+    @property
+    def is_alive(self):
+        return self._thread is not None
+
+    """metrics (dict): Render counts and render time statistics (s)."""
+    @property
+    def metrics(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'rendered': self.rendered,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'seconds_mean': self.seconds.mean,
+            'seconds_max': self.seconds.max,
+        }
+
+    def start(self):
+        """Starts the render process and thread, if not started yet."""
+        if self.is_alive:
+            return
+        self._closing = False
+        self._pool = mp.Pool(1, initializer=_init)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """Stops rendering and closes the figures kept by the process.
+
+        Parameters:
+            flush (bool): Renders pending jobs first, ignoring
+            `min_interval`.
+        """
+        if not self.is_alive:
+            return
+        with self._cond:
+            self._closing = True
+            self._flush = flush
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._pool.apply(_close)
+        except Exception as e:
+            print(f'Closing figures failed! {e}')
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    def submit(self, key, func, *args, **kwargs):
+        """Queues `func(*args, **kwargs)` as the latest render of `key`.
+
+        Never blocks on rendering. `func` and its arguments must pickle.
+
+        Parameters:
+            key (str): Artifact id, e.g. its file name.
+            func (callable): Module-level function that renders it.
+        """
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = (func, args, kwargs)
+            self._cond.notify()
+
+    # @Worker
+    def _run(self):
+        while True:
+            with self._cond:
+                key, job = self._next()
+                while key is None:
+                    if self._closing:
+                        return
+                    self._cond.wait(self._get_wait())
+                    key, job = self._next()
+            self._render(key, job)
+
+    # @Helper
+    def _next(self):
+        """Pops the first due job.
+
+        Returns:
+            tuple: Key and job, (None, None) if no job is due.
+        """
+        now = time.monotonic()
+        for key in self._pending:
+            if self._closing and not self._flush:
+                break
+            due = self._last.get(key, -float('inf')) + self.min_interval
+            if self._closing or now >= due:
+                return key, self._pending.pop(key)
+        return None, None
+
+    # @Helper
+    def _get_wait(self):
+        """Returns seconds until a pending job is due, None if none is."""
+        if not self._pending:
+            return None
+        now = time.monotonic()
+        dues = [self._last.get(key, -float('inf')) + self.min_interval
+                for key in self._pending]
+        return max(min(dues) - now, 0.0)
+
+    # @Helper
+    def _render(self, key, job):
+        func, args, kwargs = job
+        start = time.monotonic()
+        try:
+            self._pool.apply(func, args, kwargs)
+        except Exception as e:
+            self.errors += 1
+            print(f"Rendering '{key}' failed! {e}")
+        else:
+            self.rendered += 1
+        end = time.monotonic()
+        self.seconds.update([end - start])
+        if self.telemetry is not None:
+            self.telemetry.observe('stage_seconds', end - start,
+                                   stage='render')
+        with self._cond:
+            self._last[key] = end
+
+
+# @Helper
+def _init():
+    """Selects a non-interactive backend in the render process."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+# @Helper
+def _close():
+    """Closes the figures kept in the render process."""
+    import plotter
+    plotter.close_dashboards()
+
+
+if __name__ == '__main__':
+    pass
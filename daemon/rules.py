@@ -0,0 +1,212 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Declarative alert rules, evaluated for all symbols at once.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import numpy as np
+
+
+class Rule:
+    """A library class that declares one alert condition.
+
+    A rule compares `field` with `threshold`, which is either a number or
+    another field, e.g. `Rule('rsi_low', 'RSI', '<=', 'Flag')` or
+    `Rule('volume_spike', 'Volume', '>=', 'AvgVolume', scale=3)`. It fires
+    when its condition becomes true, then re-arms once `field` moves back
+    past the threshold by more than `hysteresis`. Fields are whatever the
+    caller feeds to `RuleEngine.evaluate`, see `Daemon.FIELDS` for those
+    of the daemons.
+    """
+
+    """list: Comparison operators. Crossings compare with the previous
+    value of `field`."""
+    OPS = ['<=', '<', '>=', '>', 'crosses_above', 'crosses_below']
+
+    def __init__(self, name, field, op, threshold, scale=1.0, hysteresis=0.0,
+                 cooldown=0.0):
+        """
+        Parameters:
+            name (str): Rule id.
+            field (str): Field to test, e.g. 'RSI'.
+            op (str): Operator. See `OPS`.
+            threshold (any): Number or field to compare with.
+            scale (float): Factor applied to `threshold`.
+            hysteresis (float): How far `field` must move back past the
+            threshold before the rule can fire again.
+            cooldown (float): Minimum seconds between two firings per
+            symbol.
+
+        Raises:
+            ValueError: Invalid `op`.
+        """
+        if op not in self.OPS:
+            raise ValueError(f'op = {op} is not valid!\n'
+                             f'Valid values are: {self.OPS}')
+        self.name = name
+        self.field = field
+        self.op = op
+        self.threshold = threshold
+        self.scale = scale
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+
+    """is_below (bool): Whether the rule fires on low values."""
+    @property
+    def is_below(self):
+        return self.op in ('<=', '<', 'crosses_below')
+
+    def __repr__(self):
+        threshold = self.threshold
+        if self.scale != 1:
+            threshold = f'{self.scale:g} * {threshold}'
+        return f'{self.name}: {self.field} {self.op} {threshold}'
+
+
+class RuleEngine:
+    """A library class that evaluates `rules` for `symbols` per tick.
+
+    Rules are compiled to index and parameter arrays, so each tick is a
+    handful of numpy operations over a (rules, symbols) matrix regardless
+    of their number. Hysteresis (armed) and cooldown (last firing) state
+    is kept in matrices of the same shape.
+    """
+
+    def __init__(self, symbols, rules, fields=None):
+        """
+        Parameters:
+            symbols (list): Stock symbols, in the order of the values
+            passed to `evaluate`.
+            rules (list): `Rule` objects.
+            fields (list): Fields the caller provides. Defaults to any.
+
+        Raises:
+            ValueError: A rule uses a field not in `fields`.
+        """
+        self.symbols = list(symbols)
+        self.rules = list(rules)
+        self.fields = sorted(
+            {r.field for r in self.rules}
+            | {r.threshold for r in self.rules
+               if isinstance(r.threshold, str)})
+        unknown = [f for f in self.fields
+                   if fields is not None and f not in fields]
+        if unknown:
+            raise ValueError(f'fields = {unknown} are not valid!\n'
+                             f'Valid values are: {list(fields)}')
+
+        # Compiles rules into arrays, one row per rule.
+        index = {f: i for i, f in enumerate(self.fields)}
+        is_field = [isinstance(r.threshold, str) for r in self.rules]
+        self._lhs = np.array([index[r.field] for r in self.rules], dtype=int)
+        self._rhs = np.array(
+            [index[r.threshold] if f else 0
+             for r, f in zip(self.rules, is_field)], dtype=int)
+        self._consts = np.flatnonzero(~np.array(is_field, dtype=bool))
+        self._const = np.array(
+            [self.rules[i].threshold for i in self._consts],
+            dtype=float)[:, None]
+        scale = np.array([r.scale for r in self.rules], dtype=float)
+        self._scaled = np.flatnonzero(scale != 1)
+        self._scale = scale[self._scaled][:, None]
+        self._cooldown = np.array(
+            [r.cooldown for r in self.rules], dtype=float)[:, None]
+        is_below = np.array([r.is_below for r in self.rules], dtype=bool)
+        hysteresis = np.array([r.hysteresis for r in self.rules], dtype=float)
+        band = np.where(is_below, hysteresis, -hysteresis)
+        self._band = band[:, None] if band.any() else None
+        self._below = np.flatnonzero(is_below)
+        self._above = np.flatnonzero(~is_below)
+        ops = np.array([r.op for r in self.rules])
+        self._groups = [(op, np.flatnonzero(ops == op)) for op in Rule.OPS
+                        if op in ops]
+
+        self.reset()
+
+    def reset(self):
+        """Clears hysteresis, cooldown and crossing state."""
+        shape = (len(self.rules), len(self.symbols))
+        self.armed = np.ones(shape, dtype=bool)
+        self.ready = np.full(shape, -np.inf)  # End of cooldown.
+        self.prev = np.full(shape, np.nan)
+
+    def evaluate(self, values, now=0.0):
+        """Returns which rules fire for which symbols.
+
+        Parameters:
+            values (dict): Keys are `fields` (str) and values are arrays
+            aligned with `symbols`. NaN never fires.
+            now (float): Current time in seconds, for cooldowns.
+
+        Returns:
+            np.ndarray: Boolean (rules, symbols) matrix.
+
+        Raises:
+            ValueError: A field in `fields` is missing from `values`.
+        """
+        missing = [f for f in self.fields if f not in values]
+        if missing:
+            raise ValueError(f'values = {missing} are missing!\n'
+                             f'Valid values are: {self.fields}')
+        data = np.vstack(
+            [np.asarray(values[f], dtype=float) for f in self.fields])
+
+        lhs = data[self._lhs]
+        rhs = data[self._rhs]
+        if self._consts.size:
+            rhs[self._consts] = self._const
+        if self._scaled.size:
+            rhs[self._scaled] *= self._scale
+
+        with np.errstate(invalid='ignore'):
+            # One comparison per operator, over the rows of its rules.
+            hit = np.empty(lhs.shape, dtype=bool)
+            for op, rows in self._groups:
+                x, y = lhs[rows], rhs[rows]
+                if op == '<=':
+                    hit[rows] = x <= y
+                elif op == '<':
+                    hit[rows] = x < y
+                elif op == '>=':
+                    hit[rows] = x >= y
+                elif op == '>':
+                    hit[rows] = x > y
+                elif op == 'crosses_above':
+                    hit[rows] = (self.prev[rows] <= y) & (x > y)
+                else:
+                    hit[rows] = (self.prev[rows] >= y) & (x < y)
+            fired = hit & self.armed & (self.ready <= now)
+
+            # Re-arms once `field` moved back past the hysteresis band.
+            if self._band is not None:
+                rhs += self._band
+            rearm = np.empty(lhs.shape, dtype=bool)
+            rearm[self._below] = lhs[self._below] > rhs[self._below]
+            rearm[self._above] = lhs[self._above] < rhs[self._above]
+
+        self.armed |= rearm
+        self.armed &= ~fired
+        np.copyto(self.ready, now + self._cooldown, where=fired)
+        self.prev = lhs
+
+        return fired
+
+    def get_events(self, fired):
+        """Returns the (rule, symbol) pairs that fired.
+
+        Parameters:
+            fired (np.ndarray): As returned by `evaluate`.
+
+        Returns:
+            list: Tuples of `Rule` and symbol (str).
+        """
+        return [(self.rules[i], self.symbols[j])
+                for i, j in zip(*np.nonzero(fired))]
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,209 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Bar-aligned tick scheduling.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import math
+import re
+import time
+
+from sketches import Sketch
+
+
+class Scheduler:
+    """A library class that fires ticks right after bars close.
+
+    Ticks are due at `origin + k * interval + delay` of each day, so
+    they neither drift with the work done per tick nor with the time
+    spent sleeping. Ticks that are already late when the previous one
+    ends are handled according to `policy`. With a `calendar`, only bars
+    within sessions are ticked, and the scheduler sleeps in between.
+    """
+
+    """list: Overrun policies.
+        'skip': Late ticks are dropped and the next bar is waited for.
+        'coalesce': Late ticks are folded into one tick, run at once.
+        'catch_up': Late ticks are all run, back to back.
+    """
+    POLICIES = ['skip', 'coalesce', 'catch_up']
+
+    """dict: Seconds per interval unit."""
+    UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'wk': 604800}
+
+    def __init__(self, interval='5m', delay=5.0, policy=POLICIES[0],
+                 origin=dt.time(9, 30), grace=None, calendar=None,
+                 warmup=0.0, clock=time.time, sleep=time.sleep):
+        """
+        Parameters:
+            interval (any): Bar interval, e.g. '5m', or seconds (float).
+            delay (float): Seconds to wait after a bar closes for the data
+            source to settle.
+            policy (str): Overrun policy. See `POLICIES`.
+            origin (dt.time): Time of day bars are aligned to, e.g. the
+            session open, in the time zone of `calendar`, else local.
+            grace (float): Seconds a tick may start late before it counts
+            as missed. Defaults to half an `interval`.
+            calendar (sessions.Calendar): Market sessions. None ticks
+            around the clock.
+            warmup (float): Seconds before the first tick of a session to
+            call `on_warmup` at. See `run`.
+            clock (callable): Returns the time in seconds since the epoch.
+            sleep (callable): Sleeps for a number of seconds.
+
+        Raises:
+            ValueError: Invalid `interval` or `policy`.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f'policy = {policy} is not valid!\n'
+                             f'Valid values are: {self.POLICIES}')
+        self.period = self._get_period(interval)
+        self.delay = delay
+        self.policy = policy
+        self.origin = origin
+        self.grace = self.period / 2 if grace is None else grace
+        self.calendar = calendar
+        self.warmup = warmup
+        self.clock = clock
+        self.sleep = sleep
+        self.due = None
+        self.ticks = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.overruns = 0
+        self.warmups = 0
+        self.lag = Sketch()
+        self.lag_last = math.nan
+
+    """metrics (dict): Tick counts and start lag statistics (seconds)."""
+    @property
+    def metrics(self):
+        return {
+            'ticks': self.ticks,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+            'overruns': self.overruns,
+            'warmups': self.warmups,
+            'lag_last': self.lag_last,
+            'lag_mean': self.lag.mean,
+            'lag_p95': self.lag.percentile(95),
+            'lag_max': self.lag.max,
+        }
+
+    def get_next(self, now):
+        """Returns the first tick due after `now` (seconds since epoch).
+
+        With a `calendar`, ticks whose bar is not within a session are
+        passed over.
+        """
+        tz = None if self.calendar is None else self.calendar.tz
+        day = dt.datetime.fromtimestamp(now, tz).date()
+        base = dt.datetime.combine(
+            day, self.origin, tzinfo=tz).timestamp() + self.delay
+        k = math.floor((now - base) / self.period) + 1
+        due = base + k * self.period
+        if self.calendar is None or self._is_session(due):
+            return due
+
+        # Bars must be at least half within the session.
+        open_ = self.calendar.get_next_open(due - self.delay)
+        return self.get_next(open_ + self.delay + self.period / 2)
+
+    def run(self, func, is_running=lambda: True, on_warmup=None):
+        """Calls `func()` on every due tick while `is_running()`.
+
+        Parameters:
+            func (callable): Work done per tick.
+            is_running (callable): Returns False to stop, checked at least
+            once a second while waiting.
+            on_warmup (callable): Work done `warmup` seconds before the
+            first tick of each session, e.g. pre-fetching, if the market
+            is closed by then.
+        """
+        self.due = self.get_next(self.clock())
+        warmed = None
+
+        while is_running():
+            now = self.clock()
+            if now < self.due:
+                if (on_warmup is not None and self.calendar is not None
+                        and warmed != self.due
+                        and self.due - now <= self.warmup
+                        and self._is_first(now)):
+                    warmed = self.due
+                    self.warmups += 1
+                    on_warmup()
+                    continue
+                self.sleep(min(self.due - now, 1.0))
+                continue
+
+            late = now - self.due
+            if late > self.grace:
+                missed = math.floor(late / self.period)
+                if self.policy == 'skip':
+                    self.skipped += missed + 1
+                    self.due = self.get_next(now)
+                    continue
+                if self.policy == 'coalesce':
+                    self.coalesced += missed
+                    self.due += missed * self.period
+
+            self._tick(func)
+
+    # @Helper
+    def _tick(self, func):
+        """Runs `func` for `due` and schedules the next tick."""
+        start = self.clock()
+        self.lag_last = start - self.due
+        self.lag.update([self.lag_last])
+        self.ticks += 1
+
+        func()
+
+        self.due += self.period
+        if self.calendar is not None and not self._is_session(self.due):
+            self.due = self.get_next(self.due)
+        if self.clock() > self.due:
+            self.overruns += 1
+
+    # @Helper
+    def _is_first(self, now):
+        """Returns whether `due` opens a session not open yet at `now`."""
+        if self.calendar.is_open(now):
+            return False
+        open_ = self.calendar.get_next_open(now)
+        return open_ <= self.due - self.delay - self.period / 2
+
+    # @Helper
+    def _is_session(self, due):
+        """Returns whether the bar ticked at `due` is within a session."""
+        return self.calendar.is_open(due - self.delay - self.period / 2)
+
+    # @Helper
+    def _get_period(self, interval):
+        """Returns `interval` in seconds."""
+        if isinstance(interval, (int, float)):
+            period = float(interval)
+        else:
+            match = re.match(r'(\d+)(s|m|h|d|wk)$', str(interval))
+            if not match:
+                raise ValueError(f'interval = {interval} is not valid!\n'
+                                 f'Valid values are: '
+                                 f'"{{n}}{{s|m|h|d|wk}}" or seconds')
+            n, unit = match.groups()
+            period = int(n) * self.UNITS[unit]
+
+        if period <= 0:
+            raise ValueError(f'interval = {interval} is not valid!\n'
+                             f'Valid values are: positive')
+
+        return period
+
+
+if __name__ == '__main__':
+    pass
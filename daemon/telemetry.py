@@ -0,0 +1,213 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Latency histograms, counters and gauges, with Prometheus/JSON export.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import contextlib
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+from sketches import Sketch
+
+
+class Telemetry:
+    """A library class that records metrics and exports them.
+
+    Metrics are identified by name and labels, e.g.
+    `observe('stage_seconds', 0.2, stage='fetch')`. Observations go to a
+    histogram with fixed `BUCKETS`, like Prometheus, and to a `Sketch`
+    for quantiles in the JSON dump. Thread-safe.
+    """
+
+    """tuple: Histogram upper bounds in seconds."""
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+               10.0, 30.0, 60.0)
+
+    def __init__(self, prefix='stocks'):
+        """
+        Parameters:
+            prefix (str): Prefix of the exported metric names.
+        """
+        self.prefix = prefix
+        self._histograms = {}  # (name, labels) -> [counts, Sketch]
+        self._counters = {}  # (name, labels) -> float
+        self._gauges = {}  # (name, labels) -> float
+        self._lock = threading.Lock()
+        self._server = None
+
+    @contextlib.contextmanager
+    def timer(self, stage, **labels):
+        """Observes the seconds spent in the block as `stage_seconds`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start,
+                         stage=stage, **labels)
+
+    def observe(self, name, value, **labels):
+        """Adds `value` to histogram `name`."""
+        key = (name, self._get_labels(labels))
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = [[0] * len(self.BUCKETS), Sketch()]
+            counts, sketch = self._histograms[key]
+            for i, bound in enumerate(self.BUCKETS):
+                if value <= bound:
+                    counts[i] += 1
+            sketch.update([value])
+
+    def inc(self, name, value=1, **labels):
+        """Increases counter `name` by `value`."""
+        key = (name, self._get_labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Sets gauge `name` to `value`."""
+        key = (name, self._get_labels(labels))
+        with self._lock:
+            self._gauges[key] = value
+
+    def to_prometheus(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters),
+                                  ('gauge', self._gauges)):
+                for name in sorted({k[0] for k in metrics}):
+                    lines.append(f'# TYPE {self.prefix}_{name} {kind}')
+                    for (name_, labels), value in sorted(metrics.items()):
+                        if name_ == name:
+                            lines.append(f'{self.prefix}_{name}'
+                                         f'{self._format(labels)} {value:g}')
+
+            for name in sorted({k[0] for k in self._histograms}):
+                metric = f'{self.prefix}_{name}'
+                lines.append(f'# TYPE {metric} histogram')
+                for (name_, labels), (counts, sketch) in sorted(
+                        self._histograms.items()):
+                    if name_ != name:
+                        continue
+                    for bound, count in zip(self.BUCKETS, counts):
+                        le = labels + (('le', f'{bound:g}'),)
+                        lines.append(
+                            f'{metric}_bucket{self._format(le)} {count}')
+                    le = labels + (('le', '+Inf'),)
+                    lines.append(
+                        f'{metric}_bucket{self._format(le)} {sketch.count}')
+                    total = sketch.mean * sketch.count if sketch.count else 0
+                    lines.append(
+                        f'{metric}_sum{self._format(labels)} {total:g}')
+                    lines.append(
+                        f'{metric}_count{self._format(labels)} {sketch.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        """Returns all metrics as a JSON-serializable dictionary."""
+        data = {'time': time.time(), 'counters': [], 'gauges': [],
+                'histograms': []}
+        with self._lock:
+            for kind, metrics in (('counters', self._counters),
+                                  ('gauges', self._gauges)):
+                for (name, labels), value in sorted(metrics.items()):
+                    data[kind].append({'name': name, 'labels': dict(labels),
+                                       'value': self._get_number(value)})
+            for (name, labels), (_, sketch) in sorted(
+                    self._histograms.items()):
+                data['histograms'].append({
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': sketch.count,
+                    'mean': self._get_number(sketch.mean),
+                    'p50': self._get_number(sketch.percentile(50)),
+                    'p95': self._get_number(sketch.percentile(95)),
+                    'max': self._get_number(sketch.max)})
+
+        return data
+
+    def dump(self, path):
+        """Writes `to_dict()` as JSON to `path`, atomically.
+
+        Returns:
+            str: `path`.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serves `to_prometheus()` at http://`host`:`port`/metrics.
+
+        The server runs in a daemon thread until `shutdown`.
+
+        Raises:
+            OSError: `port` is not available.
+        """
+        if self._server is not None:
+            return
+        telemetry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = telemetry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever,
+                         daemon=True).start()
+
+    def shutdown(self):
+        """Stops serving, if serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # @Helper
+    @staticmethod
+    def _get_labels(labels):
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    # @Helper
+    @staticmethod
+    def _format(labels):
+        if not labels:
+            return ''
+        pairs = ','.join(f'{k}="{v}"' for k, v in labels)
+        return '{' + pairs + '}'
+
+    # @Helper
+    @staticmethod
+    def _get_number(value):
+        """Returns `value` as float, None if NaN (not valid JSON)."""
+        value = float(value)
+        return None if math.isnan(value) else value
+
+
+if __name__ == '__main__':
+    pass
@@ -8,7 +8,17 @@
 """
 
 
-from daemon import Daemon
+import datetime as dt
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+from sessions import Calendar
+from daemon import (
+    AsyncDaemon, Daemon, Dispatcher, FakeSource, MemoryDestination, Poller,
+    Renderer, Rule, RuleEngine, Scheduler, Telemetry, Workers)
 
 
 def check_observe():
@@ -16,5 +26,163 @@ def check_observe():
     Daemon(symbols).start()
 
 
+def check_observe_all():
+    # One fetch of all watchlists per tick, outputs per watchlist.
+    Daemon(config.WATCHLISTS).start()
+
+
+def check_workers():
+    workers = Workers(2)
+    print(workers.starmap(pow, [(2, 3), (3, 2), (4, 2)]))  # [8, 9, 16]
+    workers.stop()
+
+
+def check_scheduler():
+    now = [dt.datetime(2021, 3, 5, 10, 1).timestamp()]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    def work():
+        print(dt.datetime.fromtimestamp(now[0]).time())
+        sleep(700 if scheduler.ticks == 2 else 10)  # 2nd tick overruns.
+
+    # Fires at 10:05:05, 10:10:05, then skips to 10:25:05.
+    scheduler = Scheduler('5m', 5.0, 'skip', clock=lambda: now[0],
+                          sleep=sleep)
+    scheduler.run(work, lambda: scheduler.ticks < 4)
+    print(scheduler.metrics)
+
+
+def check_calendar():
+    now = [dt.datetime(2021, 2, 12, 15, 46).timestamp()]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    def work():
+        print(dt.datetime.fromtimestamp(now[0]))
+
+    # Fires at 15:50:05, 15:55:05 and 16:00:05 on Friday, warms up at
+    # 9:25:05 on Tuesday (Presidents' Day on Monday), then fires at 9:35:05.
+    scheduler = Scheduler('5m', 5.0, calendar=Calendar(), warmup=600.0,
+                          clock=lambda: now[0], sleep=sleep)
+    scheduler.run(work, lambda: scheduler.ticks < 4,
+                  lambda: print('Warming up...'))
+    print(scheduler.metrics)
+
+
+def check_poller():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    # RSI 0, 5 and 50 points above flag, moving 1 point per bar.
+    poller = Poller(['MSFT', 'AAPL', 'TSLA'], 15.0, 300.0, budget=6.0,
+                    clock=lambda: now[0], sleep=sleep)
+    for symbol, distance in zip(poller.symbols, [0.0, 5.0, 50.0]):
+        poller.update(symbol, distance, 1.0)
+    print(poller.intervals)  # Shortest for MSFT, longest for TSLA.
+    poller.run(print, lambda: now[0] < 120)
+    print(poller.metrics)
+
+
+def check_adaptive():
+    Daemon(['MSFT', 'AAPL']).start(budget=12.0)
+
+
+def check_renderer():
+    renderer = Renderer(min_interval=1.0)
+    renderer.start()
+    for i in range(10):
+        renderer.submit('status', print, f'render {i}')  # Latest wins.
+    time.sleep(1.5)
+    renderer.stop()
+    print(renderer.metrics)
+
+
+def check_async():
+    # Offline: forecasts from and replays of random 5m bars.
+    symbols = ['MSFT', 'AAPL']
+    prices = get_random_prices(symbols)
+    daemon = AsyncDaemon(symbols, snapshot=None,
+                         bars=FakeSource(prices, interval=0.1))
+    daemon.forecaster.prices = prices
+    daemon.forecaster.rsi = daemon._get_rsi(prices)
+    daemon.start()
+    print(daemon.metrics)
+
+
+def get_random_prices(symbols, days=20, seed=0):
+    """Returns random walks of 5m bars over `days` sessions per symbol."""
+    rng = np.random.default_rng(seed)
+    stamps = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f'{day.date()} 09:30', periods=78, freq='5min')
+        for day in pd.bdate_range('2021-03-01', periods=days)]))
+    prices = {}
+    for symbol in symbols:
+        walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, stamps.size)))
+        prices[symbol] = pd.DataFrame({
+            'Date': stamps.date, 'Time': stamps.time, 'Price': walk})
+        prices[symbol].index.rename('Prices', inplace=True)
+    return prices
+
+
+def check_telemetry():
+    telemetry = Telemetry()
+    with telemetry.timer('fetch'):
+        time.sleep(0.02)
+    telemetry.set('fetch_seconds', 0.02, symbol='MSFT')
+    telemetry.inc('alerts', symbol='MSFT')
+    print(telemetry.to_prometheus())
+    print(telemetry.to_dict())
+
+
+def check_rules():
+    engine = RuleEngine(['MSFT', 'AAPL'], [
+        Rule('rsi_low', 'RSI', '<=', 'Flag', hysteresis=2),
+        Rule('breakout', 'Price', 'crosses_above', 300.0, cooldown=600)])
+    ticks = [
+        {'RSI': [45, 30], 'Flag': [40, 35], 'Price': [290, 120]},
+        {'RSI': [39, 34], 'Flag': [40, 35], 'Price': [301, 121]},
+        {'RSI': [41, 38], 'Flag': [40, 35], 'Price': [299, 122]},
+        {'RSI': [39, 33], 'Flag': [40, 35], 'Price': [302, 123]},
+    ]
+    for now, values in enumerate(ticks):
+        # rsi_low: AAPL on 0 and 3 (re-armed at 38 > 35 + 2), MSFT on 1
+        # only (41 is within the band). breakout: MSFT on 1 only (cooldown).
+        print(now, engine.get_events(engine.evaluate(values, now * 60)))
+    try:
+        RuleEngine(['MSFT'], [
+            Rule('volume_spike', 'Volume', '>=', 'AvgVolume', scale=3)],
+            Daemon.FIELDS)
+    except ValueError as e:
+        print(e)
+
+
+def check_dispatcher():
+    memory = MemoryDestination()
+    dispatcher = Dispatcher({'memory': memory}, cooldown=60.0)
+    dispatcher.start()
+    for tick in range(3):
+        dispatcher.put('MSFT', 'rsi_low', f'MSFT low at tick {tick}')
+        dispatcher.put('MSFT', 'rsi_low', 'Duplicate')
+        dispatcher.put('AAPL', 'rsi_low', f'AAPL low at tick {tick}')
+        dispatcher.flush()
+    dispatcher.stop()
+    print(memory.messages)  # One batch: tick 0 of MSFT and AAPL.
+    print(dispatcher.metrics)
+
+
 if __name__ == '__main__':
+    check_workers()
+    check_scheduler()
+    check_calendar()
+    check_poller()
+    check_renderer()
+    check_telemetry()
+    check_rules()
+    check_dispatcher()
     check_observe()
+    check_async()
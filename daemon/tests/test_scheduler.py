@@ -0,0 +1,64 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests scheduler module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import os
+import time
+import unittest
+
+from daemon import Daemon, Scheduler
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tz = os.environ.get('TZ')
+        # A server outside of New York, off by a fraction of an hour.
+        os.environ['TZ'] = 'Asia/Kolkata'
+        time.tzset()
+        self.calendar = Daemon.CALENDAR
+
+    def tearDown(self):
+        if self.tz is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = self.tz
+        time.tzset()
+
+    def get_time(self, *args):
+        return dt.datetime(*args, tzinfo=self.calendar.tz).timestamp()
+
+    def test_ticks_follow_the_exchange_time_zone(self):
+        scheduler = Scheduler('5m', 5.0, calendar=self.calendar)
+
+        # Before the open in New York, 19:30 in Kolkata.
+        now = self.get_time(2021, 2, 16, 9, 0)
+        self.assertEqual(scheduler.get_next(now),
+                         self.get_time(2021, 2, 16, 9, 35, 5))
+
+        # After the close, ticks resume at the next session.
+        now = self.get_time(2021, 2, 16, 16, 30)
+        self.assertEqual(scheduler.get_next(now),
+                         self.get_time(2021, 2, 17, 9, 35, 5))
+
+    def test_ticks_are_aligned_to_the_open_in_session(self):
+        scheduler = Scheduler('5m', 5.0, calendar=self.calendar)
+
+        now = self.get_time(2021, 2, 16, 10, 1)
+        self.assertEqual(scheduler.get_next(now),
+                         self.get_time(2021, 2, 16, 10, 5, 5))
+
+        scheduler = Scheduler('1h', 5.0, calendar=self.calendar)
+        self.assertEqual(scheduler.get_next(now),
+                         self.get_time(2021, 2, 16, 10, 30, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
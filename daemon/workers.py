@@ -0,0 +1,182 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Supervised long-lived worker processes.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import multiprocessing as mp
+import os
+import queue
+import traceback
+
+
+class Workers:
+    """A library class for supervised, long-lived worker processes.
+
+    Workers are started once and fed one task at a time. `starmap`
+    mirrors `mp.Pool.starmap`, so `self` can stand in for a pool, e.g.
+    as `Collector.pool`. Workers that die are restarted and their
+    in-flight tasks are retried up to `retries` times.
+    """
+
+    def __init__(self, processes=None, retries=1, timeout=1.0):
+        """
+        Parameters:
+            processes (int): Number of workers. Defaults to CPU count.
+            retries (int): Times a task lost to a crash is resubmitted.
+            timeout (float): Seconds between liveness checks while
+            waiting for results.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.retries = retries
+        self.timeout = timeout
+        self.restarts = 0
+        self._procs = []
+        self._inboxes = []
+        self._results = None
+
+    """is_alive (bool): Whether workers are started."""
+    @property
+    def is_alive(self):
+        return bool(self._procs)
+
+    def start(self):
+        """Starts the workers, if not started yet."""
+        if self.is_alive:
+            return
+        self._results = mp.Queue()
+        self._inboxes = [mp.Queue() for _ in range(self.processes)]
+        self._procs = [self._spawn(i) for i in range(self.processes)]
+
+    def stop(self, timeout=5.0):
+        """Stops the workers once they finish their current task.
+
+        Parameters:
+            timeout (float): Seconds to wait per worker before it is
+            terminated.
+        """
+        if not self.is_alive:
+            return
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        for q in self._inboxes + [self._results]:
+            q.close()
+            q.join_thread()
+        self._procs = []
+        self._inboxes = []
+
+    def starmap(self, func, iterable):
+        """Returns `[func(*args) for args in iterable]`, run by the workers.
+
+        Each worker runs one task at a time, so the tasks of a worker
+        that dies are known and resubmitted.
+
+        Raises:
+            RuntimeError: A task raised or was lost more than `retries`
+            times.
+        """
+        self.start()
+
+        tasks = list(iterable)
+        pending = list(range(len(tasks)))
+        attempts = [0] * len(tasks)
+        busy = {}  # worker -> task
+        done = {}
+        error = None
+
+        while busy or (pending and error is None):
+            # Feeds idle workers.
+            for worker in range(len(self._procs)):
+                if error is not None or not pending:
+                    break
+                if worker not in busy:
+                    task = pending.pop(0)
+                    busy[worker] = task
+                    self._inboxes[worker].put((task, func, tasks[task]))
+
+            try:
+                worker, task, ok, value = self._results.get(
+                    timeout=self.timeout)
+            except queue.Empty:
+                for worker in self._supervise():
+                    task = busy.pop(worker, None)
+                    if task is None:
+                        continue
+                    attempts[task] += 1
+                    if attempts[task] > self.retries:
+                        error = error or (
+                            f'task = {func.__name__}{tasks[task]} was lost '
+                            f'{attempts[task]} times!')
+                    else:
+                        pending.insert(0, task)
+                continue
+
+            busy.pop(worker, None)
+            if ok:
+                done[task] = value
+            else:
+                error = error or (
+                    f'task = {func.__name__}{tasks[task]} failed!\n{value}')
+
+        if error is not None:
+            raise RuntimeError(error)
+
+        return [done[task] for task in range(len(tasks))]
+
+    # @Helper
+    def _spawn(self, worker):
+        proc = mp.Process(
+            target=_work, args=(worker, self._inboxes[worker], self._results),
+            daemon=True)
+        proc.start()
+        return proc
+
+    # @Helper
+    def _supervise(self):
+        """Restarts dead workers.
+
+        Returns:
+            list: Indices of the restarted workers.
+        """
+        dead = []
+
+        for worker, proc in enumerate(self._procs):
+            if proc.is_alive():
+                continue
+            print(f'Worker {proc.pid} exited with {proc.exitcode}! '
+                  f'Restarting...')
+            proc.join()
+            self._procs[worker] = self._spawn(worker)
+            self.restarts += 1
+            dead.append(worker)
+
+        return dead
+
+
+# @Worker
+def _work(worker, inbox, results):
+    """Runs tasks from `inbox` until it gets None."""
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+        task, func, args = message
+        try:
+            value = func(*args)
+        except Exception:
+            results.put((worker, task, False, traceback.format_exc()))
+        else:
+            results.put((worker, task, True, value))
+
+
+if __name__ == '__main__':
+    pass
@@ -1 +1,2 @@
-from .forecaster import *
\ No newline at end of file
+from .forecaster import *
+from .strategies import Strategy, register
\ No newline at end of file
@@ -8,33 +8,49 @@
 """
 
 
+import contextlib
 import datetime as dt
+import math
 import os
-import time
+import pickle
+import re
 
-import numpy as np
 import pandas as pd
-from scipy.signal import argrelmin, argrelmax
 
-import args2fields as a2f
-import config, dparser, xport
+import config, xport
 from collector import Collector
+from indicators.rsi import RSI
+from . import strategies
 
 
 class Forecaster:
     """A library class for making forecasts."""
 
-    STRATEGIES = ['r2p_extrema']
+    """list: Registered strategy names. See `strategies.register`."""
+    STRATEGIES = strategies.STRATEGIES
+
+    """list: Cached stages, in dependency order."""
+    STAGES = ['prices', 'rsi', 'panel', 'basis', 'stats', 'fee', 'summ']
+
+    """dict: Stage providing each strategy input column."""
+    INPUTS = {'Price': 'prices', 'RSI': 'rsi'}
+
     OUTDIR = f'{config.DATA}/forecasts'
 
+    """int: Version of the `save` format. Bumped on incompatible changes."""
+    SNAPSHOT_VERSION = 2
+
     def __init__(self, symbols=[], strategy=STRATEGIES[0],
                  source=Collector.SOURCES[0], **kwargs):
         self._kwargs = kwargs
         self._symbols = []
         self._strategy = self.STRATEGIES[0]
         self.collector = Collector(source)
-        self.basis = None
-        self.summ = None
+        self.engine = None
+        self._stages = {}
+        self.hits = 0  # Stage cache hits and misses, see `_get_stage`.
+        self.misses = 0
+        self._internal = 0  # Depth of internal stage accesses.
         self.strategy = strategy
         if symbols:
             self.symbols = symbols
@@ -58,40 +74,178 @@ class Forecaster:
         return self._strategy
     @strategy.setter
     def strategy(self, value):
-        if value not in self.STRATEGIES:
+        if value not in strategies.REGISTRY:
             raise ValueError(
                 f'strategy = {value} is not valid!'
                 f'\nValid values are: {self.STRATEGIES}'
             )
         self._strategy = value
+        self._on_set_strategy(**self._kwargs)
+
+    """prices (dict): Price history per symbol. Fetched on first access."""
+    @property
+    def prices(self):
+        return self._get_stage('prices')
+    @prices.setter
+    def prices(self, value):
+        self._set_stage('prices', value)
+
+    """rsi (dict): RSI history per symbol. Fetched on first access."""
+    @property
+    def rsi(self):
+        return self._get_stage('rsi')
+    @rsi.setter
+    def rsi(self, value):
+        self._set_stage('rsi', value)
+
+    """panel (pd.DataFrame): `engine` inputs of all symbols. See
+    `strategies`. Built on first access."""
+    @property
+    def panel(self):
+        return self._get_stage('panel')
+    @panel.setter
+    def panel(self, value):
+        self._set_stage('panel', value)
+
+    """basis (dict): Data basis per symbol. Built on first access."""
+    @property
+    def basis(self):
+        return self._get_stage('basis')
+    @basis.setter
+    def basis(self, value):
+        self._set_stage('basis', value)
+
+    """stats (dict): Mergeable statistics per symbol and day. Built on first
+    access."""
+    @property
+    def stats(self):
+        return self._get_stage('stats')
+    @stats.setter
+    def stats(self, value):
+        self._set_stage('stats', value)
+
+    """fee (dict): Flag-Entry-Exit days per symbol. Built on first access."""
+    @property
+    def fee(self):
+        return self._get_stage('fee')
+    @fee.setter
+    def fee(self, value):
+        self._set_stage('fee', value)
+
+    """summ (dict): Forecast summary per symbol. Built on first access."""
+    @property
+    def summ(self):
+        return self._get_stage('summ')
+    @summ.setter
+    def summ(self, value):
+        self._set_stage('summ', value)
 
     # @Callback
     def _on_set_symbols(self, **kwargs):
-        """Initializes instance fields per `strategy`."""
+        """Invalidates all stages."""
         print(f"Initializing forecasts for:\n"
               f"    symbols  = {self.symbols}\n"
               f"    strategy = '{self.strategy}'\n")
 
-        if self.strategy == self.STRATEGIES[0]:
-            fields = {'period': str, 'interval': str, 'order': int,
-                      'periods': int, 'thresh': float}
-            defaults = {'period': '30d', 'interval': '5m',
-                        'periods': Collector.PERIODS['5m'], 'order': 30,
-                        'thresh': 12.5}
-            a2f.args2fields(self, fields, defaults=defaults, **kwargs)
+        self._invalidate('prices')
 
-            self._set_prices(period=self.period, interval=self.interval)
-            self._set_rsi(period=self.period, interval=self.interval)
+    # @Callback
+    def _on_set_strategy(self, **kwargs):
+        """Sets `engine` and invalidates the stages it changes.
 
-            # --- DEBUG ---
-            # for df in self.prices.values():
-            #     print(df)
-            # for df in self.rsi.values():
-            #     print(df)
+        Parameters of the `engine` are mirrored as instance fields, e.g.
+        `period` and `interval`. Fetched stages are kept if the fetching
+        parameters did not change.
+        """
+        fetching = ('period', 'interval', 'periods')
+        before = [getattr(self, name, None) for name in fetching]
+
+        self.engine = strategies.REGISTRY[self.strategy](**kwargs)
+        for name in self.engine.PARAMS:
+            setattr(self, name, getattr(self.engine, name))
+
+        for name in self.engine.BARS + self.engine.INDICATORS:
+            if name not in self.INPUTS:
+                raise ValueError(
+                    f'input = {name} of strategy = {self.strategy} is not '
+                    f'available!\nAvailable inputs are: {list(self.INPUTS)}'
+                )
+
+        if before != [getattr(self, name, None) for name in fetching]:
+            self._invalidate('prices')
+        else:
+            self._invalidate('panel')
+
+    # @Helper
+    def _get_stage(self, name):
+        """Returns stage `name`, building it and its inputs if needed.
+
+        Only accesses from outside count as cache hits or misses, not the
+        reads of stages made while building, updating or saving others.
+        """
+        counted = not self._internal
+        if name in self._stages:
+            self.hits += counted
+        elif self.symbols:
+            self.misses += counted
+            with self._uncounted():
+                self._build(name)
+        return self._stages.get(name)
+
+    # @Helper
+    @contextlib.contextmanager
+    def _uncounted(self):
+        """Stage accesses within are internal, see `_get_stage`."""
+        self._internal += 1
+        try:
+            yield
+        finally:
+            self._internal -= 1
 
-            self._set_basis_0()
-            self._set_fee_0()
-            self._set_summ_0()
+    # @Helper
+    def _set_stage(self, name, value):
+        """Sets stage `name` and invalidates the stages that depend on it."""
+        self._invalidate(self.STAGES[self.STAGES.index(name) + 1:])
+        self._stages[name] = value
+
+    # @Helper
+    def _invalidate(self, names):
+        """Drops cached stages.
+
+        Parameters:
+            names (any): Stage(s) from `STAGES` to drop. A single stage
+            also drops every stage after it.
+        """
+        if isinstance(names, str):
+            names = self.STAGES[self.STAGES.index(names):]
+        for name in names:
+            self._stages.pop(name, None)
+
+    # @Helper
+    def _build(self, name):
+        """Builds stage `name` after the stages it depends on."""
+        if name == 'prices':
+            self._set_prices(period=self.period, interval=self.interval)
+        elif name == 'rsi':
+            self.prices  # Eliminates symbols without data first.
+            self._set_rsi(period=self.period, interval=self.interval)
+        elif name == 'panel':
+            self._set_panel()
+        elif name == 'basis':
+            self.basis = self.engine.get_basis(self.panel)
+        elif name == 'stats':
+            self.stats = self.engine.get_stats(self.basis)
+        elif name == 'fee':
+            self._fee_days = self.engine.get_fee(self.basis)
+            self.fee = self.engine.select(
+                self.basis, self.stats, self._fee_days)
+        elif name == 'summ':
+            self.summ = self.engine.get_summ(self.basis, self.stats, self.fee)
+
+    def materialize(self):
+        """Builds every stage that is not cached yet."""
+        for name in self.STAGES:
+            self._get_stage(name)
 
     # @Helper
     def _set_prices(self, period, interval):
@@ -106,224 +260,346 @@ class Forecaster:
 
     # @Helper
     def _set_rsi(self, period, interval):
-        self.rsi = self.collector.get_rsi(self.symbols, period, interval)
+        self.rsi = self.collector.get_rsi(
+            self.symbols, period, interval, periods=self.periods)
 
     # @Helper
-    def _set_basis_0(self):
-        """Sets `basis` per strategy 0.
-
-        `basis`: dict
-            keys: str -> `symbols`
-            vals: list
-                items: pd.DataFrame
-                    index: int
-                    cols -> Date|Time|Price|RSI|LoRSI|LoPrice|HiRSI|
-                            HiPrice
+    def _set_panel(self):
+        """Sets `panel` from the stages providing the `engine` inputs."""
+        for name in self.engine.BARS + self.engine.INDICATORS:
+            self._get_stage(self.INPUTS[name])
+        self.panel = self._get_panel(self.symbols)
+
+    # @Helper
+    def _get_panel(self, symbols, dates=None):
+        """Returns the `engine` inputs of `symbols` as a panel.
+
+        Parameters:
+            symbols (list): Stock symbols.
+            dates (set): Dates to keep. All if None.
         """
-        self.basis = {}
+        frames = []
 
-        for s, df in self.prices.items():
-            if df.isnull().values.any():
+        for s in symbols:
+            if s not in self.prices or self.prices[s].isnull().values.any():
                 continue
-            self.basis[s] = df.copy()
-            self.basis[s]['RSI'] = self.rsi[s]['RSI']
-            self.basis[s] = self.basis[s][self.basis[s]['RSI'].notna()]
-
-        for s, df in self.basis.items():
-            self.basis[s] = dparser.split(df, interval='1d')
-
-        # --- DEBUG ---
-        # for ls in self.basis.values():
-        #     for df in ls:
-        #         print(df)
-
-        # Adds LoRSI, LoPrice, HiRSI, HiPrice columns to `basis`.
-        for s, ls in self.basis.items():
-            for df in ls:
-                df['LoRSI'] = df.iloc[
-                    argrelmin(df['RSI'].values, order=self.order)[0]
-                ]['RSI']
-                df['LoPrice'] = df.iloc[
-                    argrelmin(df['Price'].values, order=self.order)[0]
-                ]['Price']
-                df['HiRSI'] = df.iloc[
-                    argrelmax(df['RSI'].values, order=self.order)[0]
-                ]['RSI']
-                df['HiPrice'] = df.iloc[
-                    argrelmax(df['Price'].values, order=self.order)[0]
-                ]['Price']
-                df.index.name = 'Basis'
-
-        # Reduces `basis`.
-        # for s, ls in self.basis.items():
-        #     for df in ls:
-        #         df.dropna(axis=0, how='all', thresh=5, inplace=True)
-
-        #--- DEBUG ---
-        # for ls in self.basis.values():
-        #     for df in ls:
-        #         print(df, '\n')
+            df = self.prices[s][['Date', 'Time']].copy()
+            for name in self.engine.BARS + self.engine.INDICATORS:
+                data = getattr(self, self.INPUTS[name]).get(s)
+                if data is None:
+                    break
+                df[name] = data[name]
+            else:
+                if dates is not None:
+                    df = df[df['Date'].isin(dates)]
+                df.insert(0, 'Symbol', s)
+                frames.append(df.dropna())
+
+        if not frames:
+            return pd.DataFrame(columns=['Symbol', 'Date', 'Time']
+                                + self.engine.BARS + self.engine.INDICATORS)
+
+        return pd.concat(frames)
+
+    def update(self, prices=None):
+        """Adds the bars that arrived since the last update.
+
+        Only the days touched by new bars are rebuilt in `basis` and
+        `fee`, days that fall out of the look-back `period` are dropped and
+        `summ` is refreshed for the symbols that changed. If the stages
+        were never built or the whole look-back `period` has passed since,
+        they are invalidated instead and get built from scratch on next
+        access.
+
+        Parameters:
+            prices (dict): Unrounded price history per symbol, as returned
+            by `Collector.get_prices(..., rounding=None)`. Must reach back
+            far enough to cover `periods` bars before the last update. If
+            None, only the missing days are fetched.
+
+        Returns:
+            list: Symbols whose forecast changed.
+        """
+        with self._uncounted():
+            # `panel` is only a view of `prices` and `rsi`, it may be dropped.
+            if any(name not in self._stages for name in self.STAGES
+                   if name != 'panel'):
+                self._invalidate('prices')
+                return []
+
+            symbols = [s for s in self.symbols if s in self.basis]
+            if not symbols:
+                return []
+
+            # Rebuilds from scratch if the whole look-back window has passed.
+            since = min(self.prices[s]['Date'].iloc[-1] for s in symbols)
+            cutoff = self._get_cutoff(dt.date.today())
+            if cutoff is not None and since <= cutoff:
+                self._invalidate('prices')
+                return []
+
+            if prices is None:
+                prices = self.collector.get_prices(
+                    symbols, period=self._get_lookback(since),
+                    interval=self.interval, rounding=None)
+
+            updated = []
+            for s in symbols:
+                df = prices.get(s)
+                if df is None or df.isnull().values.any():
+                    continue
+                if self._update(s, df):
+                    updated.append(s)
+
+            return updated
 
     # @Helper
-    def _set_fee_0(self):
-        """Sets `fee`, the 'Flag-Entry-Exit' dataset per strategy 0.
-
-        `fee`: dict
-            keys: str -> `symbols`
-            vals: list
-                items: pd.DataFrame
-                    index.name: str -> Date
-                    index: str -> ['Flag', 'Entry', 'Exit']
-                    cols: -> Time|RSI|PctChg
+    def _update(self, s, df):
+        """Merges new bars of `s` into the cached stages.
+
+        Returns:
+            bool: Whether `s` had new bars.
         """
-        self.fee = {}
+        # The last known bar may have been in progress, so it is refreshed.
+        d_0 = self.prices[s]['Date'].iloc[-1]
+        t_0 = self.prices[s]['Time'].iloc[-1]
+        rsi = RSI.calculate(df, self.periods)
+        mask = (
+            (df['Date'] > d_0) | ((df['Date'] == d_0) & (df['Time'] >= t_0))
+        ).values
+        if not mask.any():
+            return False
+
+        start = self.prices[s].index[-1]
+        index = pd.RangeIndex(start, start + mask.sum())
+        new_prices = df[mask][['Date', 'Time', 'Price']].round(2)
+        new_prices.index = index
+        new_prices.index.name = self.prices[s].index.name
+        new_rsi = rsi[mask][['Date', 'Time', 'RSI']].round(2)
+        new_rsi.index = index
+        new_rsi.index.name = self.rsi[s].index.name
+        if new_prices.equals(self.prices[s].iloc[-1:]):
+            return False
+
+        self.prices[s] = pd.concat([self.prices[s].iloc[:-1], new_prices])
+        self.rsi[s] = pd.concat([self.rsi[s].iloc[:-1], new_rsi])
+
+        # Drops days that fell out of the look-back window.
+        cutoff = self._get_cutoff(self.prices[s]['Date'].iloc[-1])
+        if cutoff is not None:
+            keep = (self.prices[s]['Date'] > cutoff).values
+            self.prices[s] = self.prices[s][keep]
+            self.rsi[s] = self.rsi[s][keep]
+
+        # `panel` is rebuilt on next access rather than patched.
+        self._stages.pop('panel', None)
+
+        # Rebuilds the days touched by new bars.
+        dates = set(new_prices['Date'])
+        days = {df['Date'].iloc[-1]: df for df in self.basis[s]
+                if cutoff is None or df['Date'].iloc[-1] > cutoff}
+        new_days = self.engine.get_basis(self._get_panel([s], dates))
+        for df in new_days.get(s, []):
+            days[df['Date'].iloc[-1]] = df
+        self.basis[s] = [days[date] for date in sorted(days)]
+
+        stats = {date: self.stats[s][date] for date in days
+                 if date in self.stats[s]}
+        stats.update(self.engine.get_stats(new_days).get(s, {}))
+        self.stats[s] = stats
+
+        fee_days = self._fee_days[s]
+        rebuilt = [df['Date'].iloc[-1] for df in new_days.get(s, [])]
+        keep = fee_days.index.isin(list(days)) & ~fee_days.index.isin(rebuilt)
+        new_fee = self.engine.get_fee(new_days).get(s)
+        fee_days = pd.concat([fee_days[keep]] + (
+            [] if new_fee is None or new_fee.empty else [new_fee]))
+        fee_days = fee_days.sort_index()
+        self._fee_days[s] = fee_days
+
+        basis = {s: self.basis[s]}
+        stats = {s: self.stats[s]}
+        self.fee[s] = self.engine.select(basis, stats, {s: fee_days})[s]
+        self.summ.update(
+            self.engine.get_summ(basis, stats, {s: self.fee[s]}))
+
+        return True
 
-        lo_rsi = {}  # Level beyond which data will be ignored.
-        for s, df in self.get_basis(flatten=True).items():
-            min_rsi = df['RSI'].min()
-            max_rsi = df['RSI'].max()
-            lo_rsi_a = min_rsi + (self.thresh / 100) * (max_rsi - min_rsi)
-            lo_rsi_b = np.percentile(df['RSI'].values, self.thresh)
-            lo_rsi[s] = min(lo_rsi_a, lo_rsi_b)
-
-        for s, ls in self.basis.items():
-            self.fee[s] = []
-
-            for df in ls:
-                try:
-                    t_flag = df[df.LoRSI == df.LoRSI.min()]['Time'].item()
-                    t_entry = df[df.LoPrice == df.LoPrice.min()]['Time'].item()
-                    t_exit = df[df.HiRSI == df.HiRSI.max()]['Time'].item()
-                except ValueError:
-                    continue
+    # @Helper
+    def _get_lookback(self, since):
+        """Returns the period to fetch so RSI of bars after `since` is exact.
 
-                t_flag = dt.datetime.combine(dt.datetime.today(), t_flag)
-                t_entry = dt.datetime.combine(dt.datetime.today(), t_entry)
-                t_exit = dt.datetime.combine(dt.datetime.today(), t_exit)
+        Parameters:
+            since (dt.date): Date of the oldest last known bar.
 
-                delta_entry = (t_entry - t_flag).total_seconds() / 60
-                delta_exit = (t_exit - t_entry).total_seconds() / 60
+        Returns:
+            str: Period, e.g. '5d'.
+        """
+        n, unit = re.match(r'(\d+)([a-z]+)', self.interval).groups()
+        minutes = int(n) * {'m': 1, 'h': 60}.get(unit, 390)
+        bars_per_day = max(390 // minutes, 1)  # 6.5 hours per session.
+        rsi_days = math.ceil((self.periods + 1) / bars_per_day)
+        days = (dt.date.today() - since).days + math.ceil(rsi_days * 7 / 5) + 4
+        if unit in ('m', 'h'):
+            days = min(days, 60)  # Intraday history is limited to 60 days.
+        return f'{days}d'
 
-                if (delta_entry < 0) or (delta_exit < 0):
-                    continue
+    # @Helper
+    def _get_cutoff(self, date):
+        """Returns the last date before the look-back `period` of `date`.
+
+        Returns:
+            dt.date: None if `period` is not of the '{n}d|mo|y' kind.
+        """
+        match = re.match(r'(\d+)(d|mo|y)$', self.period)
+        if match is None:
+            return None
+        n, unit = match.groups()
+        days = int(n) * {'d': 1, 'mo': 30, 'y': 365}[unit]
+        return date - dt.timedelta(days=days)
 
-                rsi_flag = df['LoRSI'].min()
+    def save(self, path=''):
+        """Saves a snapshot of the built stages for `load`.
 
-                if rsi_flag > lo_rsi[s]:
-                    continue
+        Bars are stored as one compact pd.DataFrame and `basis` is rebuilt
+        from them on `load`. The file is written atomically.
 
-                price_flag = df[df.LoRSI == rsi_flag]['Price'].item()
-
-                price_entry = df['LoPrice'].min()
-                rsi_entry = df[df.LoPrice == price_entry]['RSI'].iloc[0]
-
-                rsi_exit = df['HiRSI'].max()
-                price_exit = df[df.HiRSI == rsi_exit]['Price'].iloc[0]
-
-                chg_entry = round(
-                    (price_entry - price_flag) / price_flag * 100, 2)
-                chg_exit = round(
-                    (price_exit - price_entry) / price_entry * 100, 2)
-
-                flag_df = pd.DataFrame({
-                    'Time': t_flag.strftime('%I:%M %p'),
-                    'RSI': rsi_flag,
-                    'PctChg': price_flag
-                }, index=['Flag'])
-                entry_df = pd.DataFrame({
-                    'Time': delta_entry,
-                    'RSI': rsi_entry,
-                    'PctChg': chg_entry
-                }, index=['Entry'])
-                exit_df = pd.DataFrame({
-                    'Time': delta_exit,
-                    'RSI': rsi_exit,
-                    'PctChg': chg_exit
-                }, index=['Exit'])
-
-                date = df['Date'].iloc[-1]
-                merged_df = pd.concat(
-                    [flag_df, entry_df, exit_df],
-                )
-                merged_df.index.name = date
-                self.fee[s].append(merged_df)
+        Parameters:
+            path (str): Snapshot path. Defaults to
+            '`OUTDIR`/snapshot.pkl'.
+
+        Returns:
+            str: Snapshot path.
+        """
+        if not path:
+            path = f'{self.OUTDIR}/snapshot.pkl'
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with self._uncounted():
+            self.materialize()
+            state = {
+                'version': self.SNAPSHOT_VERSION,
+                'saved': dt.datetime.now(),
+                'strategy': self.strategy,
+                'source': self.collector.source,
+                'kwargs': self._kwargs,
+                'symbols': self.symbols,
+                'watermarks': {
+                    s: (df['Date'].iloc[-1], df['Time'].iloc[-1])
+                    for s, df in self.prices.items() if s in self.basis
+                },
+                'bars': self._get_bars(),
+                'stats': self.stats,
+                'fee_days': self._fee_days,
+                'fee': self.fee,
+                'summ': self.summ
+            }
+
+        pathtmp = f'{path}.tmp'
+        with open(pathtmp, 'wb') as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(pathtmp, path)
+        print(f"Forecasts saved to '{path}'.")
+
+        return path
+
+    @classmethod
+    def load(cls, path='', max_age=None, catch_up=True):
+        """Returns a Forecaster restored from a `save` snapshot.
+
+        Parameters:
+            path (str): Snapshot path. See `save`.
+            max_age (dt.timedelta): Maximum age of the snapshot.
+            catch_up (bool): Flags fetching the bars missing since the
+            snapshot via `update`.
+
+        Returns:
+            Forecaster: Restored forecaster.
+
+        Raises:
+            ValueError: Snapshot version, strategy or age is not valid.
+        """
+        if not path:
+            path = f'{cls.OUTDIR}/snapshot.pkl'
+
+        with open(path, 'rb') as fh:
+            state = pickle.load(fh)
+
+        if state.get('version') != cls.SNAPSHOT_VERSION:
+            raise ValueError(
+                f"snapshot version = {state.get('version')} is not valid!"
+                f'\nValid version is: {cls.SNAPSHOT_VERSION}'
+            )
+        age = dt.datetime.now() - state['saved']
+        if max_age is not None and age > max_age:
+            raise ValueError(f'snapshot age = {age} exceeds {max_age}!')
+
+        forecaster = cls(state['symbols'], state['strategy'],
+                         state['source'], **state['kwargs'])
+        forecaster._set_bars(state['bars'])
+        with forecaster._uncounted():
+            forecaster.basis = forecaster.engine.get_basis(forecaster.panel)
+        forecaster.stats = state['stats']
+        forecaster._fee_days = state['fee_days']
+        forecaster.fee = state['fee']
+        forecaster.summ = state['summ']
+
+        if catch_up:
+            forecaster.update()
+
+        return forecaster
 
     # @Helper
-    def _set_summ_0(self):
-        """Sets forecast summary for strategy 0.
-
-         `summ`: dict
-            keys: str -> `symbols`
-            vals: pd.DataFrame
-                index.name: str -> MinRSI
-                index: str -> ['Flag', 'Entry', 'Exit']
-                cols: -> Time|RSI|PctChg
+    def _get_bars(self):
+        """Returns `prices` and `rsi` of all symbols as one pd.DataFrame.
+
+        `bars`: pd.DataFrame
+            index: int
+            cols -> Symbol|Index|Stamp|Price|RSI
         """
-        self.summ = {}
+        frames = []
 
-        if not (self.basis and self.fee):
-            return
+        for s, df in self.prices.items():
+            if s not in self.rsi:
+                continue
+            seconds = [t.hour * 3600 + t.minute * 60 + t.second
+                       for t in df['Time']]
+            frames.append(pd.DataFrame({
+                'Symbol': s,
+                'Index': df.index.values,
+                'Stamp': (pd.to_datetime(df['Date'].values)
+                          + pd.to_timedelta(seconds, unit='s')),
+                'Price': df['Price'].values,
+                'RSI': self.rsi[s]['RSI'].reindex(df.index).values
+            }))
+
+        if not frames:
+            return pd.DataFrame(
+                columns=['Symbol', 'Index', 'Stamp', 'Price', 'RSI'])
+
+        bars = pd.concat(frames, ignore_index=True)
+        bars['Symbol'] = bars['Symbol'].astype('category')
+        return bars
 
-        # Gets FEE values from `fee`.
-        for s, ls in self.fee.items():
-            t_0 = []
-            rsi_0 = []
-            t_1 = []
-            rsi_1 = []
-            pctchg_1 = []
-            t_2 = []
-            rsi_2 = []
-            pctchg_2 = []
-
-            for df in ls:
-                t_0.append(dt.datetime.strptime(
-                    df['Time']['Flag'], '%I:%M %p').time())
-                rsi_0.append(df['RSI']['Flag'])
-                t_1.append(df['Time']['Entry'])
-                rsi_1.append(df['RSI']['Entry'])
-                pctchg_1.append(df['PctChg']['Entry'])
-                t_2.append(df['Time']['Exit'])
-                rsi_2.append(df['RSI']['Exit'])
-                pctchg_2.append(df['PctChg']['Exit'])
-
-            # Reduces Fee values.
-            try:
-                t_0_avg = sum([
-                    int(dt.timedelta(hours=t.hour, minutes=t.minute,
-                                     seconds=t.second).total_seconds()
-                        ) for t in t_0]) / len(t_0)
-                t_0 = time.strftime('%I:%M %p', time.gmtime(t_0_avg))
-            except:
-                t_0 = np.nan
-            min_rsi = self.get_basis(flatten=True)[s]['RSI'].min()
-            rsi_0 = round(pd.Series(rsi_0).mean(), 2)
-            t_1 = round(pd.Series(t_1).mean(), 2)
-            rsi_1 = round(pd.Series(rsi_1).quantile(q=0.25), 2)
-            pctchg_1 = round(pd.Series(pctchg_1).mean(), 2)
-            t_2 = round(pd.Series(t_2).quantile(q=0.25), 2)
-            rsi_2 = round(pd.Series(rsi_2).mean(), 2)
-            pctchg_2 = round(pd.Series(pctchg_2).quantile(q=0.25), 2)
-
-            # Generate df that will hold reduced values.
-            flag_df = pd.DataFrame({
-                'Time': t_0,
-                'RSI': rsi_0,
-                'PctChg': 0.0
-            }, index=['Flag'])
-            entry_df = pd.DataFrame({
-                'Time': t_1,
-                'RSI': rsi_1,
-                'PctChg': pctchg_1
-            }, index=['Entry'])
-            exit_df = pd.DataFrame({
-                'Time': t_2,
-                'RSI': rsi_2,
-                'PctChg': pctchg_2
-            }, index=['Exit'])
-
-            merged_df = pd.concat([flag_df, entry_df, exit_df])
-            merged_df.index.name = f'MinRSI: {min_rsi}'
-            self.summ[s] = merged_df
+    # @Helper
+    def _set_bars(self, bars):
+        """Sets `prices` and `rsi` from `_get_bars` output."""
+        prices = {}
+        rsi = {}
+
+        for s, df in bars.groupby('Symbol', sort=False, observed=True):
+            index = pd.Index(df['Index'].values)
+            date = df['Stamp'].dt.date.values
+            time_ = df['Stamp'].dt.time.values
+            prices[s] = pd.DataFrame(
+                {'Date': date, 'Time': time_, 'Price': df['Price'].values},
+                index=index.rename('Prices'))
+            rsi[s] = pd.DataFrame(
+                {'Date': date, 'Time': time_, 'RSI': df['RSI'].values},
+                index=index.rename('RSI'))
+
+        self.prices = prices
+        self.rsi = rsi
 
     # @Accessor
     def get_basis(self, flatten=False):
@@ -348,37 +624,46 @@ class Forecaster:
             print(df, '\n')
 
     def print_fee(self):
-        for s, ls in self.fee.items():
+        for s, df in self.fee.items():
             print(f'--- {s} ---')
-            for df in ls:
-                print(df, '\n')
+            print(df, '\n')
 
     def print_summ(self):
         for s, df in self.summ.items():
             print(f'--- {s} ---')
             print(df, '\n')
 
-    def export_basis(self, dir='', ext='txt'):
+    def export_basis(self, dir='', ext='parquet', store=None):
+        """Exports the basis, one file per symbol in a dated `dir`.
+
+        With a `store` (xport.Store), appends the days after its last
+        'basis' partition instead, as one file per day.
+        """
+        if store is not None:
+            store.append('basis', self.interval, self.get_basis(flatten=True))
+            return
         if not dir:
             dir = \
                 f'{self.OUTDIR}/basis/{dt.datetime.now().strftime("%Y-%m-%d")}'
         xport.export(self.get_basis(flatten=True), dir, ext)
 
-    def export_fee(self, dir='', ext='txt'):
-        fee = {}
-        for s, ls in self.fee.items():
-            try:
-                fee[s] = pd.concat(ls)
-            except:
-                continue
+    def export_fee(self, dir='', ext='parquet', store=None):
+        """Exports the fee, see `export_basis`."""
+        fee = {s: df.reset_index() for s, df in self.fee.items()
+               if not df.empty}
+        if store is not None:
+            store.append('fee', self.interval, fee)
+            return
         if not dir:
             dir = f'{self.OUTDIR}/fee/{dt.datetime.now().strftime("%Y-%m-%d")}'
         xport.export(fee, dir, ext)
 
-    def export_summ(self, dir='', ext='txt', all_in_one=False, watchlist=''):
+    def export_summ(self, dir='', ext='txt', all_in_one=False, watchlist='',
+                    symbols=None):
         summ = {}
         for s, df in self.summ.items():
-            summ[s] = df
+            if symbols is None or s in symbols:
+                summ[s] = df
         if not dir:
             dir = \
                 f'{self.OUTDIR}/summ/{dt.datetime.now().strftime("%Y-%m-%d")}'
@@ -388,7 +673,7 @@ class Forecaster:
                 os.mkdir(dir)
             if os.path.exists(pathout):
                 os.remove(pathout)
-            for s, df in self.summ.items():
+            for s, df in summ.items():
                 with open(pathout, 'a') as fh:
                     fh.write(f'--- {s} ---\n')
                     df.to_string(fh)
@@ -0,0 +1,416 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Forecasting strategies.
+
+A strategy declares the inputs it needs (`BARS`, `INDICATORS` and
+`PARAMS`) and computes its stages over a `panel`, a single pd.DataFrame
+holding the inputs of all symbols:
+
+    `panel`: pd.DataFrame
+        index: int
+        cols -> Symbol|Date|Time|<BARS>|<INDICATORS>
+
+Rows of a symbol are in time order and rows with missing inputs are
+dropped. Fetching and caching are left to `Forecaster`.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import numpy as np
+import pandas as pd
+
+import args2fields as a2f
+import sketches
+from collector import Collector
+
+
+"""list: Names of the registered strategies, in registration order."""
+STRATEGIES = []
+
+"""dict: Registered strategy classes by name."""
+REGISTRY = {}
+
+
+def register(cls):
+    """Class decorator that adds a `Strategy` subclass to `REGISTRY`."""
+    if cls.NAME in REGISTRY:
+        raise ValueError(f'strategy = {cls.NAME} is already registered!')
+    STRATEGIES.append(cls.NAME)
+    REGISTRY[cls.NAME] = cls
+    return cls
+
+
+class Strategy:
+    """A base class for forecasting strategies.
+
+    `Forecaster.update` rebuilds single days, so `get_basis`, `get_stats`
+    and `get_fee` must only depend on whole days of one symbol. `select`
+    and `get_summ` see the whole look-back window of each symbol.
+    """
+
+    """str: Name under which the strategy is registered."""
+    NAME = ''
+
+    """list: Bar columns the strategy needs. See `Forecaster.INPUTS`."""
+    BARS = ['Price']
+
+    """list: Indicator columns the strategy needs."""
+    INDICATORS = []
+
+    """dict: Parameter types and defaults by name. `period`, `interval`
+    and `periods` (indicator window) also drive fetching."""
+    PARAMS = {
+        'period': (str, '30d'),
+        'interval': (str, '5m'),
+        'periods': (int, Collector.PERIODS['5m'])
+    }
+
+    def __init__(self, **kwargs):
+        """
+        Parameters:
+            kwargs: Values overriding the `PARAMS` defaults.
+        """
+        fields = {name: type_ for name, (type_, _) in self.PARAMS.items()}
+        defaults = {name: value for name, (_, value) in self.PARAMS.items()}
+        a2f.args2fields(self, fields, defaults=defaults, **kwargs)
+
+    def get_basis(self, panel):
+        """Returns the data basis of all symbols in `panel`.
+
+        Returns:
+            dict: Keys are symbols (str), values are lists of
+            pd.DataFrame, one per day.
+        """
+        raise NotImplementedError
+
+    def get_stats(self, basis):
+        """Returns mergeable statistics of each `basis` day.
+
+        Returns:
+            dict: Keys are symbols (str), values are dicts of accumulators
+            (see `sketches`) by date.
+        """
+        return {s: {} for s in basis}
+
+    def get_fee(self, basis):
+        """Returns the candidate forecast of each `basis` day.
+
+        Returns:
+            dict: Keys are symbols (str), values are pd.DataFrame indexed
+            by date, one row per day with a candidate, in date order.
+        """
+        raise NotImplementedError
+
+    def select(self, basis, stats, fee):
+        """Returns the candidates in `fee` that are used for forecasting.
+
+        Parameters:
+            basis (dict): See `get_basis`.
+            stats (dict): See `get_stats`.
+            fee (dict): See `get_fee`.
+
+        Returns:
+            dict: Keys are symbols (str), values are pd.DataFrame, rows
+            of `fee` kept.
+        """
+        return fee
+
+    def get_summ(self, basis, stats, fee):
+        """Returns the forecast summary per symbol.
+
+        Parameters:
+            basis (dict): See `get_basis`.
+            stats (dict): See `get_stats`.
+            fee (dict): See `select`.
+
+        Returns:
+            dict: Keys are symbols (str), values are pd.DataFrame.
+        """
+        raise NotImplementedError
+
+    def compute(self, panel):
+        """Returns the forecast summary of all symbols in `panel`."""
+        basis = self.get_basis(panel)
+        stats = self.get_stats(basis)
+        fee = self.select(basis, stats, self.get_fee(basis))
+        return self.get_summ(basis, stats, fee)
+
+
+@register
+class R2PExtrema(Strategy):
+    """RSI-to-price extrema strategy.
+
+    Each day, the lowest local minimum of RSI flags an entry at the lowest
+    local minimum of price, and the highest local maximum of RSI marks the
+    exit.
+    """
+
+    NAME = 'r2p_extrema'
+    BARS = ['Price']
+    INDICATORS = ['RSI']
+    PARAMS = dict(Strategy.PARAMS, order=(int, 30), thresh=(float, 12.5))
+
+    def get_basis(self, panel):
+        """Returns the data basis of all symbols in `panel`.
+
+        `basis`: dict
+            keys: str -> symbols
+            vals: list
+                items: pd.DataFrame
+                    index: int
+                    cols -> Date|Time|Price|RSI|LoRSI|LoPrice|HiRSI|
+                            HiPrice
+        """
+        if panel.empty:
+            return {}
+
+        # Day boundaries of every row, for extrema that do not cross days.
+        symbol = panel['Symbol'].values
+        date = panel['Date'].values
+        change = np.r_[True, (symbol[1:] != symbol[:-1])
+                       | (date[1:] != date[:-1])]
+        starts = np.flatnonzero(change)
+        ends = np.r_[starts[1:] - 1, len(panel) - 1]
+        group = np.cumsum(change) - 1
+        bounds = (starts[group], ends[group])
+
+        # Adds LoRSI, LoPrice, HiRSI, HiPrice columns to `basis`.
+        data = panel.drop(columns='Symbol')
+        for col, name, comparator in [('RSI', 'LoRSI', np.less),
+                                      ('Price', 'LoPrice', np.less),
+                                      ('RSI', 'HiRSI', np.greater),
+                                      ('Price', 'HiPrice', np.greater)]:
+            mask = _get_extrema(data[col].values, bounds, comparator,
+                                self.order)
+            data[name] = data[col].where(mask)
+        data.index.name = 'Basis'
+
+        basis = {}
+        for i, j in zip(starts, ends + 1):
+            basis.setdefault(symbol[i], []).append(data.iloc[i:j])
+
+        return basis
+
+    def get_stats(self, basis):
+        """Returns a `sketches.Sketch` of the RSI of each day.
+
+        `stats`: dict
+            keys: str -> symbols
+            vals: dict
+                keys: dt.date
+                vals: dict
+                    keys: str -> ['RSI']
+                    vals: sketches.Sketch
+        """
+        return {
+            s: {df['Date'].iloc[-1]: {'RSI': sketches.Sketch(df['RSI'])}
+                for df in ls}
+            for s, ls in basis.items()
+        }
+
+    def get_fee(self, basis):
+        """Returns the candidate 'Flag-Entry-Exit' dataset of each day.
+
+        The day's lowest RSI minimum flags, its lowest price minimum is
+        the entry and its highest RSI maximum the exit. Days where any of
+        them is missing or tied, or out of order, have no candidate. All
+        days of all symbols are evaluated at once.
+
+        `fee`: dict
+            keys: str -> symbols
+            vals: pd.DataFrame
+                index.name: str -> Date
+                index: dt.date
+                cols -> FlagTime|FlagRSI|FlagPrice|EntryTime|EntryRSI|
+                        EntryPctChg|ExitTime|ExitRSI|ExitPctChg
+            Flag time is the clock time (dt.time), entry time is minutes
+            after the flag and exit time minutes after the entry.
+        """
+        days = [df for ls in basis.values() for df in ls]
+        if not days:
+            return {s: _get_empty_fee() for s in basis}
+
+        data = pd.concat(days)
+        lengths = [len(df) for df in days]
+        group = np.repeat(np.arange(len(days)), lengths)
+        flag = _get_unique(data['LoRSI'], group, 'min')
+        entry = _get_unique(data['LoPrice'], group, 'min')
+        exit_ = _get_unique(data['HiRSI'], group, 'max')
+        found = (flag >= 0) & (entry >= 0) & (exit_ >= 0)
+
+        flag, entry, exit_ = flag[found], entry[found], exit_[found]
+        times = data['Time'].values
+        seconds = np.array(
+            [[t.hour * 3600 + t.minute * 60 + t.second for t in times[i]]
+             for i in (flag, entry, exit_)], dtype=float).reshape(3, -1)
+        delta_entry = (seconds[1] - seconds[0]) / 60
+        delta_exit = (seconds[2] - seconds[1]) / 60
+        price = data['Price'].values
+        rsi = data['RSI'].values
+        fee = pd.DataFrame({
+            'Symbol': np.repeat(list(basis), [len(ls) for ls in
+                                              basis.values()])[found],
+            'Date': data['Date'].values[flag],
+            'FlagTime': times[flag],
+            'FlagRSI': rsi[flag],
+            'FlagPrice': price[flag],
+            'EntryTime': delta_entry,
+            'EntryRSI': rsi[entry],
+            'EntryPctChg': np.round(
+                (price[entry] - price[flag]) / price[flag] * 100, 2),
+            'ExitTime': delta_exit,
+            'ExitRSI': rsi[exit_],
+            'ExitPctChg': np.round(
+                (price[exit_] - price[entry]) / price[entry] * 100, 2)
+        })
+        fee = fee[(delta_entry >= 0) & (delta_exit >= 0)]
+
+        groups = {s: df.drop(columns='Symbol').set_index('Date')
+                  for s, df in fee.groupby('Symbol', sort=False)}
+        return {s: groups.get(s, _get_empty_fee()) for s in basis}
+
+    def select(self, basis, stats, fee):
+        """Returns the candidates whose flag RSI is low enough."""
+        return {
+            s: df[df['FlagRSI'] <= self.get_lo_rsi(
+                self._get_rsi_sketch(stats[s]))]
+            for s, df in fee.items()
+        }
+
+    def get_lo_rsi(self, rsi):
+        """Returns the RSI level beyond which flags are ignored.
+
+        Parameters:
+            rsi (sketches.Sketch): RSI of the look-back window of one
+            symbol.
+        """
+        if rsi is None or not rsi.count:
+            return np.nan
+        lo_rsi_a = rsi.min + (self.thresh / 100) * (rsi.max - rsi.min)
+        lo_rsi_b = rsi.percentile(self.thresh)
+        return min(lo_rsi_a, lo_rsi_b)
+
+    def get_summ(self, basis, stats, fee):
+        """Returns the forecast summary per symbol.
+
+        The candidates of all symbols are reduced at once: flag time, RSI
+        and entry time and %chg by their mean, entry RSI, exit time and
+        exit %chg by their first quartile.
+
+         `summ`: dict
+            keys: str -> symbols
+            vals: pd.DataFrame
+                index.name: str -> MinRSI
+                index: str -> ['Flag', 'Entry', 'Exit']
+                cols: -> Time|RSI|PctChg
+        """
+        if not (basis and fee):
+            return {}
+
+        data = pd.concat(fee, names=['Symbol', 'Date'])
+        data['FlagTime'] = [t.hour * 3600 + t.minute * 60 + t.second
+                            for t in data['FlagTime']]
+        grouped = data.astype(float).groupby(level='Symbol', sort=False)
+        means = grouped[['FlagTime', 'FlagRSI', 'EntryTime', 'EntryPctChg',
+                         'ExitRSI']].mean()
+        quartiles = grouped[['EntryRSI', 'ExitTime', 'ExitPctChg']].quantile(
+            0.25)
+        summ = pd.concat([means, quartiles], axis=1).reindex(list(fee))
+        flag_time = pd.to_datetime(summ['FlagTime'], unit='s').dt.strftime(
+            '%I:%M %p')
+        summ = summ.round(2)
+
+        return {
+            s: self._get_summ(row, flag_time[s], stats[s])
+            for s, row in summ.iterrows()
+        }
+
+    # @Helper
+    def _get_summ(self, row, flag_time, stats):
+        """Returns the forecast summary of one symbol from its `row`."""
+        min_rsi = min((st['RSI'].min for st in stats.values()),
+                      default=np.nan)
+        merged_df = pd.DataFrame({
+            'Time': [flag_time if isinstance(flag_time, str) else np.nan,
+                     row['EntryTime'], row['ExitTime']],
+            'RSI': [row['FlagRSI'], row['EntryRSI'], row['ExitRSI']],
+            'PctChg': [0.0, row['EntryPctChg'], row['ExitPctChg']]
+        }, index=['Flag', 'Entry', 'Exit'])
+        merged_df.index.name = f'MinRSI: {min_rsi}'
+        return merged_df
+
+    # @Helper
+    def _get_rsi_sketch(self, days):
+        """Returns the RSI sketch of a look-back window.
+
+        Parameters:
+            days (dict): `stats` days of one symbol.
+        """
+        return sketches.merge(stats['RSI'] for stats in days.values())
+
+
+# @Helper
+def _get_empty_fee():
+    """Returns a `fee` pd.DataFrame without candidates."""
+    fee = pd.DataFrame(columns=[
+        'FlagTime', 'FlagRSI', 'FlagPrice', 'EntryTime', 'EntryRSI',
+        'EntryPctChg', 'ExitTime', 'ExitRSI', 'ExitPctChg'])
+    fee.index.name = 'Date'
+    return fee
+
+
+# @Helper
+def _get_unique(x, group, reducer):
+    """Returns the position of the row at the `reducer` of `x` per group.
+
+    Parameters:
+        x (pd.Series): Values of all groups, back to back.
+        group (np.ndarray): Group number of each row, 0 to n - 1.
+        reducer (str): 'min' or 'max'.
+
+    Returns:
+        np.ndarray: Position per group, -1 if `x` is all NaN or the
+        extreme is tied.
+    """
+    n = group[-1] + 1
+    hit = (x == x.groupby(group).transform(reducer)).values
+    positions = np.full(n, -1)
+    positions[group[hit]] = np.flatnonzero(hit)
+    positions[np.bincount(group[hit], minlength=n) != 1] = -1
+    return positions
+
+
+# @Helper
+def _get_extrema(x, bounds, comparator, order):
+    """Returns the relative extrema mask of `x` within each day.
+
+    Vectorized `scipy.signal.argrelextrema(..., mode='clip')` where the
+    neighbours of every element are clipped to its own day.
+
+    Parameters:
+        x (np.ndarray): Values of all days, back to back.
+        bounds (tuple): First and last position of the day of each element.
+        comparator (callable): np.less for minima, np.greater for maxima.
+        order (int): Neighbours on each side to compare against.
+
+    Returns:
+        np.ndarray: Boolean mask.
+    """
+    first, last = bounds
+    locs = np.arange(len(x))
+    mask = np.ones(len(x), dtype=bool)
+
+    for shift in range(1, order + 1):
+        mask &= comparator(x, x[np.minimum(locs + shift, last)])
+        mask &= comparator(x, x[np.maximum(locs - shift, first)])
+        if not mask.any():
+            break
+
+    return mask
+
+
+if __name__ == '__main__':
+    pass
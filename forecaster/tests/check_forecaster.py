@@ -8,8 +8,11 @@
 """
 
 
+import pandas as pd
+
 import config
-from forecaster import Forecaster
+from forecaster import Forecaster, strategies
+import xport
 
 
 def check_init_0():
@@ -39,6 +42,66 @@ def check_export_0():
             dir='.', ext='txt', all_in_one=True, watchlist=watchlist)
 
 
+def check_export_store():
+    store = xport.Store()
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    forecaster.export_basis(store=store)
+    forecaster.export_fee(store=store)
+    print(store.get_partitions())
+    print(store.read('basis', forecaster.interval, ['MSFT']))
+
+
+def check_export_fee():
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    dir = f'{config.DATA}/fee'
+    for ext in ['parquet', 'feather']:
+        forecaster.export_fee(dir, ext)
+        fee = xport.load(dir, ext=ext)
+        for s, df in forecaster.fee.items():
+            pd.testing.assert_frame_equal(fee[s], df.reset_index())
+    print(fee)
+
+
+def check_update_0():
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    print('=== SUMM ===')
+    forecaster.print_summ()
+    print(f'\n=== UPDATED: {forecaster.update()} ===')
+    forecaster.print_summ()
+
+
+def check_lazy_0():
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    print('=== PRICES ===')
+    for s, df in forecaster.prices.items():
+        print(f'--- {s} ---')
+        print(df, '\n')
+    print('\n=== SUMM ===')
+    forecaster.print_summ()
+
+
+def check_compute_0():
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    print(f'=== STRATEGIES: {list(strategies.REGISTRY)} ===')
+    for s, df in forecaster.engine.compute(forecaster.panel).items():
+        print(f'--- {s} ---')
+        print(df, '\n')
+
+
+def check_snapshot_0():
+    forecaster = Forecaster(['AAPL', 'MSFT'])
+    path = forecaster.save()
+    forecaster = Forecaster.load(path)
+    print('=== SUMM ===')
+    forecaster.print_summ()
+
+
 if __name__ == '__main__':
     check_init_0()
     check_export_0()
+    check_export_store()
+    check_export_fee()
+    check_update_0()
+    check_lazy_0()
+    check_compute_0()
+    check_snapshot_0()
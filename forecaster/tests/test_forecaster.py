@@ -0,0 +1,140 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests forecaster module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import contextlib
+import datetime as dt
+import io
+import tempfile
+import unittest
+
+import pandas as pd
+
+from collector import Collector
+from daemon.tests.check_daemon import get_random_prices
+from forecaster import Forecaster
+
+
+class FakeCollector(Collector):
+    """Serves `history` up to `now` over the look-back `period`, offline."""
+
+    def __init__(self, history):
+        super().__init__()
+        self.history = history
+        self.now = None
+
+    def get_prices(self, symbols, period='60d', interval='5m', start=None,
+                   end=None, rounding=2):
+        prices = {}
+        for s in symbols:
+            df = self._get_bars(s, period)
+            if rounding is not None:
+                df = df.round(rounding)
+            prices[s] = df
+        return prices
+
+    def get_rsi(self, symbols, period='60d', interval='5m', start=None,
+                end=None, rounding=2, periods=120, prices=None):
+        # RSI is warmed up on the bars before the look-back `period`.
+        rsi = super().get_rsi(
+            symbols, rounding=rounding, periods=periods,
+            prices={s: self._get_bars(s, '1000d') for s in symbols})
+        return {s: df.iloc[-len(self._get_bars(s, period)):]
+                .reset_index(drop=True).rename_axis('RSI')
+                for s, df in rsi.items()}
+
+    # @Helper
+    def _get_bars(self, s, period):
+        df = self.history[s]
+        stamps = pd.to_datetime(df['Date'].astype(str) + ' '
+                                + df['Time'].astype(str))
+        since = self.now.date() - dt.timedelta(days=int(period[:-1]))
+        df = df[(stamps <= self.now).values & (df['Date'] > since).values]
+        return df.reset_index(drop=True).rename_axis('Prices')
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.symbols = ['AAA', 'BBB']
+        self.kwargs = {'order': 5, 'thresh': 60}
+        self.dir = tempfile.TemporaryDirectory()
+
+        # `update` checks the look-back window against today, so the
+        # random sessions are moved by whole weeks to end this week.
+        history = get_random_prices(self.symbols, days=40)
+        last = history[self.symbols[0]]['Date'].iloc[-1]
+        weeks = dt.timedelta(weeks=(dt.date.today() - last).days // 7)
+        for df in history.values():
+            df['Date'] = df['Date'] + weeks
+        self.days = sorted(set(history[self.symbols[0]]['Date']))
+        self.collector = FakeCollector(history)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def get_forecaster(self, day, time='16:00'):
+        """Returns a Forecaster built at `time` of `day`."""
+        self.collector.now = pd.Timestamp(f'{self.days[day]} {time}')
+        with contextlib.redirect_stdout(io.StringIO()):
+            forecaster = Forecaster(self.symbols, **self.kwargs)
+            forecaster.collector = self.collector
+            forecaster.materialize()
+        return forecaster
+
+    def update(self, forecaster, day):
+        """Updates `forecaster` to the close of `day`."""
+        self.collector.now = pd.Timestamp(f'{self.days[day]} 16:00')
+        with contextlib.redirect_stdout(io.StringIO()):
+            return forecaster.update()
+
+    def assert_same_forecasts(self, forecaster, expected):
+        for s in self.symbols:
+            basis = pd.concat(forecaster.basis[s]).reset_index(drop=True)
+            pd.testing.assert_frame_equal(
+                basis, pd.concat(expected.basis[s]).reset_index(drop=True))
+            pd.testing.assert_frame_equal(forecaster.fee[s], expected.fee[s])
+            pd.testing.assert_frame_equal(forecaster.summ[s],
+                                          expected.summ[s])
+
+    def test_update_matches_a_fresh_forecaster(self):
+        forecaster = self.get_forecaster(-10, '12:00')
+
+        updated = self.update(forecaster, -1)
+
+        self.assertEqual(updated, self.symbols)
+        self.assert_same_forecasts(forecaster, self.get_forecaster(-1))
+
+    def test_load_and_update_matches_a_fresh_forecaster(self):
+        path = f'{self.dir.name}/snapshot.pkl'
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.get_forecaster(-10, '12:00').save(path)
+            forecaster = Forecaster.load(path, catch_up=False)
+        forecaster.collector = self.collector
+
+        self.update(forecaster, -1)
+
+        self.assert_same_forecasts(forecaster, self.get_forecaster(-1))
+
+    def test_update_drops_days_before_the_look_back_window(self):
+        forecaster = self.get_forecaster(-10, '12:00')
+        cutoff = forecaster._get_cutoff(self.days[-1])
+        self.assertLessEqual(forecaster.prices['AAA']['Date'].min(), cutoff)
+
+        self.update(forecaster, -1)
+
+        for s in self.symbols:
+            self.assertGreater(forecaster.prices[s]['Date'].min(), cutoff)
+            self.assertGreater(forecaster.rsi[s]['Date'].min(), cutoff)
+            self.assertGreater(forecaster.basis[s][0]['Date'].min(), cutoff)
+            self.assertTrue((forecaster._fee_days[s].index > cutoff).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
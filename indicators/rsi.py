@@ -8,6 +8,9 @@
 """
 
 
+import collections
+import math
+
 import pandas as pd
 
 
@@ -84,5 +87,90 @@ class RSI:
         )
 
 
+class RollingRSI:
+    """A library class to update RSI one price at a time.
+
+    Gives the same values as `RSI.calculate` on the same prices, in O(1)
+    time and memory per price: the window keeps running sums of its
+    gains and losses. The last price may be revised, e.g. while its bar
+    is still in progress.
+    """
+
+    def __init__(self, periods):
+        """
+        Parameters:
+            periods (int): Window size for rolling operations.
+        """
+        self.periods = periods
+        self.price = math.nan
+        self.value = math.nan
+        self._prev = math.nan
+        self._changes = collections.deque(maxlen=periods)
+        self._evicted = None
+        self._gain = 0.0  # Sum of gains in `_changes`.
+        self._loss = 0.0  # Sum of losses in `_changes`, positive.
+        self._gains = 0  # Count of gains, to reset sums exactly.
+        self._losses = 0
+
+    def update(self, price, revise=False):
+        """Adds `price` and returns the updated RSI.
+
+        Parameters:
+            price (float): Newest price.
+            revise (bool): Replaces the last price instead of adding one.
+
+        Returns:
+            float: NaN until `periods` changes are known.
+        """
+        if revise and not math.isnan(self.price):
+            self._undo()
+
+        if not math.isnan(self.price):
+            if len(self._changes) == self.periods:
+                self._evicted = self._changes[0]
+                self._count(self._evicted, -1)
+            else:
+                self._evicted = None
+            change = price / self.price - 1
+            self._changes.append(change)
+            self._count(change)
+        self._prev, self.price = self.price, price
+
+        self.value = self._get_value()
+        return self.value
+
+    # @Helper
+    def _undo(self):
+        """Removes the last price."""
+        if not math.isnan(self._prev):
+            self._count(self._changes.pop(), -1)
+            if self._evicted is not None:
+                self._changes.appendleft(self._evicted)
+                self._count(self._evicted)
+                self._evicted = None
+        self.price = self._prev
+
+    # @Helper
+    def _count(self, change, sign=1):
+        """Adds (`sign` = 1) or removes (-1) `change` from the sums."""
+        if change > 0:
+            self._gain += sign * change
+            self._gains += sign
+        elif change < 0:
+            self._loss -= sign * change
+            self._losses += sign
+
+    # @Helper
+    def _get_value(self):
+        if len(self._changes) < self.periods:
+            return math.nan
+        # Sums of no changes are exactly 0, without rounding residue.
+        gain = self._gain / self.periods if self._gains else 0.0
+        loss = self._loss / self.periods if self._losses else 0.0
+        if loss == 0:
+            return 100.0 if gain > 0 else math.nan
+        return 100 - 100 / (1 + gain / loss)
+
+
 if __name__ == '__main__':
     pass
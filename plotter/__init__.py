@@ -1 +1,3 @@
-from .plotter import *
\ No newline at end of file
+from .plotter import *
+from .kde import KDE
+from .downsample import METHODS, downsample, lttb, minmax
\ No newline at end of file
@@ -0,0 +1,107 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Downsampling of plotted series to what the axes can show.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import math
+
+import numpy as np
+
+
+"""list: Downsampling methods.
+    'minmax': Keeps the lowest and highest point of each bucket, so lines
+    look the same at one bucket per pixel.
+    'lttb': Largest-Triangle-Three-Buckets, keeps the one point per bucket
+    that best preserves the shape.
+"""
+METHODS = ['minmax', 'lttb']
+
+
+def downsample(x, y, buckets, method=METHODS[0]):
+    """Returns the points of (`x`, `y`) kept by `method`.
+
+    Parameters:
+        x (np.ndarray): Numeric x values, in order.
+        y (np.ndarray): Numeric y values.
+        buckets (int): Buckets, e.g. the pixel width of the axes.
+        method (str): Downsampling method. See `METHODS`.
+
+    Returns:
+        tuple: Downsampled x and y (np.ndarray).
+
+    Raises:
+        ValueError: Invalid `method`.
+    """
+    if method not in METHODS:
+        raise ValueError(f'method = {method} is not valid!\n'
+                         f'Valid values are: {METHODS}')
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if method == 'minmax':
+        index = minmax(y, buckets)
+    else:
+        index = lttb(x, y, buckets)
+    return x[index], y[index]
+
+
+def minmax(y, buckets):
+    """Returns the indexes of the min. and max. of `y` per bucket.
+
+    The first and last points are always kept. At most 2 * `buckets` + 2
+    indexes are returned, all of them if `y` is not longer.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if n <= 2 * buckets + 2:
+        return np.arange(n)
+
+    size = math.ceil(n / buckets)
+    rows = math.ceil(n / size)
+    padded = np.full(rows * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(rows, size)
+    offsets = np.arange(rows) * size
+    lows = np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highs = np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    index = np.concatenate([[0, n - 1], offsets + lows, offsets + highs])
+
+    return np.unique(index[index < n])
+
+
+def lttb(x, y, buckets):
+    """Returns the indexes of `buckets` points picked by LTTB.
+
+    The first and last points are always kept, and one point per bucket
+    in between: the one forming the largest triangle with the point kept
+    in the previous bucket and the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if buckets >= n or buckets < 3:
+        return np.arange(n)
+
+    edges = np.floor(np.linspace(1, n - 1, buckets - 1)).astype(int)
+    edges = np.append(edges, n)
+    index = np.empty(buckets, dtype=int)
+    index[0], index[-1] = 0, n - 1
+    a = 0
+    for i in range(buckets - 2):
+        start, end = edges[i], edges[i + 1]
+        x_next = x[end:edges[i + 2]].mean()
+        y_next = y[end:edges[i + 2]].mean()
+        area = np.abs((x[a] - x_next) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (y_next - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        index[i + 1] = a
+
+    return index
+
+
+if __name__ == '__main__':
+    pass
@@ -8,14 +8,27 @@
 """
 
 
+import copy
 import datetime as dt
+import hashlib
+import io
 import math
+import multiprocessing as mp
 import numbers
 import os
+import time
 
+import matplotlib as mpl
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
 
 import config
+from sketches import P2, Moments
+from .downsample import METHODS, downsample
+from .kde import KDE
 
 
 MAX_LIMIT = 20
@@ -25,12 +38,363 @@ LAYOUTS = {
     13: (4, 4), 14: (4, 4), 15: (4, 4), 16: (4, 4), 17: (4, 5), 18: (4, 5),
     19: (4, 5), 20: (4, 5)}
 ITEMS = ['Date', 'Time', 'Price', 'Volume', 'RSI', 'Min', 'Max']
+EXTS = ['pdf', 'png']
+
+"""list: Image formats of saved figures.
+    'svg': Vector, large with many points, e.g. density curves.
+    'png': Lossless raster, zlib `compression` level 0 to 9.
+    'webp': Raster, lossy at `quality` 0 to 100, lossless at None.
+"""
+FORMATS = ['svg', 'png', 'webp']
+
+_densities = {}  # key -> (KDE, values it holds)
+_markers = {}  # key -> (P2 low, P2 avg, Moments, values held)
+_hashes = {}  # fname -> digest of its content
+
+
+def get_layout(n):
+    """Returns the (nrows, ncols) grid of `n` subplots.
+
+    Uses `LAYOUTS` up to `MAX_LIMIT`, else the smallest near-square grid
+    one column wider than tall at most.
+    """
+    if n in LAYOUTS:
+        return LAYOUTS[n]
+    ncols = math.ceil(math.sqrt(n))
+    return math.ceil(n / ncols), ncols
+
+
+def get_density(x, key=None):
+    """Estimates the density of `x` with a binned FFT KDE.
+
+    With a `key`, the estimate is kept and later calls only add the
+    values appended since, and revise the last one, e.g. as bars arrive.
+
+    Parameters:
+        x (any): Values, e.g. a pd.Series.
+        key (any): Id of the series `x` belongs to, e.g. (symbol, ylabel).
+
+    Returns:
+        tuple: Grid (np.ndarray) and density at its points (np.ndarray).
+
+    Raises:
+        ValueError: Less than 2 distinct values.
+    """
+    values = np.asarray(x, dtype=float)
+    if key is None:
+        return KDE(values).evaluate()
+
+    kde, last = _densities.get(key, (None, None))
+    n = 0 if last is None else last.size - 1
+    if (kde is not None and n < values.size
+            and np.array_equal(last[:n], values[:n])):
+        kde.update(last[n:], -1)
+        kde.update(values[n:])
+    else:
+        kde = KDE(values)
+    _densities[key] = (kde, values.copy())
+
+    return kde.evaluate()
+
+
+def get_markers(x, q_low=0.005, q_avg=0.5, key=None):
+    """Returns the low and average quantiles of `x`, and its std.
+
+    With a `key`, P² quantile and Welford variance estimators of all but
+    the last value are kept, so later calls add the values appended since
+    in O(1) each instead of sorting them all. They start over when any
+    value held differs. The last value, e.g. of a bar in progress, is
+    added to copies, so it may be revised.
+
+    Parameters:
+        x (any): Values, e.g. a pd.Series.
+        q_low (float): Quartile to regard as low.
+        q_avg (float): Quartile to regard as average.
+        key (any): Id of the series `x` belongs to, e.g. (symbol, ylabel).
+
+    Returns:
+        tuple: `q_low` and `q_avg` quantiles and standard deviation
+        (float), NaN if undefined.
+    """
+    values = np.asarray(x, dtype=float)
+    if key is None:
+        values = values[~np.isnan(values)]
+    if not values.size:
+        return math.nan, math.nan, math.nan
+    if key is None:
+        std = values.std(ddof=1) if values.size > 1 else math.nan
+        return (np.quantile(values, q_low), np.quantile(values, q_avg),
+                std)
+
+    key = (key, q_low, q_avg)
+    low, avg, moments, held = _markers.get(key, (None,) * 4)
+    n = 0 if held is None else held.size
+    if (low is None or values.size <= n
+            or not np.array_equal(values[:n], held, equal_nan=True)):
+        # Starts at the exact quantiles, without streaming each value.
+        low, avg = P2(q_low, values[:-1]), P2(q_avg, values[:-1])
+        moments, n = Moments(values[:-1]), values.size - 1
+    for estimator in (low, avg, moments):
+        estimator.update(values[n:-1])
+    _markers[key] = (low, avg, moments, values[:-1].copy())
+
+    now = values[-1:]
+    return (copy.deepcopy(low).update(now).quantile,
+            copy.deepcopy(avg).update(now).quantile,
+            float(Moments().merge(moments).update(now).std))
+
+
+class Dashboard:
+    """A library class that builds a density figure once and updates it.
+
+    The first `update` lays out the subplots and their artists: density
+    line, low, average and current value markers and labels. Later
+    updates only change their data, positions and texts. When shown,
+    only the axes of changed symbols are redrawn, by blitting them over
+    a cached background, unless their limits moved.
+
+    With a fixed `size`, the same figure is reused for any set of up to
+    `size` symbols, e.g. pages of a larger universe.
+    """
+
+    def __init__(self, ylabel, q_low=0.005, q_avg=0.5, watchlist=None,
+                 show=True, size=None, incremental=True):
+        """
+        Parameters:
+            ylabel (str): Name of data column to plot.
+            q_low (float): Quartile to regard as low.
+            q_avg (float): Quartile to regard as average.
+            watchlist (str): Symbols group.
+            show (bool): Flag for showing plot.
+            size (int): Subplots of the figure. Defaults to one per symbol,
+            laid out again whenever symbols change.
+            incremental (bool): Keeps densities between updates, see
+            `get_density`. Disable for one-off symbols to bound memory.
+
+        Raises:
+            ValueError: Requested `ylabel` is not available.
+        """
+        if ylabel not in ITEMS:
+            raise ValueError(
+                f'Invalid ylabel={ylabel}. Valid values are: {ITEMS}'
+            )
+        self.ylabel = ylabel
+        self.q_low = q_low
+        self.q_avg = q_avg
+        self.watchlist = watchlist
+        self.show = show
+        self.size = size
+        self.incremental = incremental
+        self.fig = None
+        self.axs = None
+        self.symbols = []
+        self._suptitle = None
+        self._slots = []  # (ax, line, vlines, texts) per subplot
+        self._artists = {}  # symbol -> slot
+        self._last = {}  # symbol -> (size, last value) last drawn
+        self._backgrounds = {}  # ax or suptitle -> cached pixels
+
+    def update(self, df_dict):
+        """Draws the density of each pd.DataFrame in `df_dict`.
+
+        Parameters:
+            df_dict (dict): Keys=symbols (str), values=data (pd.DataFrame).
+
+        Returns:
+            tuple: Figure and axes.
+
+        Raises:
+            Exception: Size of `df_dict` exceeds the max. allowable
+            subplots.
+        """
+        if not df_dict:
+            return
+
+        limit = self.size or MAX_LIMIT
+        if len(df_dict) > limit:
+            raise Exception(
+                f'len(df_dict)={len(df_dict)} > MAX_LIMIT' f'={limit}!'
+            )
+
+        redraw = list(df_dict) != self.symbols
+        if redraw:
+            self._build(list(df_dict))
+
+        if self.watchlist is not None:
+            time_ = dt.datetime.now().strftime('%I:%M %p')
+            self._suptitle.set_text(f'{self.watchlist} {self.ylabel} @ '
+                                    f'{time_}')
+
+        changed = []
+        for symbol, data in df_dict.items():
+            x = data[self.ylabel]
+            last = (len(x), x.iloc[-1] if len(x) else None)
+            if self._last.get(symbol) == last:
+                continue
+            try:
+                moved = self._update_axes(symbol, x)
+            except ValueError:
+                continue
+            self._last[symbol] = last
+            changed.append(self._artists[symbol][0])
+            redraw |= moved
+
+        if self.show:
+            self._render(changed, redraw)
+
+        return (self.fig, self.axs)
+
+    def close(self):
+        """Closes the figure."""
+        if self.fig is not None:
+            plt.close(self.fig)
+        self.fig = None
+        self.axs = None
+        self.symbols = []
+        self._slots = []
+        self._artists = {}
+        self._last = {}
+        self._backgrounds = {}
+
+    # @Helper
+    def _build(self, symbols):
+        """Assigns one subplot per symbol, laying them out if needed."""
+        if self.fig is None or self.size is None:
+            self._layout(self.size or len(symbols))
+        self.symbols = symbols
+        self._artists = dict(zip(symbols, self._slots))
+        self._last = {}
+        for i, (ax, line, _, _) in enumerate(self._slots):
+            ax.set_visible(i < len(symbols))
+            ax.set_title(symbols[i] if i < len(symbols) else '')
+            line.set_data([], [])
+
+    # @Helper
+    def _layout(self, n):
+        """Lays out `n` subplots with empty artists."""
+        self.close()
+        nrows, ncols = get_layout(n)
+        self.fig, self.axs = plt.subplots(nrows, ncols)
+        suptitle = self.ylabel if self.watchlist is None else ''
+        self._suptitle = self.fig.suptitle(suptitle, size=36, weight='bold')
+        if self.fig.canvas.manager is not None:
+            self.fig.canvas.manager.set_window_title(
+                f'{self.ylabel} Density')
+        self.fig.subplots_adjust(wspace=0.50, hspace=0.50)
+
+        style = {'animated': self.show}
+        axs = np.atleast_1d(self.axs).ravel()
+        for ax in axs[:n]:
+            ax.set_xlabel(self.ylabel)
+            ax.set_ylabel('Density')
+            line, = ax.plot([], [], **style)
+            vlines = [
+                ax.axvline(x=0, color='green', ls='--', lw=1, **style),
+                ax.axvline(x=0, color='red', ls='--', lw=1, **style),
+                ax.axvline(x=0, lw=0.5, color='black', **style)]
+            texts = [
+                ax.text(0, 0, '', color='green', rotation=90, clip_on=True,
+                        **style),
+                ax.text(0, 0, '', color='red', rotation=90, clip_on=True,
+                        **style),
+                ax.text(0, 0, '', rotation=90, clip_on=True, **style)]
+            self._slots.append((ax, line, vlines, texts))
+        self._suptitle.set_animated(self.show)
+
+        if self.show:
+            plt.ion()
+            try:
+                self.fig.canvas.manager.window.showMaximized()
+            except AttributeError:
+                pass
+            plt.show()
+
+    # @Helper
+    def _update_axes(self, symbol, x):
+        """Moves the artists of `symbol` to the values in `x`.
+
+        Returns:
+            bool: Whether the axes limits changed.
+
+        Raises:
+            ValueError: `x` has no density.
+        """
+        key = (symbol, self.ylabel) if self.incremental else None
+        x_low, x_avg, x_std = get_markers(x, self.q_low, self.q_avg, key)
+        x_low = math.floor(x_low)
+        x_avg = math.floor(x_avg)
+        x_now = x.iloc[-1]
+        x_min = x_avg - 3 * x_std
+        x_max = x_avg + 3 * x_std
+        grid, density = get_density(x, key)
+
+        ax, line, vlines, texts = self._artists[symbol]
+        line.set_data(grid, density)
+
+        # Limits only move when the values leave them or the density
+        # peak does, so most updates leave the axes as they are.
+        xlim = (math.floor(x_min), math.ceil(x_max))
+        peak = 1.05 * density.max()
+        bottom, top = ax.get_ylim()
+        moved = tuple(ax.get_xlim()) != xlim
+        if moved:
+            ax.set_xlim(*xlim)
+        if not 0.8 * top < peak <= top:
+            ax.set_ylim(0, peak)
+            moved = True
+
+        y_lims = ax.get_ylim()
+        y_mid = sum(y_lims) / len(y_lims)
+        y_step = y_mid / 25
+        for vline, text, value, y in zip(
+                vlines, texts, [x_low, x_avg, x_now],
+                [y_lims[0] + y_step] * 2 + [y_mid]):
+            vline.set_xdata([value, value])
+            text.set_position((value * 1.005, y))
+            text.set_text(f'{value}')
+
+        return moved
+
+    # @Helper
+    def _render(self, changed, redraw):
+        """Redraws the whole figure, or blits the `changed` axes."""
+        canvas = self.fig.canvas
+        if redraw or not self._backgrounds:
+            canvas.draw()
+            self._backgrounds = {
+                ax: canvas.copy_from_bbox(ax.bbox)
+                for ax, *_ in self._artists.values()}
+            self._backgrounds[self._suptitle] = canvas.copy_from_bbox(
+                self.fig.bbox)
+            changed = [ax for ax, *_ in self._artists.values()]
+
+        for ax, line, vlines, texts in self._artists.values():
+            if ax not in changed:
+                continue
+            canvas.restore_region(self._backgrounds[ax])
+            for artist in [line] + vlines + texts:
+                ax.draw_artist(artist)
+            canvas.blit(ax.bbox)
+
+        if self.watchlist is not None or redraw:
+            bbox = self._suptitle.get_window_extent()
+            canvas.restore_region(self._backgrounds[self._suptitle], bbox)
+            self.fig.draw_artist(self._suptitle)
+            canvas.blit(bbox)
+        canvas.flush_events()
+
+
+_dashboards = {}  # (kind, watchlist, df_col, q_low, q_avg) -> Dashboard
 
 
 def plot_density(df_dict, ylabel, q_low = 0.005, q_avg=0.5,
                  show=True, watchlist=None):
     """Generates a subplot for each pd.DataFrame in `df_dict`.
 
+    The figure of each `watchlist` and `ylabel` is kept and updated in
+    place on later calls, until its window is closed. See
+    `close_dashboards`.
+
     Parameters:
         df_dict (dict): Keys=symbols (str), values=data (pd.DataFrame).
         ylabel (str): Name of data column to plot.
@@ -49,127 +413,286 @@ def plot_density(df_dict, ylabel, q_low = 0.005, q_avg=0.5,
     if not df_dict:
         return
 
-    if len(df_dict) > MAX_LIMIT:
-        raise Exception(
-            f'len(df_dict)={len(df_dict)} > MAX_LIMIT' f'={MAX_LIMIT}!'
-        )
+    key = ('plot', watchlist, ylabel, q_low, q_avg)
+    dashboard = _dashboards.get(key)
+    if dashboard is None or dashboard.show != show:
+        if dashboard is not None:
+            dashboard.close()
+        dashboard = Dashboard(ylabel, q_low, q_avg, watchlist, show)
+        _dashboards[key] = dashboard
+    elif dashboard.fig is not None and not plt.fignum_exists(
+            dashboard.fig.number):
+        dashboard.close()  # Laid out again by `update`.
 
-    if ylabel not in ITEMS:
-        raise ValueError(
-            f'Invalid ylabel={ylabel}. Valid values are: {ITEMS}'
-        )
+    return dashboard.update(df_dict)
 
-    subplot_count = len(df_dict)
-    nrows, ncols = LAYOUTS[subplot_count]
-    fig, axs = plt.subplots(nrows, ncols)
-    time_ = dt.datetime.now().strftime('%I:%M %p')
-    if watchlist is not None:
-        suptitle = f'{watchlist} {ylabel} @ {time_}'
-    else:
-        suptitle = ylabel
-    fig.suptitle(suptitle, size=36, weight='bold' )
-    fig.canvas.set_window_title(f'{ylabel} Density')
-    plot_indexes = []
 
-    for row in range(nrows):
-        for col in range(ncols):
-            plot_indexes.append((row, col))
+def close_dashboards():
+    """Closes the figures kept by `plot_density` and `save_density`."""
+    for dashboard in _dashboards.values():
+        dashboard.close()
+    _dashboards.clear()
 
-    i = 0
-    for symbol, data in df_dict.items():
-        x = data[ylabel]
 
-        try:
-            x_low = math.floor(x.quantile(q_low))
-            x_avg = math.floor(x.quantile(q_avg))
-            x_now = x.iloc[-1]
-            x_min = x_avg - 3 * x.std()
-            x_max = x_avg + 3 * x.std()
-        except ValueError:
-            continue
+def save_density(df_dict, df_col, q_low = 0.005, q_avg=0.5, show=False,
+                 watchlist=None, dir=config.DATA, format=FORMATS[0],
+                 size=(20, 10), dpi=100, compression=6, quality=80):
+    """Saves the density figure as an image.
 
-        row, col = plot_indexes[i]
-        if subplot_count == 1:
-            ax = x.plot.kde(ax=axs, title=symbol)
-        elif subplot_count == 2:
-            ax = x.plot.kde(ax=axs[i], title=symbol)
-        else:
-            ax = x.plot.kde(ax=axs[row, col], title=symbol)
+    The figure of each `watchlist` and `df_col` is kept and updated in
+    place on later calls. The file is only rewritten if its content
+    changed, see `save_figure`.
 
-        ax.set_xlabel(ylabel)
-        ax.set_xlim(left=math.floor(x_min), right=math.ceil(x_max))
-        ax.set_ylim(bottom=0)
-        y_lims = ax.get_ylim()
-        y_mid = sum(y_lims) / len(y_lims)
-        y_step = y_mid / 25
-        ax.axvline(x=x_low, color='green', ls='--', lw=1)
-        ax.text(
-            x_low * 1.005, y_lims[0] + y_step, f'{x_low}', color='green',
-            rotation=90
-        )
-        ax.axvline(x=x_avg, color='red', ls='--', lw=1)
-        ax.text(
-            x_avg * 1.005, y_lims[0] + y_step, f'{x_avg}', color='red',
-            rotation=90
-        )
-        ax.axvline(x=x_now, lw=0.5, color='black')
-        ax.text(x_now * 1.005, y_mid, f'{x_now}', rotation=90)
+    Parameters:
+        df_dict (dict): Keys=symbols (str), values=data (pd.DataFrame).
+        df_col (str): Name of pd.DataFrame column to plot.
+        q_low (float): Quartile to regard as low.
+        q_avg (float): Quartile to regard as average.
+        show (bool): Flag for showing plot.
+        watchlist (str): Symbols group.
+        dir (str): Output directory.
+        format (str): Image format. See `FORMATS`.
+        size (tuple): Width and height in inches.
+        dpi (int): Resolution of raster formats.
+        compression (int): See `save_figure`.
+        quality (int): See `save_figure`.
 
-        i += 1
+    Returns:
+        str: Path of the figure.
+
+    Raises:
+        Exception: Size of `df_dict` exceeds the max. allowable subplots.
+        ValueError: Requested `ylabel` or `format` is not available.
+    """
+    if not df_dict:
+        return
+
+    key = ('save', watchlist, df_col, q_low, q_avg)
+    if key not in _dashboards:
+        _dashboards[key] = Dashboard(df_col, q_low, q_avg, show=False)
+    fig = _dashboards[key].update(df_dict)[0]
+    fig.set_size_inches(*size)
+    date = dt.datetime.now().strftime('%Y-%m-%d')
+    # fname = f'{dir}/{ylabel}-kde-{date}.svg'
+    if watchlist is not None:
+        fname = f'{dir}/{watchlist}-{df_col}-kde.{format}'
+    else:
+        fname = f'{dir}/{df_col}-kde.{format}'
 
-    plt.subplots_adjust(wspace=0.50, hspace=0.50)
+    save_figure(fig, fname, format, dpi, compression, quality)
 
     if show:
         plt.get_current_fig_manager().window.showMaximized()
-        plt.ion()
         plt.show()
 
-    return (fig, axs)
+    return fname
 
 
-def save_density(df_dict, df_col, q_low = 0.005, q_avg=0.5, show=False,
-                 watchlist=None, dir=config.DATA):
-    """Saves the density figure as an SVG.
+def save_figure(fig, fname, format=FORMATS[0], dpi=100, compression=6,
+                quality=80):
+    """Saves `fig` as an image, unless `fname` already holds it.
+
+    Parameters:
+        fig (plt.Figure): Figure.
+        fname (str): Path of the image.
+        format (str): Image format. See `FORMATS`.
+        dpi (int): Resolution of raster formats.
+        compression (int): PNG zlib level, from 0 (fastest) to 9
+        (smallest).
+        quality (int): WebP quality, from 0 to 100, None for lossless.
+
+    Returns:
+        bool: Whether the image was written.
+
+    Raises:
+        ValueError: Requested `format` is not available.
+    """
+    if format not in FORMATS:
+        raise ValueError(f'format = {format} is not valid!\n'
+                         f'Valid values are: {FORMATS}')
+
+    kwargs = {}
+    if format == 'svg':
+        # Drops the date and random ids, so unchanged figures hash alike.
+        kwargs['metadata'] = {'Date': None}
+    elif format == 'png':
+        kwargs['pil_kwargs'] = {'compress_level': compression}
+    elif quality is None:
+        kwargs['pil_kwargs'] = {'lossless': True}
+    else:
+        kwargs['pil_kwargs'] = {'quality': quality}
+
+    buffer = io.BytesIO()
+    with mpl.rc_context({'svg.hashsalt': 'plotter'}):
+        fig.savefig(buffer, format=format, transparent=True, dpi=dpi,
+                    **kwargs)
+
+    return write_file(fname, buffer.getvalue())
+
+
+def write_file(fname, data):
+    """Writes `data` (bytes) to `fname`, unless it already holds them.
+
+    Contents are compared by hash, kept from the last write or read from
+    `fname` once. The file is written to a temporary file first, then
+    renamed, so readers never see a partial file.
+
+    Returns:
+        bool: Whether the file was written.
+    """
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    if fname not in _hashes and os.path.exists(fname):
+        with open(fname, 'rb') as f:
+            _hashes[fname] = hashlib.blake2b(
+                f.read(), digest_size=16).digest()
+    if _hashes.get(fname) == digest:
+        return False
+
+    os.makedirs(os.path.dirname(fname) or '.', exist_ok=True)
+    tmp = f'{fname}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, fname)
+    _hashes[fname] = digest
+
+    return True
+
+
+def save_density_pages(df_dict, df_col, q_low=0.005, q_avg=0.5,
+                       per_page=16, watchlist=None, dir=config.DATA,
+                       ext=EXTS[0], dpi=40):
+    """Saves the densities of any number of symbols as one file.
+
+    Symbols are split into pages of `per_page` subplots, drawn one at a
+    time on the same figure, so memory does not grow with the number of
+    symbols. Pages become a multi-page PDF, or tiles of one PNG.
 
     Parameters:
         df_dict (dict): Keys=symbols (str), values=data (pd.DataFrame).
         df_col (str): Name of pd.DataFrame column to plot.
         q_low (float): Quartile to regard as low.
         q_avg (float): Quartile to regard as average.
-        show (bool): Flag for showing plot.
+        per_page (int): Subplots per page.
+        watchlist (str): Symbols group.
+        dir (str): Output directory.
+        ext (str): Output format. See `EXTS`.
+        dpi (int): Resolution of PNG tiles.
 
     Returns:
-        tuple: Figure and axes.
+        str: Path of the file.
 
     Raises:
-        Exception: Size of `df_dict` exceeds the max. allowable subplots.
-        ValueError: Requested `ylabel` is not available.
+        ValueError: Requested `df_col` or `ext` is not available.
     """
     if not df_dict:
         return
 
-    fig = plot_density(df_dict, df_col, q_low, q_avg, show)[0]
-    fig.set_size_inches(20, 10)
-    date = dt.datetime.now().strftime('%Y-%m-%d')
-    # fname = f'{dir}/{ylabel}-kde-{date}.svg'
-    if watchlist is not None:
-        fname = f'{dir}/{watchlist}-{df_col}-kde.svg'
-    else:
-        fname = f'{dir}/{df_col}-kde.svg'
-
+    if ext not in EXTS:
+        raise ValueError(f'ext = {ext} is not valid!\n'
+                         f'Valid values are: {EXTS}')
+
+    symbols = list(df_dict)
+    pages = [symbols[i:i + per_page]
+             for i in range(0, len(symbols), per_page)]
+    prefix = df_col if watchlist is None else f'{watchlist}-{df_col}'
+    fname = f'{dir}/{prefix}-kde-pages.{ext}'
+    tmp = f'{fname}.tmp'
+    os.makedirs(dir, exist_ok=True)
+
+    dashboard = Dashboard(df_col, q_low, q_avg, show=False, size=per_page,
+                          incremental=False)
+    tiles = None
     try:
-        os.remove(fname)
-    except:
-        pass
+        if ext == 'pdf':
+            pdf = PdfPages(tmp)
+        for i, page in enumerate(pages):
+            fig = dashboard.update({s: df_dict[s] for s in page})[0]
+            fig.set_size_inches(20, 10)
+            fig.suptitle(f'{prefix} ({i + 1}/{len(pages)})', size=36,
+                         weight='bold')
+            if ext == 'pdf':
+                pdf.savefig(fig)
+                continue
+
+            # Pastes the page into its tile of the overview.
+            fig.set_dpi(dpi)
+            fig.canvas.draw()
+            tile = np.asarray(fig.canvas.buffer_rgba())
+            height, width = tile.shape[:2]
+            nrows, ncols = get_layout(len(pages))
+            if tiles is None:
+                tiles = np.full((nrows * height, ncols * width, 4), 255,
+                                dtype=np.uint8)
+            row, col = divmod(i, ncols)
+            tiles[row * height:(row + 1) * height,
+                  col * width:(col + 1) * width] = tile
+        if ext == 'pdf':
+            pdf.close()
+        else:
+            plt.imsave(tmp, tiles, format='png')
+    finally:
+        dashboard.close()
 
-    fig.savefig(fname=fname, transparent=True, dpi=100)
+    os.replace(tmp, fname)
+    return fname
 
-    if show:
-        plt.get_current_fig_manager().window.showMaximized()
-        plt.show()
 
+def save_densities(jobs, q_low=0.005, q_avg=0.5, dir=config.DATA,
+                   processes=None, format=FORMATS[0]):
+    """Saves many density figures in parallel, without a display.
+
+    Jobs are spread over a pool of processes that render with the Agg
+    backend, so this runs on servers without a GUI and scales with
+    cores. Failed jobs are reported and skipped.
+
+    Parameters:
+        jobs (list): (watchlist, df_col, df_dict) tuples. See
+        `save_density`.
+        q_low (float): Quartile to regard as low.
+        q_avg (float): Quartile to regard as average.
+        dir (str): Output directory.
+        processes (int): Render processes. Defaults to CPU count.
+        format (str): Image format. See `FORMATS`.
+
+    Returns:
+        dict: Keys are (watchlist, df_col) and values are seconds each
+        job took (float), NaN if it failed.
+    """
+    args = [(watchlist, df_col, df_dict, q_low, q_avg, dir, format)
+            for watchlist, df_col, df_dict in jobs]
+    processes = min(processes or os.cpu_count(), len(args)) or 1
+    with mp.Pool(processes, initializer=_init_headless) as pool:
+        results = pool.starmap(_save_density, args, chunksize=1)
+
+    timings = {}
+    for (watchlist, df_col, *_), (seconds, error) in zip(args, results):
+        if error is not None:
+            print(f"Rendering '{watchlist}-{df_col}' failed! {error}")
+        timings[(watchlist, df_col)] = seconds
+
+    return timings
 
-def plot_scatter(df_dict, xlabel, ylabel, show=True):
+
+# @Helper
+def _init_headless():
+    """Selects the non-interactive Agg backend in a render process."""
+    plt.switch_backend('Agg')
+
+
+# @Worker
+def _save_density(watchlist, df_col, df_dict, q_low, q_avg, dir, format):
+    """Returns the seconds `save_density` took and its error, if any."""
+    start = time.perf_counter()
+    try:
+        save_density(df_dict, df_col, q_low, q_avg, watchlist=watchlist,
+                     dir=dir, format=format)
+    except Exception as e:
+        return math.nan, f'{type(e).__name__}: {e}'
+    return time.perf_counter() - start, None
+
+
+def plot_scatter(df_dict, xlabel, ylabel, show=True,
+                 downsampling=METHODS[0]):
     """Generates a scatter plot for each pd.DataFrame in `df_dict`.
 
     Parameters:
@@ -177,6 +700,9 @@ def plot_scatter(df_dict, xlabel, ylabel, show=True):
         xlabel (str): Name of pd.DataFrame column to plot in x.
         ylabel (str): Name of pd.DataFrame column to plot in y.
         show (bool): Flag for showing plot.
+        downsampling (str): Method reducing each series to about one
+        point per pixel of its axes. See `downsample.METHODS`. None
+        plots every point.
 
     Returns:
         tuple: Figure and axes.
@@ -206,7 +732,8 @@ def plot_scatter(df_dict, xlabel, ylabel, show=True):
     subplot_count = len(df_dict)
     nrows, ncols = LAYOUTS[subplot_count]
     fig, axs = plt.subplots(nrows, ncols)
-    fig.canvas.set_window_title(f'{ylabel} Scatter')
+    if fig.canvas.manager is not None:
+        fig.canvas.manager.set_window_title(f'{ylabel} Scatter')
     plot_indexes = []
 
     for row in range(nrows):
@@ -215,22 +742,22 @@ def plot_scatter(df_dict, xlabel, ylabel, show=True):
 
     i = 0
     for symbol, data in df_dict.items():
-        x = data[xlabel]
-        if not isinstance(x.iloc[-1], numbers.Number):
-            x = x.astype(str)
-        y = data[ylabel]
-
         row, col = plot_indexes[i]
         if subplot_count == 1:
-            axs.plot(x, y)
             ax = axs
         elif subplot_count == 2:
-            axs[i].plot(x, y)
             ax = axs[i]
         else:
-            axs[row, col].plot(x, y)
             ax = axs[row, col]
 
+        x, y, is_date = _get_xy(data, xlabel, ylabel)
+        if downsampling is not None:
+            x, y = downsample(
+                x, y, int(ax.get_window_extent().width), downsampling)
+        ax.plot(x, y)
+        if is_date:
+            _set_dates(ax)
+
         ax.set_title(symbol)
         ax.set_xlabel(xlabel)
         ax.set_ylabel(xlabel)
@@ -246,7 +773,8 @@ def plot_scatter(df_dict, xlabel, ylabel, show=True):
     return (fig, axs)
 
 
-def plot_bar(df_dict, xlabel, ylabel, show=True):
+def plot_bar(df_dict, xlabel, ylabel, show=True,
+             downsampling=METHODS[0]):
     """Generates a bar plot for each pd.DataFrame in `df_dict`.
 
     Parameters:
@@ -254,6 +782,9 @@ def plot_bar(df_dict, xlabel, ylabel, show=True):
         xlabel (str): Name of pd.DataFrame column to plot in x.
         ylabel (str): Name of pd.DataFrame column to plot in y.
         show (bool): Flag for showing plot.
+        downsampling (str): Method reducing each series to about one
+        point per pixel of its axes. See `downsample.METHODS`. None
+        plots every point.
 
     Returns:
         tuple: Figure and axes.
@@ -283,7 +814,8 @@ def plot_bar(df_dict, xlabel, ylabel, show=True):
     subplot_count = len(df_dict)
     nrows, ncols = LAYOUTS[subplot_count]
     fig, axs = plt.subplots(nrows, ncols)
-    fig.canvas.set_window_title(f'{ylabel} Bar')
+    if fig.canvas.manager is not None:
+        fig.canvas.manager.set_window_title(f'{ylabel} Bar')
     plot_indexes = []
 
     for row in range(nrows):
@@ -292,22 +824,23 @@ def plot_bar(df_dict, xlabel, ylabel, show=True):
 
     i = 0
     for symbol, data in df_dict.items():
-        x = data[xlabel]
-        if not isinstance(x.iloc[-1], numbers.Number):
-            x = x.astype(str)
-        y = data[ylabel]
-
         row, col = plot_indexes[i]
         if subplot_count == 1:
-            axs.bar(x, y)
             ax = axs
         elif subplot_count == 2:
-            axs[i].bar(x, y)
             ax = axs[i]
         else:
-            axs[row, col].bar(x, y)
             ax = axs[row, col]
 
+        x, y, is_date = _get_xy(data, xlabel, ylabel)
+        if downsampling is not None:
+            x, y = downsample(
+                x, y, int(ax.get_window_extent().width), downsampling)
+        width = 0.8 * np.median(np.diff(x)) if x.size > 1 else 0.8
+        ax.bar(x, y, width=width)
+        if is_date:
+            _set_dates(ax)
+
         ax.set_title(symbol)
         ax.set_xlabel(xlabel)
         ax.set_ylabel(xlabel)
@@ -323,5 +856,38 @@ def plot_bar(df_dict, xlabel, ylabel, show=True):
     return (fig, axs)
 
 
+# @Helper
+def _get_xy(data, xlabel, ylabel):
+    """Returns numeric x and y values of `data`, and whether x are dates.
+
+    Dates and times become matplotlib date numbers, without going
+    through strings. Times are combined with their 'Date', if any.
+    """
+    x = data[xlabel]
+    y = data[ylabel].to_numpy(dtype=float)
+    if isinstance(x.iloc[-1], numbers.Number):
+        return x.to_numpy(dtype=float), y, False
+
+    if xlabel == 'Time':
+        seconds = np.array(
+            [t.hour * 3600 + t.minute * 60 + t.second for t in x])
+        days = np.datetime64('1970-01-01', 'ns')
+        if 'Date' in data:
+            days = pd.to_datetime(data['Date']).to_numpy()
+        stamps = days + seconds.astype('timedelta64[s]')
+    else:
+        stamps = pd.to_datetime(x).to_numpy()
+
+    return mdates.date2num(stamps), y, True
+
+
+# @Helper
+def _set_dates(ax):
+    """Ticks the x axis of `ax` with concise dates."""
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+
 if __name__ == '__main__':
     pass
@@ -8,6 +8,9 @@
 """
 
 
+import os
+
+import config
 from collector import Collector
 import plotter
 
@@ -38,6 +41,55 @@ def check_save_density():
     plotter.save_density(rsi, 'RSI', show=False)
 
 
+def check_save_density_formats():
+    symbols = SYMBOLS[9]
+    prices = COLLECTOR.get_prices(symbols, '60d', '2m')
+    for format in plotter.FORMATS:
+        fname = plotter.save_density(prices, 'Price', format=format)
+        mtime = os.path.getmtime(fname)
+        # Same content, so the second call skips writing.
+        plotter.save_density(prices, 'Price', format=format)
+        print(fname, os.path.getmtime(fname) == mtime)  # True.
+
+
+def check_save_densities():
+    # All watchlists after the close, one render process per core.
+    jobs = []
+    for watchlist, symbols in config.WATCHLISTS.items():
+        prices = COLLECTOR.get_prices(symbols, '60d', '5m')
+        rsi = COLLECTOR.get_rsi(symbols, '60d', '5m')
+        jobs += [(watchlist, 'Price', prices), (watchlist, 'RSI', rsi)]
+    print(plotter.save_densities(jobs))
+
+
+def check_save_density_pages():
+    # One overview of every screened symbol, 16 per page.
+    symbols = [s for ls in config.WATCHLISTS.values() for s in ls]
+    prices = COLLECTOR.get_prices(symbols, '60d', '5m')
+    print(plotter.save_density_pages(prices, 'Price', ext='pdf'))
+    print(plotter.save_density_pages(prices, 'Price', ext='png'))
+
+
+def check_get_density():
+    prices = COLLECTOR.get_prices('MSFT', '60d', '2m')['MSFT']
+    grid, density = plotter.get_density(prices['Price'], ('MSFT', 'Price'))
+    print(grid[density.argmax()])  # Most frequent price.
+
+    # Only the last bar is revised and the new one added.
+    prices = COLLECTOR.get_prices('MSFT', '60d', '2m')['MSFT']
+    grid, density = plotter.get_density(prices['Price'], ('MSFT', 'Price'))
+    print(grid[density.argmax()])
+
+
+def check_dashboard():
+    symbols = SYMBOLS[4]
+    dashboard = plotter.Dashboard('Price', watchlist='check')
+    for _ in range(3):
+        # Same figure, only changed subplots are redrawn.
+        dashboard.update(COLLECTOR.get_prices(symbols, '5d', '5m'))
+    dashboard.close()
+
+
 def check_plot_scatter():
     symbols = SYMBOLS[1]
     prices = COLLECTOR.get_prices(symbols, '1d', '5m')
@@ -50,8 +102,23 @@ def check_plot_bar():
     plotter.plot_bar(volumes, 'Date', 'Volume')
 
 
+def check_downsample():
+    prices = COLLECTOR.get_prices('MSFT', '60d', '2m')['MSFT']
+    for method in plotter.METHODS:
+        x, y = plotter.downsample(
+            prices.index, prices['Price'], 500, method)
+        print(method, len(prices), '->', len(x))  # About 1000 or 500.
+    plotter.plot_scatter({'MSFT': prices}, 'Time', 'Price')
+
+
 if __name__ == '__main__':
     check_plot_density()
     check_save_density()
+    check_save_density_formats()
+    check_save_densities()
+    check_save_density_pages()
+    check_get_density()
+    check_dashboard()
     check_plot_scatter()
     check_plot_bar()
+    check_downsample()
@@ -0,0 +1 @@
+from .sessions import *
\ No newline at end of file
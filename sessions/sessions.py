@@ -0,0 +1,216 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Exchange trading sessions: hours, weekends, holidays and half days.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import zoneinfo
+
+
+class Calendar:
+    """A library class that knows when the market is open.
+
+    Sessions run from `open` to `close` on weekdays, except on holidays,
+    and end at `half_close` on half days. By default holidays and half
+    days follow the NYSE rules. Times are taken in `tz`, local time by
+    default, like the rest of the package.
+    """
+
+    def __init__(self, open=dt.time(9, 30), close=dt.time(16, 0),
+                 half_close=dt.time(13, 0), holidays=None, half_days=None,
+                 tz=None):
+        """
+        Parameters:
+            open (dt.time): Session open.
+            close (dt.time): Session close.
+            half_close (dt.time): Session close on half days.
+            holidays (list): Dates (dt.date or 'YYYY-MM-DD') the market is
+            closed. Defaults to NYSE holidays, see `get_holidays`.
+            half_days (list): Dates the market closes at `half_close`.
+            Defaults to NYSE half days, see `get_half_days`.
+            tz (str): Time zone of the exchange, e.g. 'America/New_York'.
+
+        Raises:
+            ValueError: Invalid `tz`, or `open` not before `close`.
+        """
+        if not open < half_close <= close:
+            raise ValueError(f'open = {open} is not valid!\n'
+                             f'Valid values are: before half_close = '
+                             f'{half_close} and close = {close}')
+        try:
+            self.tz = None if tz is None else zoneinfo.ZoneInfo(tz)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f'tz = {tz} is not valid!\n'
+                             f'Valid values are: IANA time zones, e.g. '
+                             f'"America/New_York"')
+        self.open = open
+        self.close = close
+        self.half_close = half_close
+        self.holidays = self._get_dates(holidays)
+        self.half_days = self._get_dates(half_days)
+        self._years = {}  # year -> (holidays, half days) by rule
+
+    def is_holiday(self, day):
+        """Returns whether the market is closed all day on `day`."""
+        if self.holidays is not None:
+            return day in self.holidays
+        return day in self._get_year(day.year)[0]
+
+    def is_half_day(self, day):
+        """Returns whether the market closes at `half_close` on `day`."""
+        if self.half_days is not None:
+            return day in self.half_days
+        return day in self._get_year(day.year)[1]
+
+    def is_trading_day(self, day):
+        """Returns whether there is a session on `day` (dt.date)."""
+        return day.weekday() < 5 and not self.is_holiday(day)
+
+    def get_session(self, day):
+        """Returns the session of `day`.
+
+        Returns:
+            tuple: Open and close in seconds since the epoch, None if the
+            market is closed all day.
+        """
+        if not self.is_trading_day(day):
+            return None
+        close = self.half_close if self.is_half_day(day) else self.close
+        return self._get_time(day, self.open), self._get_time(day, close)
+
+    def is_open(self, now):
+        """Returns whether a session is in progress at `now` (seconds)."""
+        session = self.get_session(self._get_day(now))
+        return session is not None and session[0] <= now < session[1]
+
+    def get_next_open(self, now):
+        """Returns the open of the current or next session (seconds).
+
+        Raises:
+            ValueError: No session within a year, e.g. all holidays.
+        """
+        day = self._get_day(now)
+        for _ in range(366):
+            session = self.get_session(day)
+            if session is not None and now < session[1]:
+                return session[0]
+            day += dt.timedelta(1)
+        raise ValueError(f'now = {now} is not valid!\n'
+                         f'Valid values are: within a year of a session')
+
+    def get_next_close(self, now):
+        """Returns the close of the current or next session (seconds)."""
+        return self.get_session(self._get_day(self.get_next_open(now)))[1]
+
+    # @Helper
+    def _get_year(self, year):
+        if year not in self._years:
+            self._years[year] = (set(get_holidays(year)),
+                                 set(get_half_days(year)))
+        return self._years[year]
+
+    # @Helper
+    def _get_day(self, now):
+        return dt.datetime.fromtimestamp(now, self.tz).date()
+
+    # @Helper
+    def _get_time(self, day, time):
+        return dt.datetime.combine(day, time, tzinfo=self.tz).timestamp()
+
+    # @Helper
+    @staticmethod
+    def _get_dates(dates):
+        if dates is None:
+            return None
+        return {dt.date.fromisoformat(d) if isinstance(d, str) else d
+                for d in dates}
+
+
+def get_holidays(year):
+    """Returns the NYSE holidays of `year`.
+
+    Holidays on a Saturday are observed the Friday before, except New
+    Year's Day, and on a Sunday the Monday after.
+
+    Returns:
+        list: Dates (dt.date), in order.
+    """
+    holidays = [
+        _get_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day.
+        _get_weekday(year, 2, 0, 3),  # Washington's Birthday.
+        _get_easter(year) - dt.timedelta(2),  # Good Friday.
+        _get_weekday(year, 5, 0, -1),  # Memorial Day.
+        _observe(dt.date(year, 7, 4)),  # Independence Day.
+        _get_weekday(year, 9, 0, 1),  # Labor Day.
+        _get_weekday(year, 11, 3, 4),  # Thanksgiving Day.
+        _observe(dt.date(year, 12, 25)),  # Christmas Day.
+    ]
+    new_year = dt.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observe(new_year))
+    if year >= 2022:
+        holidays.append(_observe(dt.date(year, 6, 19)))  # Juneteenth.
+
+    return sorted(d for d in holidays if d.weekday() < 5)
+
+
+def get_half_days(year):
+    """Returns the NYSE half days of `year`.
+
+    These are the eve of Independence Day and of Christmas, and the day
+    after Thanksgiving, when trading days.
+
+    Returns:
+        list: Dates (dt.date), in order.
+    """
+    holidays = get_holidays(year)
+    days = [dt.date(year, 7, 3),
+            _get_weekday(year, 11, 3, 4) + dt.timedelta(1),
+            dt.date(year, 12, 24)]
+    return [d for d in days if d.weekday() < 5 and d not in holidays]
+
+
+# @Helper
+def _get_weekday(year, month, weekday, n):
+    """Returns the `n`-th `weekday` (0 is Monday) of `month`, -1: last."""
+    if n > 0:
+        day = dt.date(year, month, 1)
+        day += dt.timedelta((weekday - day.weekday()) % 7)
+        return day + dt.timedelta(7 * (n - 1))
+
+    last = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(1)
+    return last - dt.timedelta((last.weekday() - weekday) % 7)
+
+
+# @Helper
+def _get_easter(year):
+    """Returns Easter Sunday of `year` (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+# @Helper
+def _observe(day):
+    """Returns the weekday `day` is observed on."""
+    if day.weekday() == 5:
+        return day - dt.timedelta(1)
+    if day.weekday() == 6:
+        return day + dt.timedelta(1)
+    return day
+
+
+if __name__ == '__main__':
+    pass
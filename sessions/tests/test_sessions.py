@@ -0,0 +1,95 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests sessions module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import os
+import time
+import unittest
+
+import sessions
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = sessions.Calendar(tz='America/New_York')
+
+    def get_time(self, *args):
+        return dt.datetime(*args, tzinfo=self.calendar.tz).timestamp()
+
+    def test_holidays_follow_nyse_rules(self):
+        self.assertEqual(
+            [str(d) for d in sessions.get_holidays(2021)],
+            ['2021-01-01', '2021-01-18', '2021-02-15', '2021-04-02',
+             '2021-05-31', '2021-07-05', '2021-09-06', '2021-11-25',
+             '2021-12-24'])
+        # New Year's Day on a Saturday is not observed.
+        self.assertNotIn(dt.date(2021, 12, 31), sessions.get_holidays(2022))
+        self.assertIn(dt.date(2022, 6, 20), sessions.get_holidays(2022))
+
+    def test_half_days_close_early(self):
+        self.assertEqual(
+            [str(d) for d in sessions.get_half_days(2024)],
+            ['2024-07-03', '2024-11-29', '2024-12-24'])
+        self.assertTrue(self.calendar.is_open(
+            self.get_time(2024, 11, 29, 12, 59)))
+        self.assertFalse(self.calendar.is_open(
+            self.get_time(2024, 11, 29, 13, 0)))
+
+    def test_next_open_skips_weekends_and_holidays(self):
+        # Friday after the close, Monday is Presidents' Day.
+        now = self.get_time(2021, 2, 12, 16, 0)
+
+        self.assertFalse(self.calendar.is_open(now))
+        self.assertEqual(self.calendar.get_next_open(now),
+                         self.get_time(2021, 2, 16, 9, 30))
+        self.assertEqual(self.calendar.get_next_close(now),
+                         self.get_time(2021, 2, 16, 16, 0))
+
+    def test_next_open_is_current_session_when_open(self):
+        now = self.get_time(2021, 2, 16, 10, 0)
+
+        self.assertTrue(self.calendar.is_open(now))
+        self.assertEqual(self.calendar.get_next_open(now),
+                         self.get_time(2021, 2, 16, 9, 30))
+
+    def test_sessions_do_not_depend_on_local_time(self):
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'UTC'
+        time.tzset()
+        try:
+            # 14:00 UTC is 9:00 in New York, before the open.
+            now = dt.datetime(2021, 2, 16, 14, 0,
+                              tzinfo=dt.timezone.utc).timestamp()
+
+            self.assertFalse(self.calendar.is_open(now))
+            self.assertTrue(self.calendar.is_open(now + 3600))
+            self.assertEqual(self.calendar.get_next_open(now),
+                             self.get_time(2021, 2, 16, 9, 30))
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+
+    def test_configured_holidays_replace_rules(self):
+        calendar = sessions.Calendar(holidays=['2021-02-17'], half_days=[])
+
+        self.assertTrue(calendar.is_trading_day(dt.date(2021, 2, 15)))
+        self.assertFalse(calendar.is_trading_day(dt.date(2021, 2, 17)))
+
+    def test_invalid_hours_raise(self):
+        with self.assertRaises(ValueError):
+            sessions.Calendar(open=dt.time(16), close=dt.time(9, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,8 @@ setup(
         'forecaster',
         'indicators',
         'plotter',
+        'sessions',
+        'sketches',
         'utils',
         'xport'
     ],
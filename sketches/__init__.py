@@ -0,0 +1 @@
+from .sketches import *
\ No newline at end of file
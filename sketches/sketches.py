@@ -0,0 +1,326 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Mergeable streaming statistics.
+
+Accumulators are updated with batches of values, use bounded memory and
+most can be merged, e.g. per-day accumulators into a look-back window or
+per-process accumulators into a total. All of them pickle, so they can
+be returned from `mp.Pool` workers.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import math
+
+import numpy as np
+
+
+class Moments:
+    """A library class for streaming count, mean, variance and extrema.
+
+    Batches are folded in with Welford's/Chan's parallel update, so
+    merging is exact.
+    """
+
+    def __init__(self, values=None):
+        """
+        Parameters:
+            values (any): Initial values.
+        """
+        self.count = 0
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        if values is not None:
+            self.update(values)
+
+    """variance (float): Sample variance."""
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    """std (float): Sample standard deviation."""
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def update(self, values):
+        """Adds `values`, ignoring NaN. Returns self."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+        other = Moments()
+        other.count = values.size
+        other.mean = values.mean()
+        other.m2 = ((values - other.mean) ** 2).sum()
+        other.min = values.min()
+        other.max = values.max()
+        return Moments.merge(self, other)
+
+    def merge(self, other):
+        """Adds the values accumulated by `other`. Returns self."""
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+
+class Sketch(Moments):
+    """A library class for streaming quantiles, a merging t-digest.
+
+    Values are kept exactly until there are more than `2 * compression`
+    of them, so small samples give the same quantiles as `np.percentile`.
+    Beyond that, centroids are merged so that their count stays in the
+    order of `compression`, with the finest resolution at the tails.
+    """
+
+    def __init__(self, values=None, compression=100):
+        """
+        Parameters:
+            values (any): Initial values.
+            compression (int): Accuracy versus size trade-off.
+        """
+        self.compression = compression
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        super().__init__(values)
+
+    """size (int): Number of centroids held."""
+    @property
+    def size(self):
+        return self._means.size
+
+    def update(self, values):
+        """Adds `values`, ignoring NaN. Returns self."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+        super().update(values)
+        self._add(values, np.ones(values.size))
+        return self
+
+    def merge(self, other):
+        """Adds the values accumulated by `other`. Returns self."""
+        if not other.count:
+            return self
+        super().merge(other)
+        self._add(other._means, other._weights)
+        return self
+
+    def quantile(self, q):
+        """Returns the estimated `q` quantile, 0 <= q <= 1.
+
+        Interpolates linearly between centroids like `np.percentile`.
+        """
+        if not self.count:
+            return np.nan
+        if self.count == self.size:  # Exact, no centroid was merged.
+            return np.quantile(self._means, q)
+        # Position of each centroid center in the sorted sample.
+        centers = np.cumsum(self._weights) - (self._weights + 1) / 2
+        centers = np.r_[0, centers, self.count - 1]
+        means = np.r_[self.min, self._means, self.max]
+        return np.interp(q * (self.count - 1), centers, means)
+
+    def percentile(self, p):
+        """Returns the estimated `p` percentile, 0 <= p <= 100."""
+        return self.quantile(p / 100)
+
+    # @Helper
+    def _add(self, means, weights):
+        means = np.concatenate([self._means, means])
+        weights = np.concatenate([self._weights, weights])
+        order = np.argsort(means, kind='mergesort')
+        self._means = means[order]
+        self._weights = weights[order]
+        if self._means.size > 2 * self.compression:
+            self._compress()
+
+    # @Helper
+    def _compress(self):
+        """Greedily merges neighbouring centroids within one unit of k-scale.
+
+        Uses the k1 scale function, k(q) = δ / 2π * asin(2q - 1).
+        """
+        scale = self.compression / (2 * math.pi)
+        total = self._weights.sum()
+        means = []
+        weights = []
+        w_left = 0.0
+        k_left = scale * math.asin(-1)
+        mean, weight = self._means[0], self._weights[0]
+
+        for m, w in zip(self._means[1:], self._weights[1:]):
+            q_right = min((w_left + weight + w) / total, 1.0)
+            if scale * math.asin(2 * q_right - 1) - k_left <= 1:
+                weight += w
+                mean += (m - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                w_left += weight
+                k_left = scale * math.asin(min(2 * w_left / total - 1, 1.0))
+                mean, weight = m, w
+
+        means.append(mean)
+        weights.append(weight)
+        self._means = np.array(means)
+        self._weights = np.array(weights)
+
+
+class P2:
+    """A library class for one streaming quantile, the P² algorithm.
+
+    Five markers track the min., max., `q` quantile and two quantiles
+    half way to it. Each value moves them in O(1) time and memory, with
+    their heights adjusted by piecewise-parabolic interpolation (Jain and
+    Chlamtac, 1985). Exact up to 5 values. Initial values place the
+    markers at their exact quantiles at once instead.
+    Cannot be merged.
+    """
+
+    def __init__(self, q, values=None):
+        """
+        Parameters:
+            q (float): Quantile to estimate, 0 <= q <= 1.
+            values (any): Initial values.
+
+        Raises:
+            ValueError: Invalid `q`.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f'q = {q} is not valid!\n'
+                             f'Valid values are: 0 <= q <= 1')
+        self.q = q
+        self.count = 0
+        self._heights = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * q, 4 * q, 2 + 2 * q, 4]
+        self._steps = [0, q / 2, q, (1 + q) / 2, 1]
+        if values is not None:
+            values = np.asarray(values, dtype=float).ravel()
+            values = values[~np.isnan(values)]
+            if values.size > 5:
+                self._seed(values)
+            else:
+                self.update(values)
+
+    """quantile (float): Estimated `q` quantile, NaN if empty."""
+    @property
+    def quantile(self):
+        if not self.count:
+            return np.nan
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.q))
+        return self._heights[2]
+
+    def update(self, values):
+        """Adds `values`, ignoring NaN. Returns self."""
+        values = np.asarray(values, dtype=float).ravel()
+        for x in values[~np.isnan(values)].tolist():
+            self.count += 1
+            if self.count <= 5:
+                self._heights.append(x)
+                self._heights.sort()
+            else:
+                self._add(x)
+        return self
+
+    # @Helper
+    def _seed(self, values):
+        """Places the markers at their exact quantiles of `values`."""
+        size = values.size
+        desired = (size - 1) * np.array(self._steps)
+        positions = np.rint(desired).astype(int)
+        positions[0], positions[4] = 0, size - 1
+        for i in (1, 2, 3):  # Strictly increasing, within bounds.
+            positions[i] = min(max(positions[i], positions[i - 1] + 1),
+                               size - 5 + i)
+        self.count = size
+        self._heights = np.quantile(values, self._steps).tolist()
+        self._positions = positions.tolist()
+        self._desired = desired.tolist()
+
+    # @Helper
+    def _add(self, x):
+        h, n, d = self._heights, self._positions, self._desired
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            d[i] += self._steps[i]
+
+        for i in (1, 2, 3):
+            off = d[i] - n[i]
+            if ((off >= 1 and n[i + 1] - n[i] > 1)
+                    or (off <= -1 and n[i - 1] - n[i] < -1)):
+                step = 1 if off > 0 else -1
+                height = h[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (h[i + 1] - h[i])
+                    / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1])
+                    / (n[i] - n[i - 1]))
+                if not h[i - 1] < height < h[i + 1]:  # Linear instead.
+                    height = h[i] + step * (h[i + step] - h[i]) / (
+                        n[i + step] - n[i])
+                h[i] = height
+                n[i] += step
+
+
+def merge(accumulators):
+    """Returns a new accumulator with the values of all `accumulators`.
+
+    Sketches are compressed once, after all centroids are gathered.
+
+    Parameters:
+        accumulators (iterable): `Moments` or `Sketch` objects of the
+        same class.
+
+    Returns:
+        any: None if `accumulators` is empty.
+    """
+    accumulators = list(accumulators)
+    if not accumulators:
+        return None
+
+    merged = accumulators[0].__class__()
+    for accumulator in accumulators:
+        Moments.merge(merged, accumulator)
+
+    if isinstance(merged, Sketch):
+        merged.compression = accumulators[0].compression
+        merged._add(np.concatenate([a._means for a in accumulators]),
+                    np.concatenate([a._weights for a in accumulators]))
+
+    return merged
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests sketches module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import pickle
+import unittest
+
+import numpy as np
+
+import sketches
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = rng.normal(50, 10, 20000)
+        self.chunks = np.array_split(self.values, 200)
+
+    def test_moments_merge_is_exact(self):
+        moments = sketches.merge(sketches.Moments(c) for c in self.chunks)
+
+        self.assertEqual(moments.count, self.values.size)
+        self.assertAlmostEqual(moments.mean, self.values.mean())
+        self.assertAlmostEqual(moments.std, self.values.std(ddof=1))
+        self.assertEqual(moments.min, self.values.min())
+        self.assertEqual(moments.max, self.values.max())
+
+    def test_sketch_is_exact_for_small_samples(self):
+        sketch = sketches.Sketch(self.chunks[0])
+
+        for q in [0.0, 0.125, 0.25, 0.5, 1.0]:
+            self.assertEqual(sketch.quantile(q),
+                             np.quantile(self.chunks[0], q))
+
+    def test_sketch_merge_is_bounded_and_accurate(self):
+        parts = [pickle.loads(pickle.dumps(sketches.Sketch(c)))
+                 for c in self.chunks]
+        sketch = sketches.merge(parts)
+
+        self.assertLessEqual(sketch.size, 2 * sketch.compression)
+        for q in [0.125, 0.25, 0.5, 0.9]:
+            self.assertAlmostEqual(
+                sketch.quantile(q), np.quantile(self.values, q), delta=0.5)
+
+    def test_p2_is_exact_for_small_samples_and_accurate(self):
+        for q in [0.005, 0.5, 0.9]:
+            self.assertEqual(sketches.P2(q, self.values[:5]).quantile,
+                             np.quantile(self.values[:5], q))
+            p2 = sketches.P2(q)
+            for chunk in self.chunks:
+                p2.update(chunk)
+            self.assertEqual(p2.count, self.values.size)
+            self.assertAlmostEqual(
+                p2.quantile, np.quantile(self.values, q), delta=0.5)
+
+    def test_p2_seeded_with_initial_values_keeps_streaming(self):
+        half = self.values.size // 2
+        for q in [0.005, 0.5, 0.9]:
+            p2 = sketches.P2(q, self.values[:half])
+            self.assertEqual(p2.quantile, np.quantile(self.values[:half], q))
+            for chunk in np.array_split(self.values[half:], 100):
+                p2.update(chunk)
+            self.assertEqual(p2.count, self.values.size)
+            self.assertAlmostEqual(
+                p2.quantile, np.quantile(self.values, q), delta=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
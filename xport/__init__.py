@@ -1 +1,2 @@
 from .xport import *
+from .store import Store
@@ -0,0 +1,248 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Partitioned, append-only dataset of collected data.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+import config
+from .xport import COMPRESSIONS, _load, _write
+
+
+class Store:
+    """A library class that appends data to a partitioned dataset.
+
+    Data is partitioned by (kind, interval, date), e.g. ('basis', '2m',
+    '2021-06-01'), in `root`/{kind}/{interval}/{date}/, where date is
+    the 'Date' of the rows. Each `append` writes one file per date
+    holding all of its symbols, instead of one file per symbol. A
+    manifest lists the files of each partition with their row count and
+    symbols, so reads only open the files of the requested dates and
+    symbols, and never list directories. It also keeps the rows stored
+    per partition and symbol (`watermarks`), so appends skip them.
+    `compact` merges the small files of each partition.
+    """
+
+    EXTENSIONS = ['parquet', 'feather']
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, root=f'{config.DATA}/store', ext=EXTENSIONS[0],
+                 compression=None):
+        """
+        Parameters:
+            root (str): Directory of the dataset.
+            ext (str): Extension of new files. See `EXTENSIONS`.
+            compression (str): Codec of new files. Defaults to
+            `xport.COMPRESSIONS`.
+
+        Raises:
+            ValueError: Requested `ext` is not available.
+        """
+        if ext not in self.EXTENSIONS:
+            raise ValueError(f'ext = {ext} is not valid!\n'
+                             f'Valid values are: {self.EXTENSIONS}')
+        self.root = root
+        self.ext = ext
+        self.compression = compression or COMPRESSIONS[ext]
+        self.manifest, self.watermarks = self._read_manifest()
+
+    def get_partitions(self, kind=None, interval=None, start=None,
+                       end=None):
+        """Returns the partitions matching the given fields, in order.
+
+        Parameters:
+            kind (str): Kind of data, e.g. 'basis'. Defaults to any.
+            interval (str): Bar interval, e.g. '2m'. Defaults to any.
+            start (any): First date (dt.date or 'YYYY-MM-DD'), included.
+            end (any): Last date, included.
+
+        Returns:
+            list: (kind, interval, date) tuples (str).
+        """
+        start = None if start is None else str(start)
+        end = None if end is None else str(end)
+        partitions = []
+        for key in sorted(self.manifest):
+            kind_, interval_, date = key.split('/')
+            if ((kind is None or kind_ == kind)
+                    and (interval is None or interval_ == interval)
+                    and (start is None or date >= start)
+                    and (end is None or date <= end)):
+                partitions.append((kind_, interval_, date))
+        return partitions
+
+    def append(self, kind, interval, data_dict, date=None):
+        """Adds `data_dict` to the (`kind`, `interval`) partitions.
+
+        Without a `date`, rows are partitioned by their 'Date' column, and
+        the rows of each date and symbol already stored are skipped, so
+        appending a look-back window again only adds its new rows, e.g.
+        bars of a day stored mid-session or days of a new symbol. Rows of
+        a date and symbol are taken to arrive in order. Data without a
+        'Date' column goes to today's partition.
+
+        Parameters:
+            kind (str): Kind of data, e.g. 'basis' or 'fee'.
+            interval (str): Bar interval, e.g. '2m'.
+            data_dict (dict): Keys=symbols (str), values=data
+            (pd.DataFrame).
+            date (any): Partition date (dt.date or 'YYYY-MM-DD') of all
+            rows, none skipped. Defaults to the 'Date' of each row.
+
+        Returns:
+            list: Paths of the new files, one per partition.
+        """
+        data_dict = {s: df for s, df in data_dict.items() if not df.empty}
+        if not data_dict:
+            return []
+
+        data = pd.concat(data_dict, names=['Symbol'])
+        symbols = data.index.get_level_values(0).astype(str)
+        prefix = f'{kind}/{interval}/'
+        if date is not None or 'Date' not in data.columns:
+            dates = np.full(len(data), str(date or dt.date.today()))
+        else:
+            dates = data['Date'].astype(str).values
+            stored = {(key[len(prefix):], s): n
+                      for key, rows in self.watermarks.items()
+                      if key.startswith(prefix) for s, n in rows.items()}
+            if stored:
+                pairs = pd.MultiIndex.from_arrays([dates, symbols])
+                nth = data.groupby([dates, symbols]).cumcount().values
+                held = pd.Series(stored).reindex(pairs, fill_value=0)
+                new = nth >= held.values
+                data, dates, symbols = data[new], dates[new], symbols[new]
+
+        paths = []
+        for date in sorted(pd.unique(dates)):
+            key = f'{prefix}{date}'
+            rows = dates == date
+            entry = self._write(key, data[rows])
+            self.manifest.setdefault(key, []).append(entry)
+            held = self.watermarks.setdefault(key, {})
+            for s, n in pd.Series(symbols[rows]).value_counts().items():
+                held[s] = held.get(s, 0) + int(n)
+            paths.append(f'{self.root}/{key}/{entry["file"]}')
+        if paths:
+            self._write_manifest()
+
+        return paths
+
+    def read(self, kind, interval, symbols=None, start=None, end=None,
+             columns=None):
+        """Returns the data of `symbols` between `start` and `end`.
+
+        Only the files of matching partitions holding any of `symbols`
+        are opened, and only `columns` are read from them.
+
+        Parameters:
+            kind (str): Kind of data, e.g. 'basis'.
+            interval (str): Bar interval, e.g. '2m'.
+            symbols (list): Symbols to read. Defaults to all.
+            start (any): First date (dt.date or 'YYYY-MM-DD'), included.
+            end (any): Last date, included.
+            columns (list): Columns to read. Defaults to all.
+
+        Returns:
+            dict: Keys=symbols (str), values=data (pd.DataFrame) of all
+            partitions, in date and append order.
+        """
+        wanted = None if symbols is None else set(symbols)
+        frames = []
+        for partition in self.get_partitions(kind, interval, start, end):
+            key = '/'.join(partition)
+            for entry in self.manifest[key]:
+                if wanted is not None and wanted.isdisjoint(entry['symbols']):
+                    continue
+                data = _load(f'{self.root}/{key}/{entry["file"]}',
+                             entry['file'].rsplit('.', 1)[1], columns)
+                if wanted is not None:
+                    data = data[data.index.get_level_values(0).isin(wanted)]
+                frames.append(data)
+
+        if not frames:
+            return {}
+        data = pd.concat(frames)
+        order = symbols if symbols is not None else pd.unique(
+            data.index.get_level_values(0))
+        groups = dict(list(data.groupby(level=0, sort=False)))
+        return {s: groups[s].droplevel(0) for s in order if s in groups}
+
+    def compact(self, min_rows=100000):
+        """Merges the files with less than `min_rows` of each partition.
+
+        The merged file is written and listed before the small files are
+        removed, so readers see either of them, never both or neither.
+
+        Returns:
+            int: Files removed.
+        """
+        removed = 0
+        for key, entries in self.manifest.items():
+            small = [e for e in entries if e['rows'] < min_rows]
+            if len(small) < 2:
+                continue
+            data = pd.concat(
+                _load(f'{self.root}/{key}/{e["file"]}',
+                      e['file'].rsplit('.', 1)[1]) for e in small)
+            merged = self._write(key, data)
+            first = entries.index(small[0])
+            entries[:] = [e for e in entries if e not in small]
+            entries.insert(first, merged)
+            self._write_manifest()
+            for entry in small:
+                os.remove(f'{self.root}/{key}/{entry["file"]}')
+            removed += len(small)
+
+        return removed
+
+    # @Helper
+    def _write(self, key, data):
+        """Writes `data` to a new file of partition `key`.
+
+        Returns:
+            dict: Manifest entry of the file.
+        """
+        fname = f'{uuid.uuid4().hex[:16]}.{self.ext}'
+        path = f'{self.root}/{key}/{fname}'
+        os.makedirs(f'{self.root}/{key}', exist_ok=True)
+        _write(data, f'{path}.tmp', self.ext, self.compression)
+        os.replace(f'{path}.tmp', path)
+        symbols = pd.unique(data.index.get_level_values(0))
+        return {'file': fname, 'rows': len(data),
+                'symbols': sorted(str(s) for s in symbols)}
+
+    # @Helper
+    def _read_manifest(self):
+        """Returns the files and rows per symbol of each partition."""
+        path = f'{self.root}/{self.MANIFEST}'
+        if not os.path.exists(path):
+            return {}, {}
+        with open(path) as f:
+            manifest = json.load(f)
+        return manifest['partitions'], manifest.get('watermarks', {})
+
+    # @Helper
+    def _write_manifest(self):
+        """Writes the manifest to a temporary file, then renames it."""
+        path = f'{self.root}/{self.MANIFEST}'
+        os.makedirs(self.root, exist_ok=True)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump({'version': 2, 'partitions': self.manifest,
+                       'watermarks': self.watermarks}, f)
+        os.replace(f'{path}.tmp', path)
+
+
+if __name__ == '__main__':
+    pass
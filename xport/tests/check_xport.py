@@ -52,6 +52,17 @@ def check_export_xlsx():
     xport.export(_prices, dir=TEST_DIR, ext='xlsx')
 
 
+def check_export_parquet():
+    xport.export(_prices, dir=TEST_DIR, ext='parquet')
+    print(xport.load(TEST_DIR, _symbols, 'parquet', columns=['Price']))
+
+
+def check_export_feather():
+    xport.export(_prices, dir=TEST_DIR, ext='feather',
+                 compression='uncompressed')
+    print(xport.load(TEST_DIR, _symbols, 'feather', columns=['Price']))
+
+
 if __name__ == '__main__':
     set_input()
     # check_export_db()
@@ -59,3 +70,5 @@ if __name__ == '__main__':
     check_export_pkl()
     # check_export_txt()
     # check_export_xlsx()
+    check_export_parquet()
+    check_export_feather()
@@ -0,0 +1,114 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests store module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import xport
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = xport.Store(self.dir.name)
+        self.data = {s: pd.DataFrame({'Price': np.arange(5.0) + i,
+                                      'RSI': np.arange(5.0) * i})
+                     for i, s in enumerate(['AAPL', 'MSFT', 'XOM'])}
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_append_and_read_select_symbols_and_dates(self):
+        for date in ['2021-06-01', '2021-06-02', '2021-06-03']:
+            self.store.append('basis', '2m', self.data, date)
+
+        data = self.store.read('basis', '2m', ['MSFT'], '2021-06-02',
+                               '2021-06-03', columns=['Price'])
+
+        self.assertEqual(list(data), ['MSFT'])
+        self.assertEqual(list(data['MSFT'].columns), ['Price'])
+        expected = pd.concat([self.data['MSFT'][['Price']]] * 2)
+        pd.testing.assert_frame_equal(data['MSFT'], expected)
+
+    def test_manifest_is_reloaded(self):
+        self.store.append('fee', '2m', self.data, '2021-06-01')
+
+        store = xport.Store(self.dir.name)
+
+        self.assertEqual(store.get_partitions(),
+                         [('fee', '2m', '2021-06-01')])
+        self.assertEqual(store.read('fee', '2m').keys(), self.data.keys())
+
+    def test_append_partitions_by_date_and_skips_stored_days(self):
+        days = pd.to_datetime(['2021-06-01', '2021-06-02', '2021-06-03'])
+        window = {s: df.assign(Date=days[[0, 0, 1, 1, 2]].date)
+                  for s, df in self.data.items()}
+
+        first = self.store.append('basis', '2m', {
+            s: df[df['Date'] < days[2].date()] for s, df in window.items()})
+        second = self.store.append('basis', '2m', window)
+
+        self.assertEqual((len(first), len(second)), (2, 1))
+        self.assertEqual([p[2] for p in self.store.get_partitions()],
+                         ['2021-06-01', '2021-06-02', '2021-06-03'])
+        data = self.store.read('basis', '2m', start='2021-06-02')
+        for symbol, df in window.items():
+            pd.testing.assert_frame_equal(data[symbol], df.iloc[2:])
+
+    def test_append_completes_a_partial_day(self):
+        days = pd.to_datetime(['2021-06-01', '2021-06-02'])
+        window = {s: df.assign(Date=days[[0, 0, 1, 1, 1]].date)
+                  for s, df in self.data.items()}
+
+        self.store.append('basis', '2m', {
+            s: df.iloc[:3] for s, df in window.items()})
+        paths = self.store.append('basis', '2m', window)
+
+        self.assertEqual(len(paths), 1)
+        data = xport.Store(self.dir.name).read('basis', '2m')
+        for symbol, df in window.items():
+            pd.testing.assert_frame_equal(data[symbol], df)
+
+    def test_append_stores_the_history_of_a_new_symbol(self):
+        days = pd.to_datetime(['2021-06-01', '2021-06-02', '2021-06-03'])
+        window = {s: df.assign(Date=days[[0, 0, 1, 1, 2]].date)
+                  for s, df in self.data.items()}
+
+        self.store.append('basis', '2m', {'AAPL': window['AAPL']})
+        self.store.append('basis', '2m', window)
+        self.store.append('basis', '2m', window)
+
+        data = self.store.read('basis', '2m')
+        self.assertEqual(sorted(data), sorted(window))
+        for symbol, df in window.items():
+            pd.testing.assert_frame_equal(data[symbol], df)
+
+    def test_compact_merges_small_files(self):
+        for symbol, data in self.data.items():
+            self.store.append('basis', '2m', {symbol: data}, '2021-06-01')
+        before = self.store.read('basis', '2m')
+
+        removed = self.store.compact()
+
+        path = f'{self.dir.name}/basis/2m/2021-06-01'
+        self.assertEqual(removed, 3)
+        self.assertEqual(len(os.listdir(path)), 1)
+        after = self.store.read('basis', '2m')
+        for symbol in self.data:
+            pd.testing.assert_frame_equal(after[symbol], before[symbol])
+
+
+if __name__ == '__main__':
+    unittest.main()
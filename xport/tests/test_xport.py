@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tests xport module.
+
+@author   Hank Adler
+@version  0.1.0
+@license  MIT
+"""
+
+
+import datetime as dt
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import xport
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.fee = pd.DataFrame({
+            'Date': [dt.date(2021, 6, 1), dt.date(2021, 6, 2)],
+            'FlagTime': [dt.time(9, 35), dt.time(11, 25)],
+            'FlagRSI': [48.93, 44.97],
+            'EntryTime': [55.0, 20.0],
+            'ExitPctChg': [7.92, np.nan]})
+        self.summ = pd.DataFrame(
+            {'Time': ['11:23 AM', 55.0, 150.0], 'RSI': [46.6, 46.24, 53.36]},
+            index=['Flag', 'Entry', 'Exit'])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_fee_round_trips(self):
+        for ext in ['parquet', 'feather']:
+            xport.export({'AAPL': self.fee}, self.dir.name, ext)
+
+            fee = xport.load(self.dir.name, ext=ext)['AAPL']
+
+            pd.testing.assert_frame_equal(fee, self.fee)
+
+    def test_mixed_columns_are_written_as_strings(self):
+        for ext in ['parquet', 'feather']:
+            xport.export({'AAPL': self.summ}, self.dir.name, ext)
+
+            summ = xport.load(self.dir.name, ext=ext, columns=['Time'])
+
+            self.assertEqual(list(summ['AAPL']['Time']),
+                             ['11:23 AM', '55.0', '150.0'])
+            self.assertEqual(list(summ['AAPL'].index), list(self.summ.index))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,20 +17,77 @@ from pandas import ExcelWriter
 import config
 
 
-EXTENSIONS = ['csv', 'ods', 'txt', 'xlsx', 'pkl']
+EXTENSIONS = ['csv', 'ods', 'txt', 'xlsx', 'pkl', 'parquet', 'feather']
 
+"""dict: Default compression of columnar extensions.
+    'parquet': 'snappy', 'gzip', 'brotli', 'lz4', 'zstd' or None.
+    'feather': 'lz4', 'zstd' or 'uncompressed', which `load` can
+    memory-map without reading the file.
+"""
+COMPRESSIONS = {'parquet': 'zstd', 'feather': 'lz4'}
+
+"""list: Extensions `load` can read back."""
+LOADABLE = ['csv', 'pkl', 'parquet', 'feather']
+
+
+def export(data_dict: dict, dir: str = config.DATA, ext: str = 'txt',
+           compression: str = None):
+    """
+    Writes each pd.DataFrame of `data_dict` to `dir`/{symbol}.`ext`.
 
-def export(data_dict: dict, dir: str = config.DATA, ext: str = 'txt'):
+    Parameters:
+        data_dict (dict): Keys=symbols (str), values=data (pd.DataFrame).
+        dir (str): Directory of files to export.
+        ext (str): Files extension. See `EXTENSIONS`.
+        compression (str): Codec of columnar extensions. Defaults to
+        `COMPRESSIONS`.
+    """
     args = []
 
     for symbol, data in data_dict.items():
-        args.append((data, dir, symbol, ext))
+        args.append((data, dir, symbol, ext, compression))
 
     with mp.Pool() as pool:
         pool.starmap(_export, args)
 
 
-def _export(data: pd.DataFrame, dir:str, fname: str, ext='txt'):
+def load(dir: str = config.DATA, symbols: list = None,
+         ext: str = 'parquet', columns: list = None,
+         memory_map: bool = True):
+    """
+    Reads files written by `export` back.
+
+    Parameters:
+        dir (str): Directory of files to import.
+        symbols (list): Symbols to import. Defaults to all files with
+        `ext` in `dir`.
+        ext (str): Files extension. See `LOADABLE`.
+        columns (list): Columns to read, besides the index. Columnar
+        files skip the others. Defaults to all.
+        memory_map (bool): Maps columnar files into memory instead of
+        reading them. Only the columns used are then paged in.
+
+    Returns:
+        dict: Keys=symbols (str), values=data (pd.DataFrame).
+
+    Raises:
+        ValueError: Requested `ext` is not available.
+    """
+    if ext not in LOADABLE:
+        raise ValueError(f'ext = {ext} is not valid!\n'
+                         f'Valid values are: {LOADABLE}')
+
+    if symbols is None:
+        suffix = f'.{ext}'
+        symbols = sorted(f[:-len(suffix)] for f in os.listdir(dir)
+                         if f.endswith(suffix))
+
+    return {s: _load(f'{dir}/{s}.{ext}', ext, columns, memory_map)
+            for s in symbols}
+
+
+def _export(data: pd.DataFrame, dir:str, fname: str, ext='txt',
+            compression=None):
     """
     Writes data `fname`.`ext`.
 
@@ -39,6 +96,8 @@ def _export(data: pd.DataFrame, dir:str, fname: str, ext='txt'):
         fname (str): Name of file to export, without extension.
         ext (str): `fname` extension. Determines file type. See
         `EXTENSIONS`.
+        compression (str): Codec of columnar extensions. See
+        `COMPRESSIONS`.
     """
     if not os.path.isdir(dir):
         os.mkdir(dir)
@@ -56,9 +115,58 @@ def _export(data: pd.DataFrame, dir:str, fname: str, ext='txt'):
         writer = ExcelWriter(path=pathout)
         data.to_excel(excel_writer=writer, sheet_name='RSI')
         writer.save()
+    elif ext in COMPRESSIONS:
+        _write(data, pathout, ext, compression)
 
     print(f"Data exported to '{pathout}'.")
 
 
+def _write(data, pathout, ext, compression=None):
+    """Writes `data` to the columnar file `pathout`, see `_export`.
+
+    Columnar files hold one type per column, so object columns mixing
+    types, e.g. the summary 'Time' of clock times and minutes, are
+    written as strings.
+    """
+    compression = compression or COMPRESSIONS[ext]
+    mixed = [c for c in data.columns if data[c].dtype == object
+             and data[c].dropna().map(type).nunique() > 1]
+    if mixed:
+        data = data.copy()
+        for c in mixed:
+            data[c] = data[c].map(lambda v: v if pd.isna(v) else str(v))
+    if ext == 'parquet':
+        data.to_parquet(pathout, compression=compression)
+    else:
+        # pyarrow is only needed for columnar files, as in pandas.
+        from pyarrow import feather
+        feather.write_feather(data, pathout, compression=compression)
+
+
+def _load(pathin, ext, columns=None, memory_map=True):
+    """Returns the pd.DataFrame in `pathin`, see `load`."""
+    if ext == 'csv':
+        data = pd.read_csv(pathin, index_col=0)
+        return data if columns is None else data[columns]
+    if ext == 'pkl':
+        data = pd.read_pickle(pathin)
+        return data if columns is None else data[columns]
+    if ext == 'parquet':
+        return pd.read_parquet(pathin, columns=columns,
+                               memory_map=memory_map)
+
+    import pyarrow as pa
+    from pyarrow import feather
+    if columns is not None:
+        # Keeps the index, stored as columns too.
+        with pa.memory_map(pathin) as source:
+            metadata = pa.ipc.open_file(source).schema.pandas_metadata
+        index = [c for c in (metadata or {}).get('index_columns', [])
+                 if isinstance(c, str)]
+        columns = index + list(columns)
+    return feather.read_table(
+        pathin, columns=columns, memory_map=memory_map).to_pandas()
+
+
 if __name__ == '__main__':
     pass